@@ -1,11 +1,19 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Response, Header, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
+from typing import List, Literal, Optional
+from contextlib import asynccontextmanager
 import uvicorn
 import pandas as pd
 import mlflow
 from mlflow import MlflowClient
 import joblib
+import gc
 import os
+import sys
+import threading
+from time import perf_counter
 
 from dotenv import load_dotenv
 
@@ -13,12 +21,145 @@ from dotenv import load_dotenv
 # ============================================================
 # IMPORT YOUR CLEANING FUNCTION
 # ============================================================
-from scripts.data_clean_utils import perform_data_cleaning
+from scripts.data_clean_utils import build_features, explain_rejections
+from scripts.fast_features import build_feature_row
+from scripts.micro_batcher import MicroBatcher
+from scripts.inference_pool import InferencePool, PoolOverloaded
+from scripts.serving_metrics import (
+    render_metrics,
+    stage_timer,
+    RequestMetrics,
+    CONTENT_TYPE,
+    Counter,
+    Gauge,
+)
+from scripts.model_cache import (
+    ModelCache,
+    RegistryPoller,
+    load_bundle,
+    download_to_cache,
+    resolve_version,
+)
+from scripts.serving_model import ServingModel
+from scripts.prediction_cache import PredictionCache
+from scripts.process_memory import memory_usage
+from scripts.request_profiler import RequestProfiler
+
+# ============================================================
+# SERVING CONFIG (environment)
+# ============================================================
+# Upper bound on rows accepted by /predict/batch in one request
+MAX_BATCH_ROWS = int(os.getenv("MAX_BATCH_ROWS", "4096"))
+
+# Single-order requests use the pandas-free feature builder unless disabled
+USE_FAST_FEATURES = os.getenv("USE_FAST_FEATURES", "1") == "1"
+
+# Dedicated inference threads (default: one per core) and how many
+# extra jobs may queue before /predict answers 503
+INFERENCE_THREADS = int(os.getenv("INFERENCE_THREADS", "0")) or os.cpu_count()
+INFERENCE_QUEUE_LIMIT = int(
+    os.getenv("INFERENCE_QUEUE_LIMIT", str(4 * INFERENCE_THREADS))
+)
+
+# Threads per booster call (-1: all cores); gunicorn.conf.py splits
+# cores between workers
+MODEL_THREADS = int(os.getenv("MODEL_THREADS", "-1"))
+
+# Run CatBoost and LightGBM concurrently within one prediction (needs
+# spare cores)
+ENSEMBLE_PARALLEL = os.getenv("ENSEMBLE_PARALLEL", "0") == "1"
+
+# Opt-in coalescing of concurrent /predict calls into one booster call
+MICROBATCH_ENABLED = os.getenv("MICROBATCH_ENABLED", "0") == "1"
+MICROBATCH_MAX_WAIT_MS = float(os.getenv("MICROBATCH_MAX_WAIT_MS", "2"))
+MICROBATCH_MAX_SIZE = int(os.getenv("MICROBATCH_MAX_SIZE", "64"))
+
+# Local bundle cache; the registry is only polled in the background
+MODEL_CACHE_DIR = os.getenv("MODEL_CACHE_DIR", "models/cache")
+MODEL_CACHE_MAX_VERSIONS = int(os.getenv("MODEL_CACHE_MAX_VERSIONS", "3"))
+MODEL_REFRESH_SECONDS = float(os.getenv("MODEL_REFRESH_SECONDS", "300"))
+
+# Swap newly registered versions in without a restart
+MODEL_HOT_RELOAD = os.getenv("MODEL_HOT_RELOAD", "1") == "1"
+
+# Result cache for repeat queries (0 MB disables it)
+PREDICTION_CACHE_MB = float(os.getenv("PREDICTION_CACHE_MB", "64"))
+PREDICTION_CACHE_TTL_SECONDS = float(
+    os.getenv("PREDICTION_CACHE_TTL_SECONDS", "600")
+)
+
+# Shared secret for /admin/* endpoints (X-Admin-Token header); unset
+# disables them
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+# Stack-sample 1 in N prediction requests (0: off; also /admin/profile)
+PROFILE_SAMPLE_EVERY = int(os.getenv("PROFILE_SAMPLE_EVERY", "0"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "1"))
+
+inference_pool = InferencePool(INFERENCE_THREADS, INFERENCE_QUEUE_LIMIT)
+request_profiler = RequestProfiler(PROFILE_SAMPLE_EVERY, PROFILE_INTERVAL_MS)
+batcher = None
+poller = None
+
+prediction_cache = (
+    PredictionCache(
+        int(PREDICTION_CACHE_MB * 1024 * 1024), PREDICTION_CACHE_TTL_SECONDS
+    )
+    if PREDICTION_CACHE_MB > 0 else None
+)
+
+
+# ============================================================
+# STARTUP / SHUTDOWN
+# ============================================================
+@asynccontextmanager
+async def lifespan(app):
+    global batcher, poller
+
+    if MODEL_REFRESH_SECONDS > 0:
+        poller = RegistryPoller(
+            client, MODEL_NAME, model_cache, MODEL_REFRESH_SECONDS,
+            on_new_version=reload_model if MODEL_HOT_RELOAD else None,
+            current_version=lambda: current_model.version,
+        )
+        poller.start()
+
+    if MICROBATCH_ENABLED:
+        batcher = MicroBatcher(
+            score_records,
+            inference_pool.run,
+            max_wait_ms=MICROBATCH_MAX_WAIT_MS,
+            max_batch_size=MICROBATCH_MAX_SIZE,
+            # INFERENCE_QUEUE_LIMIT=0 (no waiting jobs) still lets one
+            # batch collect, rather than an unbounded queue
+            max_queued=max(INFERENCE_QUEUE_LIMIT, 1) * MICROBATCH_MAX_SIZE,
+        )
+        batcher.start()
+        print(
+            f"🧺 Micro-batching on (≤{MICROBATCH_MAX_SIZE} rows, "
+            f"≤{MICROBATCH_MAX_WAIT_MS} ms wait)"
+        )
+
+    yield
+
+    if batcher is not None:
+        await batcher.stop()
+        batcher = None
+
+    if poller is not None:
+        poller.stop()
+        poller = None
+
 
 # ============================================================
 # FASTAPI APP
 # ============================================================
-app = FastAPI(title="Swiggy ETA Prediction API", version="1.0")
+app = FastAPI(
+    title="Swiggy ETA Prediction API", version="1.0", lifespan=lifespan
+)
+
+# Request counts / latency per route, in-flight gauge
+app.add_middleware(RequestMetrics)
 
 # ============================================================
 # MLflow Tracking Setup
@@ -31,22 +172,111 @@ client = MlflowClient()
 
 MODEL_NAME = "Swiggy-Ensemble-Model"
 
-print("🔍 Fetching latest model version...")
-latest_ver = client.get_latest_versions(MODEL_NAME, stages=None)[0].version
-print(f"🎯 Latest Model Version Found → {latest_ver}")
+model_cache = ModelCache(MODEL_CACHE_DIR, MODEL_NAME, MODEL_CACHE_MAX_VERSIONS)
 
-model_uri = f"models:/{MODEL_NAME}/{latest_ver}"
+MODEL_VERSION = Gauge(
+    "eta_model_version", "Registry version of the model currently serving."
+)
+MODEL_RELOADS = Counter(
+    "eta_model_reloads_total", "Successful hot swaps of the serving model."
+)
+MODEL_RELOAD_FAILURES = Counter(
+    "eta_model_reload_failures_total",
+    "Reloads rejected during load or warm-up.",
+)
+PROCESS_RSS = Gauge(
+    "eta_process_rss_bytes", "Resident memory of this worker process."
+)
+PROCESS_PSS = Gauge(
+    "eta_process_pss_bytes",
+    "Proportional share of memory (shared pages split between workers).",
+)
+REJECTED_ROWS = Counter(
+    "eta_rejected_rows_total",
+    "Rows removed by input cleaning (no prediction made).",
+)
+REJECTED_REQUESTS = Counter(
+    "eta_rejected_requests_total",
+    "Requests where cleaning left nothing to score.",
+    labelnames=("endpoint",),
+)
 
-print("📦 Loading model bundle (preprocessor + models + weights)...")
-model_bundle = mlflow.sklearn.load_model(model_uri)
+# Stages timed here; preprocess / catboost / lightgbm live in ServingModel
+OBSERVE_VALIDATE = stage_timer("validate")
+OBSERVE_CLEAN = stage_timer("clean")
+OBSERVE_SERIALIZE = stage_timer("serialize")
 
-preprocessor = model_bundle["preprocessor"]
-cat_model = model_bundle["catboost"]
-lgb_model = model_bundle["lightgbm"]
-w_cat = model_bundle["weights"]["cat"]
-w_lgb = model_bundle["weights"]["lgbm"]
+print("📦 Loading model bundle (preprocessor + models + weights)...")
+# The serving model; replaced as a whole (atomic reference swap) on reload.
+# Startup never waits on the registry once something is cached: the
+# poller's first check (right after startup) swaps in a newer or
+# rolled-back version
+current_model = ServingModel(
+    *load_bundle(client, MODEL_NAME, model_cache),
+    n_threads=MODEL_THREADS,
+    parallel=ENSEMBLE_PARALLEL,
+)
+MODEL_VERSION.set(current_model.version)
 
+print(f"🎯 Model Version Loaded → {current_model.version}")
 print("✅ Model bundle loaded successfully!")
+if current_model.compiled_preprocessor is not None:
+    print("⚡ Using compiled preprocessor")
+
+_reload_lock = threading.Lock()
+
+
+# ============================================================
+# HOT RELOAD
+# ============================================================
+def reload_model(version: int = None) -> int:
+    """
+    Load `version` (default: latest registered, newest cached if the
+    registry is down) on the side, warm it up, then atomically swap it
+    in. Requests already running keep the model they started with; the
+    old bundle is freed once they finish.
+    """
+    global current_model
+
+    with _reload_lock:
+        try:
+            if version is None:
+                version = resolve_version(client, MODEL_NAME, model_cache)
+            if not model_cache.has(version):
+                version, bundle = download_to_cache(
+                    client, MODEL_NAME, model_cache, version
+                )
+            else:
+                bundle = model_cache.load(version)
+
+            if version == current_model.version:
+                return version
+
+            candidate = ServingModel(
+                version, bundle,
+                n_threads=MODEL_THREADS, parallel=ENSEMBLE_PARALLEL,
+            )
+            candidate.warm_up(build_feature_row)
+        except Exception:
+            MODEL_RELOAD_FAILURES.inc()
+            raise
+
+        previous = current_model.version
+        current_model = candidate
+        MODEL_VERSION.set(version)
+        MODEL_RELOADS.inc()
+
+        # Keys carry the version, so old entries can never be served;
+        # dropping them just frees the memory budget for the new model
+        if prediction_cache is not None:
+            prediction_cache.clear()
+
+        del bundle, candidate
+        gc.collect()
+
+    print(f"🔁 Hot-swapped model version {previous} → {version}")
+    return version
+
 
 # ============================================================
 # REQUEST BODY MODEL
@@ -80,40 +310,308 @@ class InputData(BaseModel):
 def home():
     return {
         "message": "Swiggy ETA Prediction API is running 🚀",
-        "latest_model_version": latest_ver
+        "latest_model_version": current_model.version
     }
 
 
+# ============================================================
+# RAW RECORDS → (prediction, rejection reason, model used)
+# ============================================================
+def score_frame(records: list) -> list:
+    """Vectorized pandas cleaning over all records, one booster call."""
+
+    model = current_model
+    results = [None] * len(records)
+
+    start = perf_counter()
+    raw_df = pd.DataFrame(records)
+
+    features_df = build_features(raw_df)
+    cleaned_df = features_df.dropna()
+
+    for idx, reason in explain_rejections(raw_df, features_df).items():
+        results[idx] = (None, reason, model)
+    OBSERVE_CLEAN(perf_counter() - start)
+    REJECTED_ROWS.inc(len(records) - len(cleaned_df))
+
+    if not cleaned_df.empty:
+        preds = model.predict_cleaned(cleaned_df, prediction_cache)
+        for idx, pred in zip(cleaned_df.index, preds):
+            results[idx] = (float(pred), None, model)
+
+    return results
+
+
+def score_records(records: list) -> list:
+    """Per-record fast feature building, one booster call for all rows."""
+
+    if not USE_FAST_FEATURES:
+        return score_frame(records)
+
+    model = current_model
+    results = [None] * len(records)
+    kept, rows = [], []
+
+    start = perf_counter()
+    for i, record in enumerate(records):
+        # Same features as perform_data_cleaning, without pandas
+        features, reason = build_feature_row(record)
+        if features is None:
+            results[i] = (None, reason, model)
+        else:
+            kept.append(i)
+            rows.append(features)
+    OBSERVE_CLEAN(perf_counter() - start)
+    REJECTED_ROWS.inc(len(records) - len(rows))
+
+    if rows:
+        preds = model.predict_feature_rows(rows, prediction_cache)
+        for i, pred in zip(kept, preds):
+            results[i] = (float(pred), None, model)
+
+    return results
+
+
+def overloaded(exc: PoolOverloaded) -> HTTPException:
+    """503 telling clients to back off instead of queueing forever."""
+    return HTTPException(
+        status_code=503, detail=str(exc), headers={"Retry-After": "1"}
+    )
+
+
+def observe_validation(request: Request):
+    """
+    Body read + JSON decode + InputData validation: everything before
+    the handler ran.
+    """
+    OBSERVE_VALIDATE(perf_counter() - request.state.received_at)
+
+
+def serialize(body: dict) -> JSONResponse:
+    """Render the response here (not in FastAPI) to time serialization."""
+    start = perf_counter()
+    response = JSONResponse(body)
+    OBSERVE_SERIALIZE(perf_counter() - start)
+    return response
+
+
+async def profiled(handler, label: str, data, score):
+    """
+    Run `handler` for a request picked by the sampling profiler: its
+    frames on the event loop and the `score` job on the inference
+    pool are sampled under `label`. (A micro-batched /predict job is
+    shared with other requests and so is not attributed to it.)
+    """
+    with request_profiler.track(sys._getframe(), label):
+        score = request_profiler.wrap(score, f"{label};inference")
+        return await handler(data, score)
+
+
 # ============================================================
 # PREDICTION ENDPOINT
 # ============================================================
 @app.post("/predict")
-def predict(data: InputData):
+async def predict(data: InputData, request: Request):
 
-    # Convert input → DataFrame
-    raw_df = pd.DataFrame([data.dict()])
+    observe_validation(request)
 
-    # Clean using DVC equivalent cleaning logic
-    cleaned_df = perform_data_cleaning(raw_df)
+    if request_profiler.every_n and request_profiler.should_sample():
+        return await profiled(
+            predict_one, "POST /predict", data, score_records
+        )
+    return await predict_one(data, score_records)
 
-    if cleaned_df.empty:
-        return {"error": "Input cleaning removed the row (invalid input values)."}
 
-    # Preprocess features
-    X = preprocessor.transform(cleaned_df)
+async def predict_one(data: InputData, score):
 
-    # Predict from both models
-    pred_cat = cat_model.predict(X)
-    pred_lgb = lgb_model.predict(X)
+    record = data.dict()
 
-    # Weighted average output
-    final_pred = float((w_cat * pred_cat) + (w_lgb * pred_lgb))
+    try:
+        if batcher is not None:
+            final_pred, reason, model = await batcher.submit(record)
+        else:
+            scored = await inference_pool.run(score, [record])
+            final_pred, reason, model = scored[0]
+    except PoolOverloaded as exc:
+        raise overloaded(exc)
 
-    return {
+    if final_pred is None:
+        REJECTED_REQUESTS.labels("/predict").inc()
+        return serialize({
+            "error": "Input cleaning removed the row (invalid input values).",
+            "reason": reason,
+        })
+
+    return serialize({
         "predicted_time_minutes": final_pred,
-        "model_version_used": latest_ver,
-        "weights": {"catboost": w_cat, "lightgbm": w_lgb}
-    }
+        "model_version_used": model.version,
+        "weights": model.weights
+    })
+
+
+# ============================================================
+# BATCH PREDICTION ENDPOINT
+# ============================================================
+@app.post("/predict/batch")
+async def predict_batch(data: List[InputData], request: Request):
+    """
+    Score many orders in one vectorized pass: cleaning, preprocessing
+    and both boosters run once over the whole frame. Rows removed by
+    cleaning are returned with the reason they were rejected.
+    """
+
+    observe_validation(request)
+
+    if len(data) > MAX_BATCH_ROWS:
+        raise HTTPException(
+            status_code=413,
+            detail=(
+                f"Batch too large: {len(data)} rows "
+                f"(max {MAX_BATCH_ROWS})."
+            ),
+        )
+
+    if request_profiler.every_n and request_profiler.should_sample():
+        return await profiled(
+            predict_many, "POST /predict/batch", data, score_frame
+        )
+    return await predict_many(data, score_frame)
+
+
+async def predict_many(data: List[InputData], score):
+
+    scored = []
+    model = current_model
+    if data:
+        try:
+            records = [row.dict() for row in data]
+            scored = await inference_pool.run(score, records)
+        except PoolOverloaded as exc:
+            raise overloaded(exc)
+
+    results = []
+    for idx, (pred, reason, model) in enumerate(scored):
+        if pred is None:
+            results.append({"row": idx, "error": reason})
+        else:
+            results.append({"row": idx, "predicted_time_minutes": pred})
+
+    n_rejected = sum("error" in r for r in results)
+    if results and n_rejected == len(results):
+        REJECTED_REQUESTS.labels("/predict/batch").inc()
+
+    return serialize({
+        "predictions": results,
+        "n_rows": len(results),
+        "n_rejected": n_rejected,
+        "model_version_used": model.version,
+        "weights": model.weights
+    })
+
+
+# ============================================================
+# ADMIN: HOT RELOAD
+# ============================================================
+def check_admin(token: Optional[str]):
+    """Fail closed: no ADMIN_TOKEN configured → every admin call is refused."""
+    if not ADMIN_TOKEN:
+        raise HTTPException(
+            status_code=403,
+            detail="Admin endpoints are disabled (ADMIN_TOKEN not set).",
+        )
+    if token != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid admin token.")
+
+
+@app.post("/admin/reload")
+async def admin_reload(
+    version: Optional[int] = None,
+    x_admin_token: Optional[str] = Header(default=None),
+):
+    """Load (default: latest registered) version, warm it up and swap it in."""
+
+    check_admin(x_admin_token)
+
+    previous = current_model.version
+    try:
+        loaded = await run_in_threadpool(reload_model, version)
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=f"Reload failed: {exc}")
+
+    return {"previous_version": previous, "model_version": loaded}
+
+
+# ============================================================
+# ADMIN: SAMPLING PROFILER
+# ============================================================
+@app.post("/admin/profile")
+async def admin_profile(
+    every: int,
+    interval_ms: Optional[float] = None,
+    reset: bool = False,
+    x_admin_token: Optional[str] = Header(default=None),
+):
+    """
+    Profile 1 in `every` prediction requests (0: stop); `reset` drops
+    collected stacks.
+    """
+
+    check_admin(x_admin_token)
+
+    try:
+        request_profiler.configure(every, interval_ms)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if reset:
+        request_profiler.reset()
+
+    return request_profiler.status()
+
+
+@app.get("/admin/profile")
+async def admin_profile_download(
+    format: Literal["collapsed", "speedscope", "status"] = "collapsed",
+    x_admin_token: Optional[str] = Header(default=None),
+):
+    """
+    Stacks collected so far: collapsed (flamegraph.pl / speedscope) or
+    speedscope JSON.
+    """
+
+    check_admin(x_admin_token)
+
+    if format == "status":
+        return request_profiler.status()
+
+    if format == "speedscope":
+        return JSONResponse(
+            request_profiler.speedscope(),
+            headers={
+                "Content-Disposition":
+                    'attachment; filename="eta-profile.speedscope.json"'
+            },
+        )
+
+    return Response(
+        request_profiler.collapsed(),
+        media_type="text/plain",
+        headers={
+            "Content-Disposition":
+                'attachment; filename="eta-profile.collapsed.txt"'
+        },
+    )
+
+
+# ============================================================
+# METRICS ENDPOINT (Prometheus text format)
+# ============================================================
+@app.get("/metrics")
+def metrics():
+    usage = memory_usage()
+    PROCESS_RSS.set(usage["rss"])
+    PROCESS_PSS.set(usage.get("pss", usage["rss"]))
+
+    return Response(render_metrics(), media_type=CONTENT_TYPE)
 
 
 # ============================================================
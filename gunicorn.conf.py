@@ -0,0 +1,80 @@
+import gc
+import os
+
+from scripts.process_memory import memory_usage, format_memory
+
+# ============================================================
+# PRODUCTION LAUNCHER
+# ------------------------------------------------------------
+#   gunicorn app:app            (this file is picked up automatically)
+#
+# The model bundle is loaded once in the master (preload_app) and
+# workers are forked from it, so boosters and preprocessor pages are
+# shared copy-on-write instead of being loaded once per worker.
+# ============================================================
+
+# ============================================================
+# WORKERS
+# ============================================================
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_WORKERS", "0")) or os.cpu_count()
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+# SIGTERM → stop accepting, let in-flight requests finish, run lifespan
+# shutdown
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+timeout = int(os.getenv("WORKER_TIMEOUT", "60"))
+keepalive = int(os.getenv("KEEPALIVE", "5"))
+
+# ============================================================
+# THREAD PINNING
+# ------------------------------------------------------------
+# Each worker gets cores / workers cores. A worker runs
+# INFERENCE_THREADS jobs at once (default 1: concurrency comes from
+# the workers), each booster call using MODEL_THREADS threads, two
+# booster calls at a time with ENSEMBLE_PARALLEL. MODEL_THREADS
+# defaults to the share divided by both, so workers × jobs × booster
+# threads stays within the cores. Must be set before app.py (and so
+# LightGBM / CatBoost) is imported by the preload.
+# ============================================================
+cores_per_worker = max(1, os.cpu_count() // workers)
+inference_threads = int(os.getenv("INFERENCE_THREADS", "0")) or 1
+boosters_at_once = 2 if os.getenv("ENSEMBLE_PARALLEL", "0") == "1" else 1
+threads_per_worker = int(os.getenv("MODEL_THREADS", "0")) or max(
+    1, cores_per_worker // (inference_threads * boosters_at_once)
+)
+
+os.environ["INFERENCE_THREADS"] = str(inference_threads)
+for var in (
+    "MODEL_THREADS",
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+):
+    os.environ.setdefault(var, str(threads_per_worker))
+
+
+# ============================================================
+# HOOKS
+# ============================================================
+def when_ready(server):
+    # Move everything loaded so far (the model bundle) out of the GC's
+    # reach, so collections in workers do not touch and un-share it
+    gc.collect()
+    gc.freeze()
+
+    server.log.info(
+        f"🧊 Model preloaded, {gc.get_freeze_count()} objects frozen | "
+        f"master {format_memory(memory_usage())}"
+    )
+    server.log.info(
+        f"🚀 Starting {workers} workers × {inference_threads} inference "
+        f"threads × {threads_per_worker} model threads"
+    )
+
+
+def post_worker_init(worker):
+    worker.log.info(
+        f"👷 Worker {worker.pid} ready | {format_memory(memory_usage())}"
+    )
@@ -0,0 +1,369 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Repo root on sys.path so `src.*` / `scripts.*` / `app` import when run
+# as a script
+ROOT = Path(__file__).parent.parent
+sys.path.append(str(ROOT))
+from src.models.register import build_bundle  # noqa: E402
+from scripts.data_clean_utils import perform_data_cleaning  # noqa: E402
+from scripts.model_cache import ModelCache  # noqa: E402
+from scripts.serving_model import ServingModel  # noqa: E402
+
+# ======================================================
+# SERVING HOT-PATH BENCHMARK
+# ------------------------------------------------------
+#   python scripts/benchmark_serving.py [--batch-sizes 1 64 4096]
+#
+# Offline: the bundle is assembled from the locally trained
+# artifacts in models/ (as register.py would log it) and the API is
+# driven in-process through its ASGI interface, no MLflow or network.
+#
+# Stages, each timed on its own at every batch size:
+#   clean       perform_data_cleaning(raw frame)
+#   preprocess  preprocessor.transform(cleaned)
+#   compiled    compiled_preprocessor.transform(cleaned) (if bundled)
+#   catboost    cat_model.predict(X)
+#   lightgbm    lgb_model.predict(X)
+#   ensemble    ensemble.predict(X) (fused blend the API uses)
+#   api         POST /predict (batch 1) or /predict/batch
+#
+# Results (p50/p95/p99 latency, rows/sec) go to a JSON file named
+# after the current commit, so runs can be compared over time.
+# ======================================================
+RAW_PATH = ROOT / "data" / "raw" / "swiggy.csv"
+MODEL_DIR = ROOT / "models"
+PARAMS_PATH = ROOT / "params.yaml"
+OUTPUT_DIR = ROOT / "reports" / "benchmarks"
+
+BATCH_SIZES = [1, 4, 16, 64, 256, 1024, 4096]
+STAGES = [
+    "clean", "preprocess", "compiled", "catboost", "lightgbm", "ensemble",
+    "api",
+]
+
+# Version tag of the locally assembled bundle
+LOCAL_VERSION = 0
+
+NUMERIC_COLS = [
+    "Delivery_person_Age", "Delivery_person_Ratings", "multiple_deliveries"
+]
+
+
+# ======================================================
+# INPUT ROWS (typed like the API's InputData)
+# ======================================================
+def load_records(path: Path, seed: int = 42) -> list:
+    """Raw orders without missing values, shuffled, as /predict payloads."""
+
+    df = pd.read_csv(path, dtype=str).drop(columns=["Time_taken(min)"])
+    df = df[~df.isin(["NaN "]).any(axis=1)]
+
+    for col in NUMERIC_COLS + [col for col in df.columns if "itude" in col]:
+        df[col] = df[col].str.strip().astype(float)
+    df["Vehicle_condition"] = df["Vehicle_condition"].astype(int)
+
+    return df.sample(frac=1, random_state=seed).to_dict("records")
+
+
+def take(records: list, n: int) -> list:
+    """First `n` records, cycling when the dataset is smaller."""
+    reps = -(-n // len(records))
+    return (records * reps)[:n]
+
+
+# ======================================================
+# TIMING
+# ======================================================
+def summarize(timings: list, batch_size: int) -> dict:
+    ms = np.array(timings) * 1e3
+    return {
+        "n_iter": len(timings),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "mean_ms": float(ms.mean()),
+        "rows_per_sec": batch_size * len(timings) / float(np.sum(timings)),
+    }
+
+
+def keep_sampling(timings: list, spent: float, min_iters: int,
+                  max_iters: int, budget: float) -> bool:
+    """Whether another call should be timed."""
+    if len(timings) >= max_iters:
+        return False
+    return len(timings) < min_iters or spent < budget
+
+
+def time_stage(fn, min_iters: int, max_iters: int, budget: float,
+               warmup: int = 2) -> list:
+    """
+    Seconds per call; at least `min_iters` calls, then until `budget`
+    is spent.
+    """
+    for _ in range(warmup):
+        fn()
+
+    timings = []
+    spent = 0.0
+    while keep_sampling(timings, spent, min_iters, max_iters, budget):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+        spent += timings[-1]
+    return timings
+
+
+async def time_stage_async(fn, min_iters: int, max_iters: int,
+                           budget: float, warmup: int = 2) -> list:
+    for _ in range(warmup):
+        await fn()
+
+    timings = []
+    spent = 0.0
+    while keep_sampling(timings, spent, min_iters, max_iters, budget):
+        start = time.perf_counter()
+        await fn()
+        timings.append(time.perf_counter() - start)
+        spent += timings[-1]
+    return timings
+
+
+# ======================================================
+# IN-PROCESS API
+# ======================================================
+@contextmanager
+def in_process_app(bundle: dict, model: ServingModel):
+    """
+    Import app.py against a throwaway model cache holding the local
+    bundle (so startup never reaches for the registry), with
+    background polling and the prediction cache off. Serving state
+    and environment are restored on exit.
+    """
+
+    overrides = {"MODEL_REFRESH_SECONDS": "0", "PREDICTION_CACHE_MB": "0"}
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = ModelCache(cache_dir, "Swiggy-Ensemble-Model")
+        cache.store(LOCAL_VERSION, bundle)
+        overrides["MODEL_CACHE_DIR"] = cache_dir
+
+        saved_env = {name: os.environ.get(name) for name in overrides}
+        os.environ.update(overrides)
+
+        import app as app_module
+
+        # Already imported (e.g. under pytest): serve the benchmark model
+        # anyway
+        saved_state = app_module.current_model, app_module.prediction_cache
+        app_module.current_model = model
+        app_module.prediction_cache = None
+
+        try:
+            yield app_module.app
+        finally:
+            app_module.current_model, app_module.prediction_cache = saved_state
+            for name, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+
+def bench_api(app, records: list, batch_sizes: list, timing: dict) -> list:
+    import httpx
+
+    async def run():
+        results = []
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark"
+        ) as client:
+            for batch_size in batch_sizes:
+                if batch_size == 1:
+                    endpoint, body = "/predict", records[0]
+                else:
+                    endpoint = "/predict/batch"
+                    body = take(records, batch_size)
+
+                async def call():
+                    response = await client.post(endpoint, json=body)
+                    response.raise_for_status()
+
+                timings = await time_stage_async(call, **timing)
+                results.append({
+                    "stage": "api",
+                    "endpoint": endpoint,
+                    "batch_size": batch_size,
+                    **summarize(timings, batch_size),
+                })
+                print_result(results[-1])
+        return results
+
+    return asyncio.run(run())
+
+
+# ======================================================
+# RUN
+# ======================================================
+def print_result(result: dict):
+    print(
+        f"{result['stage']:>10} {result['batch_size']:>6} "
+        f"{result['p50_ms']:>10.3f} {result['p95_ms']:>10.3f} "
+        f"{result['p99_ms']:>10.3f} {result['rows_per_sec']:>14,.0f}"
+    )
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, text=True, stderr=subprocess.DEVNULL,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def environment(n_threads: int) -> dict:
+    import catboost
+    import fastapi
+    import lightgbm
+    import sklearn
+
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(
+            timespec="seconds"
+        ),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "model_threads": n_threads,
+        "versions": {
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "scikit-learn": sklearn.__version__,
+            "lightgbm": lightgbm.__version__,
+            "catboost": catboost.__version__,
+            "fastapi": fastapi.__version__,
+        },
+    }
+
+
+def run_benchmark(batch_sizes=BATCH_SIZES, stages=STAGES,
+                  n_threads: int = -1, min_iters: int = 20,
+                  max_iters: int = 1000, budget: float = 1.0,
+                  raw_path: Path = RAW_PATH, model_dir: Path = MODEL_DIR,
+                  params_path: Path = PARAMS_PATH) -> dict:
+
+    timing = {
+        "min_iters": min_iters, "max_iters": max_iters, "budget": budget
+    }
+
+    bundle = build_bundle(model_dir, params_path)
+    model = ServingModel(LOCAL_VERSION, bundle, n_threads=n_threads)
+    records = load_records(raw_path)
+
+    print(
+        f"\n{'stage':>10} {'batch':>6} {'p50 ms':>10} {'p95 ms':>10} "
+        f"{'p99 ms':>10} {'rows/s':>14}"
+    )
+
+    results = []
+    for batch_size in batch_sizes:
+        raw_df = pd.DataFrame(take(records, batch_size))
+        cleaned = perform_data_cleaning(raw_df)
+        X = model.preprocessor.transform(cleaned)
+
+        threads = model.n_threads
+        stage_calls = {
+            "clean": lambda: perform_data_cleaning(raw_df),
+            "preprocess": lambda: model.preprocessor.transform(cleaned),
+            "catboost": lambda: model.cat_model.predict(
+                X, thread_count=threads
+            ),
+            "lightgbm": lambda: model.lgb_model.predict(
+                X, num_threads=threads
+            ),
+            "ensemble": lambda: model.ensemble.predict(
+                X, threads, model.parallel
+            ),
+        }
+        compiled = model.compiled_preprocessor
+        if compiled is not None:
+            stage_calls["compiled"] = lambda: compiled.transform(cleaned)
+
+        for stage in stages:
+            if stage not in stage_calls:
+                continue
+            timings = time_stage(stage_calls[stage], **timing)
+            results.append({
+                "stage": stage,
+                "batch_size": batch_size,
+                **summarize(timings, batch_size),
+            })
+            print_result(results[-1])
+
+    if "api" in stages:
+        with in_process_app(bundle, model) as app:
+            results += bench_api(app, records, batch_sizes, timing)
+
+    return {
+        "environment": environment(n_threads),
+        "timing": timing,
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the serving hot path"
+    )
+    parser.add_argument("--batch-sizes", type=int, nargs="+",
+                        default=BATCH_SIZES)
+    parser.add_argument("--stages", nargs="+", choices=STAGES,
+                        default=STAGES)
+    parser.add_argument("--model-threads", type=int,
+                        default=int(os.getenv("MODEL_THREADS", "-1")))
+    parser.add_argument("--min-iters", type=int, default=20)
+    parser.add_argument("--max-iters", type=int, default=1000)
+    parser.add_argument(
+        "--budget", type=float, default=1.0,
+        help="Seconds to keep sampling each stage after --min-iters",
+    )
+    parser.add_argument(
+        "--output", type=Path, default=None,
+        help="JSON report path "
+             "(default: reports/benchmarks/serving-<commit>.json)",
+    )
+    args = parser.parse_args()
+
+    report = run_benchmark(
+        args.batch_sizes, args.stages, args.model_threads,
+        args.min_iters, args.max_iters, args.budget,
+    )
+
+    commit = report["environment"]["commit"]
+    output = args.output or OUTPUT_DIR / f"serving-{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\n✅ Benchmark report → {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import argparse
+import hashlib
+import io
+import sys
+import time
+from pathlib import Path
+
+import joblib
+import yaml
+
+# Repo root on sys.path so `src.*` imports work when run as a script
+sys.path.append(str(Path(__file__).parent.parent))
+from src.models.train_model import train_boosters, thread_counts  # noqa: E402
+
+# ======================================================
+# TRAINING BENCHMARK (sequential vs parallel boosters)
+# ------------------------------------------------------
+#   python scripts/benchmark_training.py [--budget 32] [--repeats 3]
+#                                        [--no-early-stopping]
+#
+# Trains CatBoost + LightGBM with the Train section of params.yaml
+# in both modes, as train_model.py runs them: sequentially each
+# booster has the whole thread budget, in parallel they split it.
+# Reports the best wall-clock of each mode. Both modes must save
+# byte-identical joblib artifacts.
+# ======================================================
+ROOT = Path(__file__).parent.parent
+MATRIX_DIR = ROOT / "data" / "processed" / "matrix"
+
+
+def joblib_sha256(model) -> str:
+    buffer = io.BytesIO()
+    joblib.dump(model, buffer)
+    return hashlib.sha256(buffer.getvalue()).hexdigest()
+
+
+def run(params: dict, parallel: bool):
+    threads = {**params["threads"], "parallel": parallel}
+    params = {**params, "threads": threads}
+    start = time.perf_counter()
+    models, summary = train_boosters(MATRIX_DIR, params)
+    wall = time.perf_counter() - start
+    digests = {
+        section: joblib_sha256(model) for section, model in models.items()
+    }
+    return wall, digests, summary
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark sequential vs parallel booster training"
+    )
+    parser.add_argument(
+        "--budget", type=int,
+        help="total threads (default: Train.threads.budget)",
+    )
+    parser.add_argument("--repeats", type=int, default=1)
+    parser.add_argument("--no-early-stopping", action="store_true",
+                        help="train every params.yaml tree")
+    args = parser.parse_args()
+
+    params = yaml.safe_load(open(ROOT / "params.yaml"))["Train"]
+    if args.budget:
+        params["threads"]["budget"] = args.budget
+    if args.no_early_stopping:
+        params["early_stopping"] = {
+            **params["early_stopping"], "enabled": False
+        }
+
+    for parallel in (False, True):
+        split = thread_counts({**params["threads"], "parallel": parallel})
+        mode = "parallel" if parallel else "sequential"
+        print(f"Threads per booster ({mode}): {split}")
+
+    results = {}
+    for parallel in (False, True):
+        walls, digests = [], None
+        for _ in range(args.repeats):
+            wall, run_digests, summary = run(params, parallel)
+            walls.append(wall)
+            assert digests in (None, run_digests), (
+                "Artifacts differ between repeats"
+            )
+            digests = run_digests
+        results[parallel] = (min(walls), digests, summary)
+
+    sequential, parallel = results[False], results[True]
+
+    columns = " ".join(f"{s + ' fit':>14}" for s in sequential[2])
+    print(f"\n{'mode':<12} {'wall':>8} {columns}")
+    modes = (("sequential", sequential), ("parallel", parallel))
+    for name, (wall, _, summary) in modes:
+        fits = " ".join(
+            f"{info['fit_seconds']:>13.2f}s" for info in summary.values()
+        )
+        print(f"{name:<12} {wall:>7.2f}s {fits}")
+    print(f"\nSpeedup: {sequential[0] / parallel[0]:.2f}x")
+
+    assert sequential[1] == parallel[1], (
+        "Parallel artifacts differ from sequential ones"
+    )
+    print("✅ joblib artifacts identical in both modes")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,170 +1,55 @@
-import numpy as np
 import pandas as pd
 
-# ================================================================
-# SAME COLUMNS_TO_DROP AS DVC CLEANING (except output columns kept)
-# ================================================================
-columns_to_drop = [
-    "rider_id",
-    "restaurant_latitude",
-    "restaurant_longitude",
-    "delivery_latitude",
-    "delivery_longitude",
-    "order_date",
-    "order_time_hour",
-    "order_day",
-    "city_name",
-    "order_day_of_week",
-    "order_month",
-]
-
-# ================================================================
-# TIME OF DAY (same as DVC logic)
-# ================================================================
-def time_of_day(series: pd.Series):
-    return pd.cut(
-        series,
-        bins=[0, 6, 12, 17, 20, 24],
-        labels=["after_midnight", "morning", "afternoon", "evening", "night"],
-        right=True,
-    )
-
-
-# ================================================================
-# CHANGE COLUMN NAMES (same as DVC)
-# ================================================================
-def change_column_names(df: pd.DataFrame) -> pd.DataFrame:
-    return (
-        df.rename(str.lower, axis=1)
-        .rename(
-            {
-                "delivery_person_id": "rider_id",
-                "delivery_person_age": "age",
-                "delivery_person_ratings": "ratings",
-                "delivery_location_latitude": "delivery_latitude",
-                "delivery_location_longitude": "delivery_longitude",
-                "time_orderd": "order_time",
-                "time_order_picked": "order_picked_time",
-                "weatherconditions": "weather",
-                "road_traffic_density": "traffic",
-                "city": "city_type",
-                #"time_taken(min)": "time_taken",
-            },
-            axis=1,
-        )
-    )
-
+from src.features.build_features import build_features, parse_time_of_day
 
 # ================================================================
-# DATA CLEANING LOGIC (same as DVC)
+# FULL PIPELINE FOR API (no saving)
+# ----------------------------------------------------------------
+# Feature engineering lives in src/features/build_features.py and
+# is shared with the DVC cleaning stage; build_features() keeps the
+# rows with missing values (NaN) so they can be explained below.
 # ================================================================
-def data_cleaning(df: pd.DataFrame) -> pd.DataFrame:
-
-    # Drop minors & invalid ratings
-    minor_index = df.loc[df["age"].astype(float) < 18].index
-    six_star_index = df.loc[df["ratings"] == "6"].index
-
-    return (
-        df.drop(columns="id", errors="ignore")
-        .drop(index=minor_index)
-        .drop(index=six_star_index)
-        .replace("NaN ", np.nan)
-        .assign(
-            city_name=lambda x: x["rider_id"].str.split("RES").str.get(0),
-
-            age=lambda x: x["age"].astype(float),
-            ratings=lambda x: x["ratings"].astype(float),
-
-            restaurant_latitude=lambda x: x["restaurant_latitude"].abs(),
-            restaurant_longitude=lambda x: x["restaurant_longitude"].abs(),
-            delivery_latitude=lambda x: x["delivery_latitude"].abs(),
-            delivery_longitude=lambda x: x["delivery_longitude"].abs(),
-
-            order_date=lambda x: pd.to_datetime(x["order_date"], dayfirst=True),
-            order_day=lambda x: x["order_date"].dt.day,
-            order_month=lambda x: x["order_date"].dt.month,
-            order_day_of_week=lambda x: x["order_date"].dt.day_name().str.lower(),
-            is_weekend=lambda x: x["order_date"].dt.day_name().isin(["Saturday", "Sunday"]).astype(int),
-
-            order_time=lambda x: pd.to_datetime(x["order_time"], format="mixed"),
-            order_picked_time=lambda x: pd.to_datetime(x["order_picked_time"], format="mixed"),
-
-            pickup_time_minutes=lambda x: (
-                (x["order_picked_time"] - x["order_time"]).dt.seconds / 60
-            ),
-
-            order_time_hour=lambda x: x["order_time"].dt.hour,
-            order_time_of_day=lambda x: x["order_time_hour"].pipe(time_of_day),
-
-            weather=lambda x: (
-                x["weather"]
-                .str.replace("conditions ", "")
-                .str.lower()
-                .replace("nan", np.nan)
-            ),
-            traffic=lambda x: x["traffic"].str.rstrip().str.lower(),
-            type_of_order=lambda x: x["type_of_order"].str.rstrip().str.lower(),
-            type_of_vehicle=lambda x: x["type_of_vehicle"].str.rstrip().str.lower(),
-            festival=lambda x: x["festival"].str.rstrip().str.lower(),
-            city_type=lambda x: x["city_type"].str.rstrip().str.lower(),
+def perform_data_cleaning(df: pd.DataFrame) -> pd.DataFrame:
 
-            multiple_deliveries=lambda x: x["multiple_deliveries"].astype(float),
+    cleaned = build_features(df)
 
-            # Convert "(min) 23" → 23 for backward compatibility
+    # Remove NaN rows
+    cleaned = cleaned.dropna()
 
-            
-        )
-        .drop(columns=["order_time", "order_picked_time"], errors="ignore")
-    )
+    return cleaned
 
 
 # ================================================================
-# HAVERSINE DISTANCE (same as DVC)
+# REJECTION REASONS (rows removed by cleaning)
 # ================================================================
-def calculate_haversine_distance(df):
-    lat1 = np.radians(df["restaurant_latitude"])
-    lon1 = np.radians(df["restaurant_longitude"])
-    lat2 = np.radians(df["delivery_latitude"])
-    lon2 = np.radians(df["delivery_longitude"])
-
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
-
-    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
-    c = 2 * np.arcsin(np.sqrt(a))
-    distance = 6371 * c
-
-    return df.assign(distance=distance)
-
+def explain_rejections(raw_df: pd.DataFrame, features_df: pd.DataFrame) -> dict:
+    """
+    Map every raw row index that did not survive cleaning to a
+    human readable reason. `features_df` is the output of
+    build_features() (before dropna) for the same `raw_df`.
+    """
+    reasons = {}
 
-# ================================================================
-# DISTANCE TYPE
-# ================================================================
-def add_distance_type(df):
-    df["distance_type"] = pd.cut(
-        df["distance"],
-        bins=[0, 5, 10, 15, 25],
-        right=False,
-        labels=["short", "medium", "long", "very_long"],
-    )
-    return df
+    ages = pd.to_numeric(raw_df["Delivery_person_Age"], errors="coerce")
 
+    for idx in raw_df.index.difference(features_df.index):
+        if ages.loc[idx] < 18:
+            reasons[idx] = "Delivery person is under 18."
+        else:
+            reasons[idx] = "Invalid rating (6 stars)."
 
-# ================================================================
-# FULL PIPELINE FOR API (no saving)
-# ================================================================
-def perform_data_cleaning(df: pd.DataFrame) -> pd.DataFrame:
+    missing = features_df.isna()
+    for idx in features_df.index[missing.any(axis=1)]:
+        cols = missing.columns[missing.loc[idx]].tolist()
+        reasons[idx] = f"Missing or invalid values: {', '.join(cols)}."
 
-    cleaned = (
-        df
-        .pipe(change_column_names)
-        .pipe(data_cleaning)
-        .pipe(calculate_haversine_distance)
-        .pipe(add_distance_type)
-        .drop(columns=columns_to_drop, errors="ignore")
-    )
+    for idx in features_df.index[features_df["is_weekend"].isna()]:
+        reasons[idx] = "Unparseable order date."
 
-    # Remove NaN rows
-    cleaned = cleaned.dropna()
+    kept = raw_df.loc[features_df.index]
+    _, bad_order = parse_time_of_day(kept["Time_Orderd"])
+    _, bad_picked = parse_time_of_day(kept["Time_Order_picked"])
+    for idx in features_df.index[bad_order | bad_picked]:
+        reasons[idx] = "Unparseable order or pickup time."
 
-    return cleaned
+    return reasons
@@ -0,0 +1,182 @@
+import math
+from datetime import datetime
+
+from dateutil import parser as date_parser
+
+# FEATURE_COLUMNS is re-exported for scripts.serving_model
+from src.features.build_features import (  # noqa: F401
+    FEATURE_COLUMNS,
+    TIME_OF_DAY_EDGES,
+    TIME_OF_DAY_LABELS,
+    DISTANCE_EDGES,
+    DISTANCE_LABELS,
+    EARTH_RADIUS_KM,
+    ORDER_DATE_FORMAT,
+    SECONDS_PER_DAY,
+    time_to_seconds,
+)
+
+# ================================================================
+# SCALAR (PANDAS-FREE) FEATURE BUILDER FOR A SINGLE ORDER
+# ----------------------------------------------------------------
+# Mirrors src/features/build_features.build_features() + dropna()
+# for one InputData record, value for value, without building a
+# DataFrame.
+# ================================================================
+
+# Bins as (low, high, label), same edges as the vectorized builder
+TIME_OF_DAY_BINS = list(
+    zip(TIME_OF_DAY_EDGES[:-1], TIME_OF_DAY_EDGES[1:], TIME_OF_DAY_LABELS)
+)
+DISTANCE_TYPE_BINS = list(
+    zip(DISTANCE_EDGES[:-1], DISTANCE_EDGES[1:], DISTANCE_LABELS)
+)
+
+
+# ================================================================
+# SMALL HELPERS
+# ================================================================
+def _is_missing(value) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, float):
+        return math.isnan(value)
+    # .replace("NaN ", np.nan) in the pandas path
+    return value == "NaN "
+
+
+def _to_float(value) -> float:
+    return math.nan if _is_missing(value) else float(value)
+
+
+def _normalize(value):
+    """.str.rstrip().str.lower()"""
+    return None if _is_missing(value) else value.rstrip().lower()
+
+
+def _parse_order_date(value):
+    """pd.to_datetime(value, dayfirst=True)"""
+    try:
+        return datetime.strptime(value, ORDER_DATE_FORMAT)
+    except ValueError:
+        return date_parser.parse(value, dayfirst=True)
+
+
+def _parse_time(value):
+    """Seconds since midnight, same formats as parse_time_of_day()."""
+    seconds = time_to_seconds(value)
+    if seconds is None:
+        raise ValueError(f"Unparseable time: {value!r}")
+    return seconds
+
+
+def _parse_optional_time(value):
+    """_parse_time(), or None for a missing value."""
+    return None if _is_missing(value) else _parse_time(value)
+
+
+def _bin(value, bins, right: bool):
+    if math.isnan(value):
+        return None
+    for low, high, label in bins:
+        if (low < value <= high) if right else (low <= value < high):
+            return label
+    return None
+
+
+def haversine_distance(lat1, lon1, lat2, lon2) -> float:
+    lat1, lon1 = math.radians(lat1), math.radians(lon1)
+    lat2, lon2 = math.radians(lat2), math.radians(lon2)
+
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+
+    a = (
+        math.sin(dlat / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
+    )
+    c = 2 * math.asin(math.sqrt(a))
+    return EARTH_RADIUS_KM * c
+
+
+# ================================================================
+# FEATURE BUILDER
+# ================================================================
+def build_feature_row(record: dict):
+    """
+    Build the cleaned feature row for one raw order.
+
+    Returns (features, None) where `features` is a dict keyed by
+    FEATURE_COLUMNS, or (None, reason) when the pandas pipeline
+    would have dropped the row.
+    """
+
+    age = _to_float(record["Delivery_person_Age"])
+
+    # Drop minors (NaN ages survive here and fall out as missing below).
+    # Ratings arrive as floats from InputData, so the pandas path's
+    # `ratings == "6"` check never matches on the API side either.
+    if age < 18:
+        return None, "Delivery person is under 18."
+
+    try:
+        order_date = record["Order_Date"]
+        is_weekend = 0
+        if not _is_missing(order_date):
+            is_weekend = int(_parse_order_date(order_date).weekday() >= 5)
+
+        order_time = record["Time_Orderd"]
+        picked_time = record["Time_Order_picked"]
+        order_time = _parse_optional_time(order_time)
+        picked_time = _parse_optional_time(picked_time)
+    except (ValueError, OverflowError):
+        return None, "Unparseable order date or time."
+
+    if order_time is None or picked_time is None:
+        pickup_time_minutes = math.nan
+    else:
+        # A pickup earlier in the day than the order wraps around midnight
+        pickup_time_minutes = (picked_time - order_time) % SECONDS_PER_DAY / 60
+
+    order_hour = math.nan if order_time is None else order_time // 3600
+
+    weather = record["Weatherconditions"]
+    if not _is_missing(weather):
+        weather = weather.replace("conditions ", "").lower()
+    if _is_missing(weather) or weather == "nan":
+        weather = None
+
+    distance = haversine_distance(
+        abs(_to_float(record["Restaurant_latitude"])),
+        abs(_to_float(record["Restaurant_longitude"])),
+        abs(_to_float(record["Delivery_location_latitude"])),
+        abs(_to_float(record["Delivery_location_longitude"])),
+    )
+
+    features = {
+        "age": age,
+        "ratings": _to_float(record["Delivery_person_Ratings"]),
+        "weather": weather,
+        "traffic": _normalize(record["Road_traffic_density"]),
+        "vehicle_condition": record["Vehicle_condition"],
+        "type_of_order": _normalize(record["Type_of_order"]),
+        "type_of_vehicle": _normalize(record["Type_of_vehicle"]),
+        "multiple_deliveries": _to_float(record["multiple_deliveries"]),
+        "festival": _normalize(record["Festival"]),
+        "city_type": _normalize(record["City"]),
+        "is_weekend": is_weekend,
+        "pickup_time_minutes": pickup_time_minutes,
+        "order_time_of_day": _bin(order_hour, TIME_OF_DAY_BINS, right=True),
+        "distance": distance,
+        "distance_type": _bin(distance, DISTANCE_TYPE_BINS, right=False),
+    }
+
+    # Same as .dropna() at the end of the pandas pipeline
+    missing = [
+        col for col, value in features.items()
+        if value is None or (isinstance(value, float) and math.isnan(value))
+    ]
+    if missing:
+        return None, f"Missing or invalid values: {', '.join(missing)}."
+
+    return features, None
@@ -0,0 +1,76 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from scripts.serving_metrics import Counter, Gauge
+
+# ================================================================
+# METRICS
+# ================================================================
+INFERENCE_PENDING = Gauge(
+    "eta_inference_pending",
+    "Inference jobs queued or running on the inference pool.",
+)
+INFERENCE_REJECTED = Counter(
+    "eta_inference_rejected_total",
+    "Inference jobs refused with 503 because the pool queue was full.",
+)
+
+
+class PoolOverloaded(Exception):
+    """Raised when the inference queue is full (mapped to HTTP 503)."""
+
+
+# ================================================================
+# BOUNDED INFERENCE POOL
+# ================================================================
+class InferencePool:
+    """
+    Dedicated thread pool for CPU-heavy model calls.
+
+    At most `max_workers` jobs run at once and at most `max_queue`
+    more may wait; anything beyond that is refused immediately with
+    PoolOverloaded instead of piling up threads and latency.
+    """
+
+    def __init__(self, max_workers: int = None, max_queue: int = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        if max_queue is None:
+            max_queue = self.max_workers * 4
+        self.max_queue = max_queue
+        self.max_pending = self.max_workers + self.max_queue
+        self.pending = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="inference"
+        )
+
+    async def run(self, func, *args):
+        # Only touched from the event loop thread, so no lock needed
+        if self.pending >= self.max_pending:
+            INFERENCE_REJECTED.inc()
+            raise PoolOverloaded(
+                f"Inference queue full ({self.pending} pending, "
+                f"limit {self.max_pending})"
+            )
+
+        self.pending += 1
+        INFERENCE_PENDING.set(self.pending)
+
+        # Released when the job itself finishes, not when the caller
+        # stops waiting: a cancelled request's job keeps its thread busy
+        loop = asyncio.get_running_loop()
+        future = self._executor.submit(func, *args)
+        future.add_done_callback(lambda _: _call_soon(loop, self._release))
+        return await asyncio.wrap_future(future)
+
+    def _release(self):
+        self.pending -= 1
+        INFERENCE_PENDING.set(self.pending)
+
+
+def _call_soon(loop, callback):
+    """Run `callback` on the event loop thread (no-op once it is closed)."""
+    try:
+        loop.call_soon_threadsafe(callback)
+    except RuntimeError:
+        pass
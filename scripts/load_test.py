@@ -0,0 +1,343 @@
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from contextlib import asynccontextmanager, contextmanager
+from itertools import islice
+from pathlib import Path
+
+import numpy as np
+
+# Repo root on sys.path so `src.*` / `scripts.*` / `app` import when run
+# as a script
+ROOT = Path(__file__).parent.parent
+sys.path.append(str(ROOT))
+from scripts.payloads import RAW_PATH, iter_payloads  # noqa: E402
+
+# ======================================================
+# OPEN-LOOP LOAD GENERATOR
+# ------------------------------------------------------
+#   python scripts/load_test.py --rate 200 --duration 30
+#   python scripts/load_test.py --url http://127.0.0.1:8000 --rate 500
+#
+# Requests are fired on a fixed schedule (constant or Poisson
+# arrivals at --rate per second) whether or not earlier ones have
+# finished, so a slow server shows up as growing latency instead of
+# a slower client. Latency is measured from the scheduled send time.
+# Arrivals that find --concurrency requests already in flight are
+# dropped and counted.
+#
+# Without --url the app is imported and driven in-process through
+# its ASGI interface (local bundle from models/, no network).
+# ======================================================
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+
+# ======================================================
+# PER-INTERVAL STATISTICS
+# ======================================================
+class Window:
+    """Requests completed (or dropped) during one reporting interval."""
+
+    def __init__(self):
+        self.latencies = []
+        self.rows = 0
+        self.errors = 0
+        self.overloaded = 0
+        self.dropped = 0
+
+    def record(self, latency: float, status: int, rows: int):
+        if status == 200:
+            self.latencies.append(latency)
+            self.rows += rows
+        else:
+            self.errors += 1
+            self.overloaded += status == 503
+
+    def merge(self, other: "Window"):
+        self.latencies += other.latencies
+        self.rows += other.rows
+        self.errors += other.errors
+        self.overloaded += other.overloaded
+        self.dropped += other.dropped
+
+    def summary(self, seconds: float) -> dict:
+        ok = len(self.latencies)
+        ms = np.array(self.latencies) * 1e3
+        counts = np.bincount(
+            np.searchsorted(LATENCY_BUCKETS_MS, ms),
+            minlength=len(LATENCY_BUCKETS_MS) + 1,
+        )
+        labels = [f"<={b}ms" for b in LATENCY_BUCKETS_MS]
+        labels.append(f">{LATENCY_BUCKETS_MS[-1]}ms")
+        sent = ok + self.errors
+
+        return {
+            "requests": sent,
+            "ok": ok,
+            "errors": self.errors,
+            "overloaded": self.overloaded,
+            "dropped": self.dropped,
+            "error_rate": self.errors / sent if sent else 0.0,
+            "throughput_rps": ok / seconds,
+            "rows_per_sec": self.rows / seconds,
+            "p50_ms": float(np.percentile(ms, 50)) if ok else None,
+            "p95_ms": float(np.percentile(ms, 95)) if ok else None,
+            "p99_ms": float(np.percentile(ms, 99)) if ok else None,
+            "histogram": dict(zip(labels, counts.tolist())),
+        }
+
+
+def _ms(value) -> str:
+    return f"{value:>9.1f}" if value is not None else f"{'-':>9}"
+
+
+def print_header():
+    print(
+        f"\n{'t (s)':>6} {'rps':>8} {'rows/s':>9} {'errors':>7} {'503':>5} "
+        f"{'dropped':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    )
+
+
+def print_row(label: str, stats: dict):
+    print(
+        f"{label:>6} {stats['throughput_rps']:>8.1f} "
+        f"{stats['rows_per_sec']:>9.1f} {stats['errors']:>7} "
+        f"{stats['overloaded']:>5} {stats['dropped']:>8} "
+        f"{_ms(stats['p50_ms'])} {_ms(stats['p95_ms'])} "
+        f"{_ms(stats['p99_ms'])}"
+    )
+
+
+# ======================================================
+# LOAD TEST
+# ======================================================
+class LoadTest:
+    """
+    Drive `client` (an httpx.AsyncClient) with open-loop arrivals.
+    A `batch_ratio` share of the arrivals post `batch_size` rows to
+    /predict/batch, the rest one row to /predict.
+    """
+
+    def __init__(self, client, payloads, rate: float, duration: float,
+                 concurrency: int = 256, batch_size: int = 64,
+                 batch_ratio: float = 0.0, arrival: str = "constant",
+                 interval: float = 1.0, seed: int = 0,
+                 verbose: bool = True):
+        self.client = client
+        self.payloads = payloads
+        self.rate = rate
+        self.duration = duration
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.batch_ratio = batch_ratio
+        self.arrival = arrival
+        self.interval = interval
+        self.verbose = verbose
+        self._rng = random.Random(seed)
+        self._windows = {}
+
+    def _window(self, at: float) -> Window:
+        index = max(0, int((at - self._start) / self.interval))
+        return self._windows.setdefault(index, Window())
+
+    def _arrivals(self):
+        """Send times in seconds after the start, up to `duration`."""
+        # Constant rate: i / rate from the arrival count, not a running
+        # sum of 1 / rate (its rounding error adds an extra arrival)
+        count, offset = 0, 0.0
+        while offset < self.duration:
+            yield offset
+            count += 1
+            if self.arrival == "poisson":
+                offset += self._rng.expovariate(self.rate)
+            else:
+                offset = count / self.rate
+
+    async def _send(self, scheduled: float, endpoint: str, body, rows: int):
+        try:
+            response = await self.client.post(endpoint, json=body)
+            status = response.status_code
+        except Exception:
+            # Transport failure / timeout
+            status = 0
+
+        done = time.perf_counter()
+        self._window(done).record(done - scheduled, status, rows)
+
+    async def _report(self):
+        printed = 0
+        while True:
+            await asyncio.sleep(self.interval)
+            # Print intervals that are over (late completions land in
+            # later ones)
+            current = int((time.perf_counter() - self._start) / self.interval)
+            while printed < current:
+                window = self._windows.get(printed, Window())
+                print_row(
+                    f"{(printed + 1) * self.interval:g}",
+                    window.summary(self.interval),
+                )
+                printed += 1
+
+    async def run(self) -> dict:
+        self._start = time.perf_counter()
+        reporter = None
+        if self.verbose:
+            reporter = asyncio.create_task(self._report())
+            print_header()
+
+        tasks = set()
+
+        for offset in self._arrivals():
+            next_at = self._start + offset
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            if len(tasks) >= self.concurrency:
+                self._window(next_at).dropped += 1
+            elif self._rng.random() < self.batch_ratio:
+                body = list(islice(self.payloads, self.batch_size))
+                task = asyncio.create_task(
+                    self._send(next_at, "/predict/batch", body, len(body))
+                )
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            else:
+                task = asyncio.create_task(
+                    self._send(next_at, "/predict", next(self.payloads), 1)
+                )
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - self._start
+
+        if reporter is not None:
+            reporter.cancel()
+
+        total = Window()
+        for window in self._windows.values():
+            total.merge(window)
+
+        report = {
+            "config": {
+                "rate": self.rate,
+                "duration": self.duration,
+                "concurrency": self.concurrency,
+                "arrival": self.arrival,
+                "batch_size": self.batch_size,
+                "batch_ratio": self.batch_ratio,
+                "interval": self.interval,
+            },
+            "elapsed_seconds": elapsed,
+            "total": total.summary(elapsed),
+            "intervals": [
+                {
+                    "t": (index + 1) * self.interval,
+                    **self._windows[index].summary(self.interval),
+                }
+                for index in sorted(self._windows)
+            ],
+        }
+
+        if self.verbose:
+            print_row("total", report["total"])
+        return report
+
+
+# ======================================================
+# TARGETS
+# ======================================================
+@asynccontextmanager
+async def http_client(url: str = None, timeout: float = 30.0):
+    """AsyncClient for a running server at `url`, or the app in-process."""
+    import httpx
+
+    limits = httpx.Limits(
+        max_connections=None, max_keepalive_connections=None
+    )
+
+    if url:
+        async with httpx.AsyncClient(
+            base_url=url, timeout=timeout, limits=limits
+        ) as client:
+            yield client
+        return
+
+    with local_app() as app:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://load-test", timeout=timeout
+        ) as client:
+            yield client
+
+
+@contextmanager
+def local_app():
+    from src.models.register import build_bundle
+    from scripts.benchmark_serving import (
+        in_process_app, MODEL_DIR, PARAMS_PATH, LOCAL_VERSION,
+    )
+    from scripts.serving_model import ServingModel
+
+    bundle = build_bundle(MODEL_DIR, PARAMS_PATH)
+    with in_process_app(bundle, ServingModel(LOCAL_VERSION, bundle)) as app:
+        yield app
+
+
+async def run_load_test(url: str = None, raw_path: Path = RAW_PATH,
+                        **options) -> dict:
+    async with http_client(url) as client:
+        payloads = iter_payloads(raw_path)
+        return await LoadTest(client, payloads, **options).run()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Open-loop load test for the prediction API"
+    )
+    parser.add_argument(
+        "--url", default=None,
+        help="Base URL of a running server (default: in-process app)",
+    )
+    parser.add_argument("--raw-path", type=Path, default=RAW_PATH)
+    parser.add_argument("--rate", type=float, default=100,
+                        help="Arrivals per second")
+    parser.add_argument("--duration", type=float, default=10,
+                        help="Seconds of arrivals")
+    parser.add_argument("--concurrency", type=int, default=256,
+                        help="Max requests in flight")
+    parser.add_argument("--arrival", choices=["constant", "poisson"],
+                        default="poisson")
+    parser.add_argument("--batch-ratio", type=float, default=0.0,
+                        help="Share of arrivals sent to /predict/batch")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--interval", type=float, default=1.0,
+                        help="Reporting interval (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=None,
+                        help="Write the JSON report here")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load_test(
+        args.url, args.raw_path,
+        rate=args.rate, duration=args.duration,
+        concurrency=args.concurrency, batch_size=args.batch_size,
+        batch_ratio=args.batch_ratio, arrival=args.arrival,
+        interval=args.interval, seed=args.seed,
+    ))
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Load test report → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
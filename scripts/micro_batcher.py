@@ -0,0 +1,169 @@
+import asyncio
+
+from scripts.inference_pool import PoolOverloaded
+from scripts.serving_metrics import Counter, Histogram
+
+# ================================================================
+# METRICS
+# ================================================================
+BATCH_SIZE = Histogram(
+    "eta_microbatch_size",
+    "Number of /predict requests scored together in one micro-batch.",
+    buckets=[1, 2, 4, 8, 16, 32, 64, 128, 256],
+)
+BATCH_WAIT = Histogram(
+    "eta_microbatch_wait_seconds",
+    "Time the first request of a micro-batch waited for the batch to fill.",
+    buckets=[0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05],
+)
+BATCH_FALLBACKS = Counter(
+    "eta_microbatch_fallbacks_total",
+    "Micro-batches re-scored row by row after the combined call failed.",
+)
+
+
+# ================================================================
+# MICRO-BATCHER
+# ================================================================
+class MicroBatcher:
+    """
+    Coalesce concurrent single-row requests into one scoring call.
+
+    Requests are queued until `max_batch_size` rows are waiting or
+    the oldest one has waited `max_wait_ms`; the batch is then scored
+    with `score_batch(items) -> results` (run off the event loop via
+    `run_batch`) and each caller's future gets its own result.
+    At most `max_queued` requests may wait (None: no limit); beyond
+    that submit() raises PoolOverloaded.
+    """
+
+    def __init__(self, score_batch, run_batch, max_wait_ms: float,
+                 max_batch_size: int, max_queued: int = None):
+        # asyncio.Queue(maxsize=0) would silently mean "unbounded"
+        if max_queued is not None and max_queued < 1:
+            raise ValueError(
+                f"max_queued must be at least 1 (or None), got {max_queued}"
+            )
+        self.score_batch = score_batch
+        self.run_batch = run_batch
+        self.max_wait = max_wait_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.max_queued = max_queued
+        self._queue = None
+        self._task = None
+        self._scoring = set()
+
+    def start(self):
+        self._queue = asyncio.Queue(maxsize=self.max_queued or 0)
+        self._task = asyncio.get_running_loop().create_task(self._worker())
+
+    async def stop(self):
+        """Stop collecting, finish the batches being scored, fail the rest."""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        # Batches already handed off get their results
+        if self._scoring:
+            await asyncio.gather(*self._scoring, return_exceptions=True)
+
+        # Nothing will ever score what is still queued
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            _set(future, exc=_stopped())
+
+    async def submit(self, item):
+        if self._task is None:
+            raise _stopped()
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((item, future))
+        except asyncio.QueueFull:
+            raise PoolOverloaded(
+                f"Micro-batch queue full ({self.max_queued} waiting)"
+            ) from None
+        return await future
+
+    # ============================================================
+    # BATCH COLLECTION LOOP
+    # ============================================================
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._queue.get()]
+            started = loop.time()
+            deadline = started + self.max_wait
+
+            try:
+                while len(batch) < self.max_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(
+                            self._queue.get(), timeout
+                        )
+                        batch.append(item)
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                # Stopped while this batch was still filling
+                for _, future in batch:
+                    _set(future, exc=_stopped())
+                raise
+
+            BATCH_SIZE.observe(len(batch))
+            BATCH_WAIT.observe(loop.time() - started)
+
+            # Score without blocking the next batch from being collected
+            task = loop.create_task(self._score(batch))
+            self._scoring.add(task)
+            task.add_done_callback(self._scoring.discard)
+
+    async def _score(self, batch):
+        items = [item for item, _ in batch]
+
+        try:
+            results = await self.run_batch(self.score_batch, items)
+        except Exception as exc:
+            if len(batch) == 1 or isinstance(exc, PoolOverloaded):
+                for _, future in batch:
+                    _set(future, exc=exc)
+                return
+            # One bad row must not fail the whole batch
+            BATCH_FALLBACKS.inc()
+            await self._score_one_by_one(batch)
+            return
+
+        for (_, future), result in zip(batch, results):
+            _set(future, result=result)
+
+    async def _score_one_by_one(self, batch):
+        for item, future in batch:
+            try:
+                result = (await self.run_batch(self.score_batch, [item]))[0]
+            except Exception as exc:
+                _set(future, exc=exc)
+            else:
+                _set(future, result=result)
+
+
+def _stopped() -> PoolOverloaded:
+    return PoolOverloaded("Micro-batcher is stopped")
+
+
+def _set(future, result=None, exc=None):
+    """Resolve a caller's future unless it was cancelled (client gone)."""
+    if future.done():
+        return
+    if exc is not None:
+        future.set_exception(exc)
+    else:
+        future.set_result(result)
@@ -0,0 +1,330 @@
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import joblib
+
+# ================================================================
+# LOGGER
+# ================================================================
+logger = logging.getLogger("model_cache")
+logger.setLevel(logging.INFO)
+handler = logging.StreamHandler()
+handler.setFormatter(logging.Formatter(
+    "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+))
+logger.addHandler(handler)
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# ================================================================
+# ON-DISK, CONTENT-ADDRESSED BUNDLE CACHE
+# ----------------------------------------------------------------
+# <cache_dir>/<model_name>/objects/<sha256>.joblib   bundle bytes
+# <cache_dir>/<model_name>/index.json                version → sha256,
+#                                                    registry's latest
+# <cache_dir>/<model_name>/.lock                     flock
+#
+# Every gunicorn worker shares the directory: writers (store,
+# eviction, mark_latest) take an exclusive flock, readers a shared
+# one, and only the `max_versions` most recently cached versions are
+# kept.
+# ================================================================
+class ModelCache:
+
+    def __init__(self, cache_dir, model_name: str, max_versions: int = 3):
+        if max_versions < 1:
+            raise ValueError(
+                f"max_versions must be at least 1, got {max_versions}"
+            )
+        self.root = Path(cache_dir) / model_name
+        self.objects = self.root / "objects"
+        self.index_path = self.root / "index.json"
+        self.max_versions = max_versions
+
+    @contextmanager
+    def _locked(self, shared: bool = False):
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _read_index(self) -> dict:
+        try:
+            with open(self.index_path) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"versions": {}}
+
+    def _write_index(self, index: dict):
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".json")
+        with os.fdopen(fd, "w") as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp, self.index_path)
+
+    def _object(self, entry: dict) -> Path:
+        return self.objects / f"{entry['sha256']}.joblib"
+
+    def versions(self) -> list:
+        """Cached versions, oldest first."""
+        with self._locked(shared=True):
+            return sorted(int(v) for v in self._read_index()["versions"])
+
+    def latest_version(self):
+        versions = self.versions()
+        return versions[-1] if versions else None
+
+    def has(self, version: int) -> bool:
+        with self._locked(shared=True):
+            entry = self._read_index()["versions"].get(str(version))
+            return entry is not None and self._object(entry).exists()
+
+    def mark_latest(self, version: int):
+        """Record `version` as the registry's latest (it must be cached)."""
+        with self._locked():
+            index = self._read_index()
+            if str(version) not in index["versions"]:
+                raise KeyError(f"Model version {version} is not cached")
+            index["latest"] = int(version)
+            self._write_index(index)
+
+    def store(self, version: int, bundle) -> str:
+        """Write `bundle` under its content hash and point `version` at it."""
+
+        self.objects.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp = tempfile.mkstemp(dir=self.objects, suffix=".tmp")
+        os.close(fd)
+        joblib.dump(bundle, tmp)
+
+        sha = _sha256(Path(tmp))
+        target = self.objects / f"{sha}.joblib"
+
+        # Under the lock, so another worker's eviction cannot remove the
+        # object before the index points at it
+        with self._locked():
+            if target.exists():
+                os.remove(tmp)
+            else:
+                os.replace(tmp, target)
+
+            index = self._read_index()
+            index["versions"][str(version)] = {
+                "sha256": sha, "cached_at": time.time()
+            }
+            self._evict(index)
+            self._write_index(index)
+
+        logger.info(f"Cached model version {version} → {target.name}")
+        return sha
+
+    def _evict(self, index: dict):
+        """
+        Drop all but the `max_versions` most recently cached versions,
+        never the registry's latest (lock held).
+        """
+
+        entries = index["versions"]
+        latest = str(index.get("latest"))
+        by_age = sorted(
+            entries, key=lambda v: (v == latest, entries[v]["cached_at"]),
+            reverse=True,
+        )
+        for version in by_age[self.max_versions:]:
+            del entries[version]
+            logger.info(f"Evicted model version {version} from cache")
+
+        # Objects no version points at any more
+        kept = {entry["sha256"] for entry in entries.values()}
+        for path in self.objects.glob("*.joblib"):
+            if path.stem not in kept:
+                path.unlink(missing_ok=True)
+
+    def _load(self, index: dict, version: int):
+        entry = index["versions"][str(version)]
+        path = self._object(entry)
+
+        if _sha256(path) != entry["sha256"]:
+            raise ValueError(
+                f"Cached bundle for version {version} is corrupt: {path}"
+            )
+
+        return joblib.load(path)
+
+    def load(self, version: int):
+        """Load a cached bundle, verifying its content hash."""
+        # Shared lock: no other worker can evict it mid-read
+        with self._locked(shared=True):
+            return self._load(self._read_index(), version)
+
+    def load_current(self):
+        """
+        (version, bundle) of the registry's latest version as last
+        recorded (so a rollback survives restarts), else of the newest
+        cached version; None when the cache is empty.
+        """
+        with self._locked(shared=True):
+            index = self._read_index()
+            versions = index["versions"]
+            if not versions:
+                return None
+            latest = index.get("latest")
+            if str(latest) not in versions:
+                latest = max(int(v) for v in versions)
+            return latest, self._load(index, latest)
+
+
+# ================================================================
+# REGISTRY HELPERS
+# ================================================================
+def latest_registry_version(client, model_name: str) -> int:
+    latest = client.get_latest_versions(model_name, stages=None)
+    return max(int(v.version) for v in latest)
+
+
+def download_to_cache(client, model_name: str, cache: ModelCache,
+                      version: int = None):
+    """
+    Fetch `version` from MLflow into the cache; by default the latest,
+    then also recorded as such.
+    """
+
+    import mlflow.sklearn
+
+    latest = version is None
+    if latest:
+        version = latest_registry_version(client, model_name)
+
+    bundle = mlflow.sklearn.load_model(f"models:/{model_name}/{version}")
+    cache.store(version, bundle)
+    if latest:
+        cache.mark_latest(version)
+    return version, bundle
+
+
+def resolve_version(client, model_name: str, cache: ModelCache) -> int:
+    """
+    The registry's latest version (so a rollback there is honoured);
+    the newest cached version only when the registry is unreachable.
+    For explicit reloads; startup goes through load_bundle().
+    """
+
+    try:
+        return latest_registry_version(client, model_name)
+    except Exception as exc:
+        version = cache.latest_version()
+        if version is None:
+            raise
+        logger.warning(
+            f"Registry unreachable ({exc}) → newest cached version {version}"
+        )
+        return version
+
+
+def load_bundle(client, model_name: str, cache: ModelCache):
+    """
+    Startup bundle, without waiting on the registry when anything is
+    cached: ModelCache.load_current(), and RegistryPoller swaps in a
+    newer (or rolled-back) version in the background. Only an empty
+    cache downloads the latest version synchronously.
+    Returns (version, bundle).
+    """
+
+    cached = cache.load_current()
+    if cached is not None:
+        logger.info(f"Loading model version {cached[0]} from local cache")
+        return cached
+
+    logger.info("Model cache empty → downloading latest from MLflow registry")
+    return download_to_cache(client, model_name, cache)
+
+
+def refresh_cache(client, model_name: str, cache: ModelCache,
+                  current: int = None):
+    """
+    Ask the registry for its latest version, cache it if needed and
+    record it as the latest. Returns that version when it was newly
+    cached or differs from `current` (e.g. after a rollback), None
+    when nothing changed.
+    """
+
+    version = latest_registry_version(client, model_name)
+    changed = current is not None and version != current
+
+    if cache.has(version):
+        cache.mark_latest(version)
+        return version if changed else None
+
+    logger.info(f"New registry version {version} found → caching")
+    download_to_cache(client, model_name, cache, version)
+    cache.mark_latest(version)
+    return version
+
+
+# ================================================================
+# BACKGROUND REGISTRY POLLER
+# ================================================================
+class RegistryPoller:
+    """
+    Daemon thread that calls refresh_cache() every `interval` seconds
+    (first check immediately) and hands versions that are new, or
+    differ from `current_version()` (the one serving), to
+    `on_new_version`. Registry errors are logged, never raised.
+    """
+
+    def __init__(self, client, model_name: str, cache: ModelCache,
+                 interval: float, on_new_version=None,
+                 current_version=None):
+        self.client = client
+        self.model_name = model_name
+        self.cache = cache
+        self.interval = interval
+        self.on_new_version = on_new_version
+        self.current_version = current_version
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._run, name="registry-poller", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                current = None
+                if self.current_version:
+                    current = self.current_version()
+                version = refresh_cache(
+                    self.client, self.model_name, self.cache, current
+                )
+                if version is not None and self.on_new_version is not None:
+                    self.on_new_version(version)
+            except Exception as exc:
+                logger.warning(f"Registry check failed: {exc}")
+
+            self._stop.wait(self.interval)
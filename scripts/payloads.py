@@ -0,0 +1,66 @@
+from pathlib import Path
+
+import pandas as pd
+
+# ======================================================
+# RAW ORDERS → /predict PAYLOADS
+# ======================================================
+ROOT = Path(__file__).parent.parent
+RAW_PATH = ROOT / "data" / "raw" / "swiggy.csv"
+
+
+def build_payload(sample):
+    """
+    Convert one dataframe row into API JSON payload.
+    Ensures types match FastAPI InputData schema.
+    """
+    return {
+        "ID": sample["ID"],
+        "Delivery_person_ID": sample["Delivery_person_ID"],
+        "Delivery_person_Age": str(sample["Delivery_person_Age"]),
+        "Delivery_person_Ratings": str(sample["Delivery_person_Ratings"]),
+        "Restaurant_latitude": float(sample["Restaurant_latitude"]),
+        "Restaurant_longitude": float(sample["Restaurant_longitude"]),
+        "Delivery_location_latitude": float(
+            sample["Delivery_location_latitude"]
+        ),
+        "Delivery_location_longitude": float(
+            sample["Delivery_location_longitude"]
+        ),
+        "Order_Date": sample["Order_Date"],
+        "Time_Orderd": sample["Time_Orderd"],
+        "Time_Order_picked": sample["Time_Order_picked"],
+        "Weatherconditions": sample["Weatherconditions"],
+        "Road_traffic_density": sample["Road_traffic_density"],
+        "Vehicle_condition": int(sample["Vehicle_condition"]),
+        "Type_of_order": sample["Type_of_order"],
+        "Type_of_vehicle": sample["Type_of_vehicle"],
+        "multiple_deliveries": str(sample["multiple_deliveries"]),
+        "Festival": sample["Festival"],
+        "City": sample["City"],
+    }
+
+
+def extract_true_value(sample):
+    """Extract '(min) 23' → 23 from Time_taken(min) column."""
+    raw = sample["Time_taken(min)"]
+    cleaned = str(raw).replace("(min)", "").replace("(min) ", "").strip()
+    try:
+        return int(cleaned)
+    except ValueError:
+        return None
+
+
+def iter_payloads(path: Path = RAW_PATH, chunk_size: int = 10_000,
+                  loop: bool = True):
+    """
+    Stream payloads from the raw CSV `chunk_size` rows at a time
+    (the file is never fully loaded); with `loop` start over at the
+    end, so a long load test never runs dry.
+    """
+    while True:
+        for chunk in pd.read_csv(path, chunksize=chunk_size):
+            for sample in chunk.to_dict("records"):
+                yield build_payload(sample)
+        if not loop:
+            return
@@ -0,0 +1,113 @@
+import threading
+import time
+from collections import OrderedDict
+
+from scripts.serving_metrics import Counter, Gauge
+
+# ================================================================
+# METRICS
+# ================================================================
+CACHE_HITS = Counter(
+    "eta_prediction_cache_hits_total",
+    "Predictions served from the result cache.",
+)
+CACHE_MISSES = Counter(
+    "eta_prediction_cache_misses_total",
+    "Rows that had to be scored by the boosters.",
+)
+CACHE_EVICTIONS = Counter(
+    "eta_prediction_cache_evictions_total",
+    "Entries dropped to stay within the memory budget or because they "
+    "expired.",
+)
+CACHE_BYTES = Gauge(
+    "eta_prediction_cache_bytes",
+    "Approximate memory held by the result cache.",
+)
+
+# Per-entry bookkeeping on top of the key bytes (tuple, float, dict slot)
+_ENTRY_OVERHEAD = 200
+
+
+# ================================================================
+# LRU + TTL RESULT CACHE
+# ================================================================
+class PredictionCache:
+    """
+    Thread-safe LRU cache of blended predictions keyed on
+    (model version, preprocessed feature row bytes).
+
+    Entries older than `ttl_seconds` count as misses; the least
+    recently used entries are evicted once the approximate size
+    exceeds `max_bytes`.
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl_seconds
+        self.size_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _cost(key) -> int:
+        return len(key[1]) + _ENTRY_OVERHEAD
+
+    def get_many(self, keys: list) -> list:
+        """Cached value per key, or None for misses."""
+
+        now = time.monotonic()
+        values = []
+        hits = 0
+
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    values.append(None)
+                    continue
+
+                value, expires_at = entry
+                if expires_at < now:
+                    del self._entries[key]
+                    self.size_bytes -= self._cost(key)
+                    CACHE_EVICTIONS.inc()
+                    values.append(None)
+                    continue
+
+                self._entries.move_to_end(key)
+                values.append(value)
+                hits += 1
+
+            CACHE_BYTES.set(self.size_bytes)
+
+        CACHE_HITS.inc(hits)
+        CACHE_MISSES.inc(len(keys) - hits)
+        return values
+
+    def put_many(self, keys: list, values: list):
+        expires_at = time.monotonic() + self.ttl
+
+        with self._lock:
+            for key, value in zip(keys, values):
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                else:
+                    self.size_bytes += self._cost(key)
+                self._entries[key] = (value, expires_at)
+
+            while self.size_bytes > self.max_bytes and self._entries:
+                old_key, _ = self._entries.popitem(last=False)
+                self.size_bytes -= self._cost(old_key)
+                CACHE_EVICTIONS.inc()
+
+            CACHE_BYTES.set(self.size_bytes)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+            CACHE_BYTES.set(0)
@@ -0,0 +1,234 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter as Tally
+from contextlib import contextmanager
+
+from scripts.serving_metrics import Counter
+
+# ================================================================
+# METRICS
+# ================================================================
+PROFILED_REQUESTS = Counter(
+    "eta_profiled_requests_total",
+    "Requests picked by the sampling profiler (1 in PROFILE_SAMPLE_EVERY).",
+)
+
+# Stacks beyond this many distinct ones are counted under one bucket
+MAX_STACKS = 20_000
+TRUNCATED = "[other stacks]"
+
+
+def frame_name(code) -> str:
+    # No ';' (the collapsed-stack separator) in frame names
+    filename = os.path.basename(code.co_filename)
+    name = f"{code.co_name} ({filename}:{code.co_firstlineno})"
+    return name.replace(";", ",")
+
+
+# ================================================================
+# SAMPLING REQUEST PROFILER
+# ================================================================
+class RequestProfiler:
+    """
+    Opt-in stack sampler for 1 in `every_n` requests (0: off).
+
+    A sampled request registers its anchor frame(s) with `track()`:
+    the async handler on the event loop thread and, through `wrap()`,
+    the job it sends to the inference pool. While anything is
+    tracked, a background thread reads each tracked thread's stack
+    every `interval_ms` (sys._current_frames) and tallies the frames
+    above the anchor as one collapsed stack. A sample is only kept
+    when the anchor is actually on the thread's stack, so time the
+    event loop spends on other requests while the handler awaits is
+    not attributed to it.
+
+    Disabled, the only cost is the `every_n` check in the handler: no
+    thread is woken and nothing is wrapped. Effective resolution of
+    pure-Python code is bounded by sys.getswitchinterval() (5 ms by
+    default); native booster calls release the GIL and sample finely.
+    """
+
+    def __init__(self, every_n: int = 0, interval_ms: float = 1.0):
+        self.every_n = 0
+        self.interval_ms = interval_ms
+        self.n_requests = 0
+        self.n_samples = 0
+        self._seen = 0
+        self._stacks = Tally()
+        self._tracked = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self.configure(every_n, interval_ms)
+
+    # ============================================================
+    # CONFIGURATION
+    # ============================================================
+    @property
+    def enabled(self) -> bool:
+        return self.every_n > 0
+
+    def configure(self, every_n: int, interval_ms: float = None):
+        """Sample 1 in `every_n` requests from now on (0: sampling off)."""
+
+        if every_n < 0:
+            raise ValueError("every_n must be >= 0")
+        if interval_ms is not None:
+            if interval_ms <= 0:
+                raise ValueError("interval_ms must be > 0")
+            self.interval_ms = interval_ms
+
+        self.every_n = every_n
+        if every_n and self._thread is None:
+            self._thread = threading.Thread(
+                target=self._sample_loop, name="request-profiler",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def should_sample(self) -> bool:
+        """
+        True for every `every_n`-th call (event loop thread only, no
+        lock needed).
+        """
+
+        self._seen += 1
+        if self._seen < self.every_n:
+            return False
+        self._seen = 0
+        self.n_requests += 1
+        PROFILED_REQUESTS.inc()
+        return True
+
+    # ============================================================
+    # TRACKING
+    # ============================================================
+    @contextmanager
+    def track(self, anchor, label: str):
+        """Sample this thread's frames above `anchor` under `label`."""
+
+        key = object()
+        with self._lock:
+            self._tracked[key] = (threading.get_ident(), anchor, label)
+            self._wake.set()
+        try:
+            yield
+        finally:
+            with self._lock:
+                del self._tracked[key]
+                if not self._tracked:
+                    self._wake.clear()
+
+    def wrap(self, func, label: str):
+        """`func` profiled on whichever (pool) thread ends up running it."""
+
+        def profiled(*args):
+            with self.track(sys._getframe(), label):
+                return func(*args)
+
+        return profiled
+
+    def _sample_loop(self):
+        while True:
+            self._wake.wait()
+            time.sleep(self.interval_ms / 1000)
+            with self._lock:
+                tracked = list(self._tracked.values())
+            if tracked:
+                self._sample(tracked)
+
+    def _sample(self, tracked: list):
+        frames = sys._current_frames()
+        stacks = []
+
+        for thread_id, anchor, label in tracked:
+            frame = frames.get(thread_id)
+            names = []
+            while frame is not None and frame is not anchor:
+                names.append(frame_name(frame.f_code))
+                frame = frame.f_back
+            if frame is None:
+                # Thread is busy with something else (e.g. another request)
+                continue
+            names.append(label)
+            stacks.append(";".join(reversed(names)))
+
+        with self._lock:
+            for stack in stacks:
+                full = len(self._stacks) >= MAX_STACKS
+                if full and stack not in self._stacks:
+                    stack = TRUNCATED
+                self._stacks[stack] += 1
+            self.n_samples += len(stacks)
+
+    # ============================================================
+    # EXPORT
+    # ============================================================
+    def reset(self):
+        with self._lock:
+            self._stacks.clear()
+            self.n_requests = 0
+            self.n_samples = 0
+
+    def status(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "every_n": self.every_n,
+            "interval_ms": self.interval_ms,
+            "profiled_requests": self.n_requests,
+            "samples": self.n_samples,
+            "distinct_stacks": len(self._stacks),
+        }
+
+    def stacks(self) -> dict:
+        with self._lock:
+            return dict(self._stacks)
+
+    def collapsed(self) -> str:
+        """
+        Brendan Gregg's collapsed format: `root;child;leaf <count>` per
+        line.
+        """
+        stacks = sorted(self.stacks().items())
+        return "".join(f"{stack} {n}\n" for stack, n in stacks)
+
+    def speedscope(self, name: str = "eta-api") -> dict:
+        """
+        Sampled-profile document for https://www.speedscope.app (weights
+        in ms).
+        """
+
+        frames, index = [], {}
+        samples, weights = [], []
+
+        for stack, n in sorted(self.stacks().items()):
+            sample = []
+            for frame in stack.split(";"):
+                if frame not in index:
+                    index[frame] = len(frames)
+                    frames.append({"name": frame})
+                sample.append(index[frame])
+            samples.append(sample)
+            weights.append(n * self.interval_ms)
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "scripts.request_profiler",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": (
+                    f"{name} ({self.n_requests} requests, "
+                    f"1 in {self.every_n or '-'})"
+                ),
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }],
+        }
@@ -0,0 +1,248 @@
+import threading
+import time
+from bisect import bisect_left
+
+# ================================================================
+# MINIMAL PROMETHEUS METRICS (text exposition format 0.0.4)
+# ----------------------------------------------------------------
+# Just enough of a client for the prediction service: counters,
+# gauges and histograms (optionally labelled), rendered by the
+# /metrics endpoint.
+# ================================================================
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_registry = []
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+def _braces(labels: str) -> str:
+    return f"{{{labels}}}" if labels else ""
+
+
+class _Metric:
+    """
+    Shared naming / labelling. With `labelnames`, values are kept per
+    child (`metric.labels(...)`) and the parent itself is never updated.
+    """
+
+    kind = None
+
+    def __init__(self, name: str, help_text: str, labelnames=(),
+                 register: bool = True):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        if register:
+            _registry.append(self)
+
+    def labels(self, *values):
+        """Child for one combination of label values (created on first use)."""
+        values = tuple(str(v) for v in values)
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.help}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        if self.labelnames:
+            for values, child in sorted(self._children.items()):
+                labels = ",".join(
+                    f'{n}="{v}"' for n, v in zip(self.labelnames, values)
+                )
+                lines += child._samples(labels)
+        else:
+            lines += self._samples("")
+        return "\n".join(lines) + "\n"
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames=(),
+                 register: bool = True):
+        super().__init__(name, help_text, labelnames, register)
+        self.value = 0.0
+
+    def _new_child(self):
+        return Counter(self.name, self.help, register=False)
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def _samples(self, labels: str) -> list:
+        return [f"{self.name}{_braces(labels)} {_fmt(self.value)}"]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labelnames=(),
+                 register: bool = True):
+        super().__init__(name, help_text, labelnames, register)
+        self.value = 0.0
+
+    def _new_child(self):
+        return Gauge(self.name, self.help, register=False)
+
+    def set(self, value: float):
+        # Same lock as inc(), so a set cannot land inside its
+        # read-modify-write and be lost
+        with self._lock:
+            self.value = value
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.inc(-amount)
+
+    def _samples(self, labels: str) -> list:
+        return [f"{self.name}{_braces(labels)} {_fmt(self.value)}"]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets, labelnames=(),
+                 register: bool = True):
+        super().__init__(name, help_text, labelnames, register)
+        self.buckets = sorted(buckets) + [float("inf")]
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def _new_child(self):
+        return Histogram(
+            self.name, self.help, self.buckets[:-1], register=False
+        )
+
+    def observe(self, value: float):
+        # First bucket whose upper bound is >= value
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+    def _samples(self, labels: str) -> list:
+        prefix = f"{labels}," if labels else ""
+        lines = []
+        cumulative = 0
+        for bound, n in zip(self.buckets, self.counts):
+            cumulative += n
+            lines.append(
+                f'{self.name}_bucket{{{prefix}le="{_fmt(bound)}"}} '
+                f'{cumulative}'
+            )
+        lines.append(f"{self.name}_sum{_braces(labels)} {_fmt(self.sum)}")
+        lines.append(f"{self.name}_count{_braces(labels)} {self.count}")
+        return lines
+
+
+def render_metrics() -> str:
+    """All registered metrics in Prometheus text format."""
+    return "".join(metric.render() for metric in _registry)
+
+
+# ================================================================
+# PER-STAGE LATENCY
+# ----------------------------------------------------------------
+# One histogram, labelled by stage, for every step of the prediction
+# path. Timers are plain perf_counter() pairs around each step (no
+# context manager / decorator), which keeps the overhead at about a
+# microsecond per observation.
+# ================================================================
+LATENCY_BUCKETS = [
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+]
+
+STAGE_SECONDS = Histogram(
+    "eta_stage_duration_seconds",
+    "Time spent in each step of the prediction path.",
+    LATENCY_BUCKETS,
+    labelnames=("stage",),
+)
+
+
+def stage_timer(stage: str):
+    """
+    `observe(seconds)` of the histogram child for `stage`, bound once at
+    import.
+    """
+    return STAGE_SECONDS.labels(stage).observe
+
+
+# ================================================================
+# HTTP REQUESTS (ASGI middleware)
+# ================================================================
+REQUESTS = Counter(
+    "eta_requests_total",
+    "HTTP requests handled, by route and status code.",
+    labelnames=("endpoint", "status"),
+)
+REQUEST_SECONDS = Histogram(
+    "eta_request_duration_seconds",
+    "Wall time from request received to response sent, by route.",
+    LATENCY_BUCKETS,
+    labelnames=("endpoint",),
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "eta_requests_in_flight", "HTTP requests currently being handled."
+)
+
+
+class RequestMetrics:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware task / queue overhead)
+    counting requests by matched route template and status, timing
+    them, and tracking how many are in flight. The receive time is
+    left in `request.state.received_at` so handlers can time what
+    happened before they ran (body parsing + validation).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        scope.setdefault("state", {})["received_at"] = start
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            # Route template, so unknown paths cannot blow up label
+            # cardinality
+            route = scope.get("route")
+            endpoint = getattr(route, "path", "unmatched")
+            REQUESTS.labels(endpoint, status).inc()
+            elapsed = time.perf_counter() - start
+            REQUEST_SECONDS.labels(endpoint).observe(elapsed)
@@ -0,0 +1,174 @@
+import math
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from scripts.fast_features import FEATURE_COLUMNS
+from scripts.serving_metrics import stage_timer
+from src.models.compact_models import boosters_from_native
+from src.models.ensemble import FusedEnsemble
+
+OBSERVE_PREPROCESS = stage_timer("preprocess")
+OBSERVE_CATBOOST = stage_timer("catboost")
+OBSERVE_LIGHTGBM = stage_timer("lightgbm")
+
+
+def _observe_boosters(cat_seconds: float, lgb_seconds: float):
+    OBSERVE_CATBOOST(cat_seconds)
+    OBSERVE_LIGHTGBM(lgb_seconds)
+
+
+# ================================================================
+# SYNTHETIC ORDER USED TO WARM UP A FRESHLY LOADED BUNDLE
+# ================================================================
+WARMUP_RECORD = {
+    "ID": "warmup",
+    "Delivery_person_ID": "INDORES13DEL02",
+    "Delivery_person_Age": 30.0,
+    "Delivery_person_Ratings": 4.7,
+    "Restaurant_latitude": 22.745049,
+    "Restaurant_longitude": 75.892471,
+    "Delivery_location_latitude": 22.765049,
+    "Delivery_location_longitude": 75.912471,
+    "Order_Date": "19-03-2022",
+    "Time_Orderd": "11:30:00",
+    "Time_Order_picked": "11:45:00",
+    "Weatherconditions": "conditions Sunny",
+    "Road_traffic_density": "High ",
+    "Vehicle_condition": 2,
+    "Type_of_order": "Snack ",
+    "Type_of_vehicle": "motorcycle ",
+    "multiple_deliveries": 0.0,
+    "Festival": "No ",
+    "City": "Urban ",
+}
+
+
+# ================================================================
+# ONE LOADED MODEL BUNDLE
+# ================================================================
+class ServingModel:
+    """
+    Immutable view of a registered bundle (preprocessor + boosters +
+    weights) tagged with its registry version. Requests take one
+    reference at the start and use it throughout, so a reload can
+    swap in a new ServingModel without affecting in-flight calls.
+
+    `n_threads` caps the threads each booster call may use
+    (-1: all cores); `parallel` runs the two boosters concurrently.
+    """
+
+    def __init__(self, version: int, bundle: dict, n_threads: int = -1,
+                 parallel: bool = False):
+        self.version = version
+        self.n_threads = n_threads
+        self.parallel = parallel
+        self.preprocessor = bundle["preprocessor"]
+        # Lookup-table preprocessor (bundles registered after it was
+        # introduced)
+        self.compiled_preprocessor = bundle.get("compiled_preprocessor")
+        native = bundle.get("native_models")
+        if native is not None:
+            # Registered as the compact stage's native files
+            self.cat_model, self.lgb_model = boosters_from_native(native)
+        else:
+            self.cat_model = bundle["catboost"]
+            self.lgb_model = bundle["lightgbm"]
+        self.w_cat = bundle["weights"]["cat"]
+        self.w_lgb = bundle["weights"]["lgbm"]
+        # Fused blend; built here for bundles registered before it was added
+        self.ensemble = bundle.get("ensemble") or FusedEnsemble(
+            self.cat_model, self.lgb_model, self.w_cat, self.w_lgb
+        )
+
+    @property
+    def weights(self) -> dict:
+        return {"catboost": self.w_cat, "lightgbm": self.w_lgb}
+
+    # ============================================================
+    # ENSEMBLE SCORING
+    # ============================================================
+    def predict_matrix(self, X, cache=None) -> np.ndarray:
+        """
+        Blend both boosters over an already preprocessed matrix. With a
+        PredictionCache, rows seen before (same vector, same version)
+        skip the boosters and only the misses are scored.
+        """
+
+        if cache is None:
+            return self._blend(X)
+
+        X = np.ascontiguousarray(X)
+        keys = [(self.version, row.tobytes()) for row in X]
+        cached = cache.get_many(keys)
+
+        misses = [i for i, value in enumerate(cached) if value is None]
+        if not misses:
+            return np.array(cached, dtype=np.float64)
+
+        preds = np.array([0.0 if value is None else value for value in cached])
+        scored = self._blend(X[misses])
+        preds[misses] = scored
+
+        cache.put_many([keys[i] for i in misses], scored.tolist())
+        return preds
+
+    def _blend(self, X) -> np.ndarray:
+        return self.ensemble.predict(
+            X, self.n_threads, self.parallel, on_timing=_observe_boosters
+        )
+
+    def predict_cleaned(self, cleaned_df: pd.DataFrame,
+                        cache=None) -> np.ndarray:
+        """Preprocess cleaned rows and return blended predictions."""
+
+        start = perf_counter()
+        if self.compiled_preprocessor is not None:
+            X = self.compiled_preprocessor.transform(cleaned_df)
+        else:
+            X = self.preprocessor.transform(cleaned_df)
+        OBSERVE_PREPROCESS(perf_counter() - start)
+
+        return self.predict_matrix(X, cache)
+
+    def predict_feature_rows(self, rows: list, cache=None) -> np.ndarray:
+        """Preprocess cleaned feature dicts and return blended predictions."""
+
+        compiled = self.compiled_preprocessor
+
+        start = perf_counter()
+        if compiled is not None:
+            X = np.empty(
+                (len(rows), compiled.n_features_out_), dtype=compiled.dtype
+            )
+            for i, features in enumerate(rows):
+                compiled.transform_record(features, out=X[i:i + 1])
+        else:
+            frame = pd.DataFrame(rows, columns=FEATURE_COLUMNS)
+            X = self.preprocessor.transform(frame)
+        OBSERVE_PREPROCESS(perf_counter() - start)
+
+        return self.predict_matrix(X, cache)
+
+    # ============================================================
+    # WARM-UP
+    # ============================================================
+    def warm_up(self, build_feature_row, n_rows: int = 4):
+        """
+        Run a few synthetic predictions (single row and small batch)
+        so first real requests do not pay lazy-init costs, and fail
+        fast on a broken bundle before it is swapped in.
+        """
+
+        features, reason = build_feature_row(WARMUP_RECORD)
+        if features is None:
+            raise ValueError(f"Warm-up record rejected: {reason}")
+
+        for batch in ([features], [features] * n_rows):
+            preds = self.predict_feature_rows(batch)
+            if not all(math.isfinite(p) for p in preds):
+                raise ValueError(
+                    f"Model version {self.version} produced non-finite "
+                    "warm-up output"
+                )
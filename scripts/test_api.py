@@ -2,14 +2,16 @@ import pandas as pd
 import requests
 import random
 import json
+import os
 import pytest
-from pathlib import Path
+
+from scripts.payloads import RAW_PATH, build_payload, extract_true_value
 
 # ======================================================
 # CONFIG
 # ======================================================
-API_URL = "http://127.0.0.1:8000/predict"
-CSV_PATH = Path(r"D:\datascience\campusx\PROJECTS\delivery_time_estimator\data\raw\swiggy.csv")
+API_URL = os.getenv("API_URL", "http://127.0.0.1:8000/predict")
+CSV_PATH = os.getenv("CSV_PATH", RAW_PATH)
 
 # ======================================================
 # Load CSV once for all tests
@@ -17,44 +19,6 @@ CSV_PATH = Path(r"D:\datascience\campusx\PROJECTS\delivery_time_estimator\data\r
 df = pd.read_csv(CSV_PATH)
 
 
-def build_payload(sample):
-    """
-    Convert one dataframe row into API JSON payload.
-    Ensures types match FastAPI InputData schema.
-    """
-    return {
-        "ID": sample["ID"],
-        "Delivery_person_ID": sample["Delivery_person_ID"],
-        "Delivery_person_Age": str(sample["Delivery_person_Age"]),
-        "Delivery_person_Ratings": str(sample["Delivery_person_Ratings"]),
-        "Restaurant_latitude": float(sample["Restaurant_latitude"]),
-        "Restaurant_longitude": float(sample["Restaurant_longitude"]),
-        "Delivery_location_latitude": float(sample["Delivery_location_latitude"]),
-        "Delivery_location_longitude": float(sample["Delivery_location_longitude"]),
-        "Order_Date": sample["Order_Date"],
-        "Time_Orderd": sample["Time_Orderd"],
-        "Time_Order_picked": sample["Time_Order_picked"],
-        "Weatherconditions": sample["Weatherconditions"],
-        "Road_traffic_density": sample["Road_traffic_density"],
-        "Vehicle_condition": int(sample["Vehicle_condition"]),
-        "Type_of_order": sample["Type_of_order"],
-        "Type_of_vehicle": sample["Type_of_vehicle"],
-        "multiple_deliveries": str(sample["multiple_deliveries"]),
-        "Festival": sample["Festival"],
-        "City": sample["City"],
-    }
-
-
-def extract_true_value(sample):
-    """Extract '(min) 23' → 23 from Time_taken(min) column."""
-    raw = sample["Time_taken(min)"]
-    cleaned = str(raw).replace("(min)", "").replace("(min) ", "").strip()
-    try:
-        return int(cleaned)
-    except:
-        return None
-
-
 # ======================================================
 # PYTEST TEST: API working + prediction returned
 # ======================================================
@@ -1,7 +1,22 @@
 import numpy as np
 import pandas as pd
 from pathlib import Path
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import inspect
+import json
 import logging
+import os
+import re
+import sys
+import time
+import yaml
+
+# Repo root on sys.path so `src.*` imports work when run by DVC
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from src.data.storage import save_table, TableWriter
+from src.features.build_features import build_features, CATEGORICAL_COLUMNS
 
 # ================================================================
 # LOGGER INITIALIZATION
@@ -18,178 +33,305 @@ formatter = logging.Formatter(
 handler.setFormatter(formatter)
 logger.addHandler(handler)
 
-# Columns to drop
-columns_to_drop = [
-    "rider_id",
-    "restaurant_latitude",
-    "restaurant_longitude",
-    "delivery_latitude",
-    "delivery_longitude",
-    "order_date",
-    "order_time_hour",
-    "order_day",
-    "city_name",
-    "order_day_of_week",
-    "order_month",
-]
-
-# ================================================================
-# TIME OF DAY
-# ================================================================
-def time_of_day(series: pd.Series):
-    return pd.cut(
-        series,
-        bins=[0, 6, 12, 17, 20, 24],
-        labels=["after_midnight", "morning", "afternoon", "evening", "night"],
-        right=True,
-    )
+# ================================================================
+# EXPLICIT SCHEMA
+# ----------------------------------------------------------------
+# Raw columns are read with fixed dtypes instead of letting pandas
+# infer them, so every chunk of a large file gets the same types as
+# a single-shot read (e.g. ratings stay strings even in a chunk
+# without "NaN " values, keeping the == "6" check meaningful).
+# ================================================================
+RAW_DTYPES = {
+    "ID": str,
+    "Delivery_person_ID": str,
+    "Delivery_person_Age": str,
+    "Delivery_person_Ratings": str,
+    "Restaurant_latitude": "float64",
+    "Restaurant_longitude": "float64",
+    "Delivery_location_latitude": "float64",
+    "Delivery_location_longitude": "float64",
+    "Order_Date": str,
+    "Time_Orderd": str,
+    "Time_Order_picked": str,
+    "Weatherconditions": str,
+    "Road_traffic_density": str,
+    "Vehicle_condition": "Int64",
+    "Type_of_order": str,
+    "Type_of_vehicle": str,
+    "multiple_deliveries": str,
+    "Festival": str,
+    "City": str,
+    "Time_taken(min)": str,
+}
 
 # ================================================================
 # LOAD RAW DATA
 # ================================================================
 def load_data(path: Path) -> pd.DataFrame:
-    df = pd.read_csv(path)
+    df = pd.read_csv(path, dtype=RAW_DTYPES)
     logger.info(f"Loaded RAW CSV → shape: {df.shape}")
     return df
 
 # ================================================================
-# RENAME COLUMNS (EXPERIMENT EXACT)
-# ================================================================
-def change_column_names(df: pd.DataFrame) -> pd.DataFrame:
-    return (
-        df.rename(str.lower, axis=1)
-        .rename({
-            "delivery_person_id": "rider_id",
-            "delivery_person_age": "age",
-            "delivery_person_ratings": "ratings",
-            "delivery_location_latitude": "delivery_latitude",
-            "delivery_location_longitude": "delivery_longitude",
-            "time_orderd": "order_time",
-            "time_order_picked": "order_picked_time",
-            "weatherconditions": "weather",
-            "road_traffic_density": "traffic",
-            "city": "city_type",
-            "time_taken(min)": "time_taken",
-        }, axis=1)
+# CLEAN ONE FRAME (whole file or one chunk)
+# ================================================================
+def clean_frame(df: pd.DataFrame) -> pd.DataFrame:
+    cleaned = build_features(df, target=True, categorical=True)
+    logger.info(
+        "Dropped minors / invalid ratings (6 stars): "
+        f"{len(df) - len(cleaned)} rows"
     )
+    return cleaned
 
 # ================================================================
-# MAIN CLEANING LOGIC
+# FULL PIPELINE
 # ================================================================
-def data_cleaning(df: pd.DataFrame) -> pd.DataFrame:
+def perform_data_cleaning(df, save_path, export_csv: bool = False):
+
+    logger.info("Running FULL DATA CLEANING PIPELINE...")
+
+    cleaned = clean_frame(df)
+
+    save_table(cleaned, save_path, export_csv)
+
+    logger.info(f"Final cleaned shape → {cleaned.shape}")
+    logger.info(f"Saved cleaned file → {save_path}")
 
-    minor_index = df.loc[df["age"].astype(float) < 18].index
-    six_star_index = df.loc[df["ratings"] == "6"].index
+    return cleaned
 
-    logger.info(f"Dropping minors: {len(minor_index)} rows")
-    logger.info(f"Dropping invalid ratings (6 stars): {len(six_star_index)} rows")
+# ================================================================
+# CHUNKED PIPELINE (large raw logs)
+# ----------------------------------------------------------------
+# Reads `chunk_size` rows at a time, cleans chunks in a process
+# pool and appends them to the output in file order. At most
+# 2 × n_jobs chunks are in flight, so memory is bounded by the
+# chunk size rather than the file size.
+# ================================================================
+def perform_chunked_data_cleaning(raw_path, save_path, chunk_size: int,
+                                  n_jobs: int = -1, export_csv: bool = False):
 
-    return (
-        df
-        .drop(columns="id")
-        .drop(index=minor_index)
-        .drop(index=six_star_index)
-        .replace("NaN ", np.nan)  # FIXED HERE
-        .assign(
-            city_name=lambda x: x["rider_id"].str.split("RES").str.get(0),
+    n_jobs = n_jobs if n_jobs > 0 else os.cpu_count()
+    max_in_flight = 2 * n_jobs
 
-            age=lambda x: x["age"].astype(float),
-            ratings=lambda x: x["ratings"].astype(float),
+    logger.info(
+        f"Running CHUNKED DATA CLEANING "
+        f"({chunk_size} rows/chunk, {n_jobs} processes)..."
+    )
 
-            restaurant_latitude=lambda x: x["restaurant_latitude"].abs(),
-            restaurant_longitude=lambda x: x["restaurant_longitude"].abs(),
-            delivery_latitude=lambda x: x["delivery_latitude"].abs(),
-            delivery_longitude=lambda x: x["delivery_longitude"].abs(),
+    rows_in = rows_out = n_chunks = raw_cols = 0
+    n_cols = None
 
-            order_date=lambda x: pd.to_datetime(x["order_date"], dayfirst=True),
-            order_day=lambda x: x["order_date"].dt.day,
-            order_month=lambda x: x["order_date"].dt.month,
-            order_day_of_week=lambda x: x["order_date"].dt.day_name().str.lower(),
-            is_weekend=lambda x: x["order_date"].dt.day_name().isin(["Saturday", "Sunday"]).astype(int),
+    reader = pd.read_csv(raw_path, dtype=RAW_DTYPES, chunksize=chunk_size)
 
-            order_time=lambda x: pd.to_datetime(x["order_time"], format="mixed"),
-            order_picked_time=lambda x: pd.to_datetime(x["order_picked_time"], format="mixed"),
+    with ProcessPoolExecutor(max_workers=n_jobs) as pool, \
+            TableWriter(save_path, export_csv) as out:
 
-            pickup_time_minutes=lambda x: (x["order_picked_time"] - x["order_time"]).dt.seconds / 60,
+        pending = deque()
 
-            order_time_hour=lambda x: x["order_time"].dt.hour,
-            order_time_of_day=lambda x: x["order_time_hour"].pipe(time_of_day),
+        def write_next():
+            nonlocal rows_out, n_cols
+            cleaned = pending.popleft().result()
+            out.write(cleaned)
+            rows_out += len(cleaned)
+            n_cols = cleaned.shape[1]
 
-            weather=lambda x: (
-                x["weather"]
-                .str.replace("conditions ", "")
-                .str.lower()
-                .replace("nan", np.nan)   # FIXED HERE
-            ),
-            traffic=lambda x: x["traffic"].str.rstrip().str.lower(),
-            type_of_order=lambda x: x["type_of_order"].str.rstrip().str.lower(),
-            type_of_vehicle=lambda x: x["type_of_vehicle"].str.rstrip().str.lower(),
-            festival=lambda x: x["festival"].str.rstrip().str.lower(),
-            city_type=lambda x: x["city_type"].str.rstrip().str.lower(),
+        for chunk in reader:
+            rows_in += len(chunk)
+            raw_cols = chunk.shape[1]
+            n_chunks += 1
+            pending.append(pool.submit(clean_frame, chunk))
 
-            multiple_deliveries=lambda x: x["multiple_deliveries"].astype(float),
+            if len(pending) >= max_in_flight:
+                write_next()
 
-            time_taken=lambda x: (
-                x["time_taken"].str.replace("(min) ", "").astype(int)
-            ),
-        )
-        .drop(columns=["order_time", "order_picked_time"])
+        while pending:
+            write_next()
+
+    logger.info(
+        f"Cleaned {n_chunks} chunks → {rows_out} of {rows_in} rows kept"
     )
+    logger.info(f"Saved cleaned file → {save_path}")
+
+    return (rows_in, raw_cols), (rows_out, n_cols or 0)
 
 # ================================================================
-# HAVERSINE DISTANCE
+# INCREMENTAL PIPELINE (partitioned by Order_Date)
+# ----------------------------------------------------------------
+# <partition_dir>/<order_date>.parquet   cleaned rows of one day
+#                                         (+ "_row": position in the
+#                                         raw partition)
+# <partition_dir>/manifest.json          content hash per partition,
+#                                         raw file + cleaning code hash
+#
+# Only partitions whose raw rows changed are re-cleaned; the rest
+# are reused. Cleaning is row-local, so the reassembled output (in
+# raw file order) equals a full single-shot run. A change to this
+# file or to the shared feature code invalidates every partition.
+#
+# Every partition must be hashed, so the raw file is read whole:
+# Data_Cleaning.chunk_size does not apply in this mode. dvc.yaml
+# marks the cleaned file and the partitions `persist` so they
+# survive between runs.
 # ================================================================
-def calculate_haversine_distance(df):
-    logger.info("Calculating Haversine distance...")
+MANIFEST_NAME = "manifest.json"
+MISSING_DATE = "__missing__"
 
-    lat1 = np.radians(df["restaurant_latitude"])
-    lon1 = np.radians(df["restaurant_longitude"])
-    lat2 = np.radians(df["delivery_latitude"])
-    lon2 = np.radians(df["delivery_longitude"])
 
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
 
-    a = np.sin(dlat/2)**2 + np.cos(lat1)*np.cos(lat2)*np.sin(dlon/2)**2
-    c = 2 * np.arcsin(np.sqrt(a))
-    distance = 6371 * c
 
-    return df.assign(distance=distance)
+def _code_sha256() -> str:
+    digest = hashlib.sha256()
+    for path in (Path(__file__), Path(inspect.getsourcefile(build_features))):
+        digest.update(_file_sha256(path).encode())
+    return digest.hexdigest()
 
-# ================================================================
-# DISTANCE TYPE
-# ================================================================
-def add_distance_type(df):
-    df["distance_type"] = pd.cut(
-        df["distance"],
-        bins=[0, 5, 10, 15, 25],
-        right=False,
-        labels=["short", "medium", "long", "very_long"],
-    )
-    return df
 
-# ================================================================
-# FULL PIPELINE
-# ================================================================
-def perform_data_cleaning(df, save_path):
+def _partition_sha256(part: pd.DataFrame) -> str:
+    digest = hashlib.sha256(",".join(part.columns).encode())
+    hashes = pd.util.hash_pandas_object(part, index=False)
+    digest.update(hashes.to_numpy().tobytes())
+    return digest.hexdigest()
 
-    logger.info("Running FULL DATA CLEANING PIPELINE...")
+
+def _partition_file(key: str) -> str:
+    return re.sub(r"[^0-9A-Za-z_-]", "_", key) + ".parquet"
+
+
+def _read_manifest(path: Path) -> dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"partitions": {}}
+
+
+def _clean_partition(part: pd.DataFrame, path: Path) -> int:
+    cleaned = clean_frame(part)
+    rows = part.index.get_indexer(cleaned.index).astype(np.int32)
+    cleaned.insert(0, "_row", rows)
+    cleaned.to_parquet(path, index=False)
+    return len(cleaned)
+
+
+def perform_incremental_data_cleaning(raw_path, save_path, partition_dir,
+                                      n_jobs: int = -1,
+                                      export_csv: bool = False):
+
+    partition_dir = Path(partition_dir)
+    partition_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = partition_dir / MANIFEST_NAME
+
+    manifest = _read_manifest(manifest_path)
+    raw_sha = _file_sha256(raw_path)
+    code_sha = _code_sha256()
+
+    # Nothing changed at all → keep the existing output
+    if (
+        manifest.get("raw_sha256") == raw_sha
+        and manifest.get("code_sha256") == code_sha
+        and manifest.get("export_csv") == export_csv
+        and Path(save_path).exists()
+    ):
+        logger.info(
+            "Raw data and cleaning code unchanged → reusing cleaned output"
+        )
+        return tuple(manifest["raw_shape"]), tuple(manifest["cleaned_shape"])
+
+    if manifest.get("code_sha256") != code_sha:
+        logger.info(
+            "Cleaning code changed → every partition will be re-cleaned"
+        )
+        manifest["partitions"] = {}
+
+    df = load_data(raw_path)
+    parts = {
+        MISSING_DATE if pd.isna(key) else key: part
+        for key, part in df.groupby("Order_Date", dropna=False, sort=False)
+    }
+
+    old = manifest["partitions"]
+    new = {}
+    todo = []
+
+    for key, part in parts.items():
+        sha = _partition_sha256(part)
+        entry = old.get(key)
+        if (
+            entry is not None
+            and entry["sha256"] == sha
+            and (partition_dir / entry["file"]).exists()
+        ):
+            new[key] = entry
+        else:
+            new[key] = {"sha256": sha, "file": _partition_file(key)}
+            todo.append(key)
+
+    removed = [key for key in old if key not in parts]
+    for key in removed:
+        (partition_dir / old[key]["file"]).unlink(missing_ok=True)
+
+    logger.info(
+        f"Partitions → {len(todo)} to clean, "
+        f"{len(parts) - len(todo)} reused, {len(removed)} removed"
+    )
+
+    if todo:
+        n_jobs = n_jobs if n_jobs > 0 else os.cpu_count()
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(todo))) as pool:
+            futures = {
+                key: pool.submit(
+                    _clean_partition, parts[key],
+                    partition_dir / new[key]["file"],
+                )
+                for key in todo
+            }
+            for key, future in futures.items():
+                new[key]["rows"] = future.result()
+
+    # Reassemble in raw file order
+    pieces = []
+    for key, part in parts.items():
+        cleaned = pd.read_parquet(partition_dir / new[key]["file"])
+        cleaned.index = part.index[cleaned.pop("_row").to_numpy()]
+        pieces.append(cleaned)
 
     cleaned = (
-        df
-        .pipe(change_column_names)
-        .pipe(data_cleaning)
-        .pipe(calculate_haversine_distance)
-        .pipe(add_distance_type)
-        .drop(columns=columns_to_drop)
+        pd.concat(pieces)
+        .sort_index()
+        .astype({col: "category" for col in CATEGORICAL_COLUMNS})
     )
 
-    cleaned.to_csv(save_path, index=False)
+    save_table(cleaned, save_path, export_csv)
+
+    manifest = {
+        "raw_sha256": raw_sha,
+        "code_sha256": code_sha,
+        "export_csv": export_csv,
+        "raw_shape": list(df.shape),
+        "cleaned_shape": list(cleaned.shape),
+        "partitions": new,
+    }
+    tmp = manifest_path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, manifest_path)
 
-    logger.info(f"Final cleaned shape → {cleaned.shape}")
     logger.info(f"Saved cleaned file → {save_path}")
 
-    return cleaned
+    return df.shape, cleaned.shape
+
+# ================================================================
+# READ PARAMETERS
+# ================================================================
+def read_params(file_path: Path):
+    with open(file_path, "r") as f:
+        return yaml.safe_load(f)
 
 # ================================================================
 # EXECUTION ENTRY POINT
@@ -201,14 +343,42 @@ if __name__ == "__main__":
 
     save_dir = root / "data" / "cleaned"
     save_dir.mkdir(exist_ok=True)
-    save_path = save_dir / "swiggy_cleaned.csv"
+    save_path = save_dir / "swiggy_cleaned.parquet"
+
+    # chunk_size 0 → single-shot cleaning of the whole file in memory
+    all_params = read_params(root / "params.yaml")
+    params = all_params.get("Data_Cleaning", {})
+    chunk_size = params.get("chunk_size", 0)
+    export_csv = all_params.get("Storage", {}).get("export_csv", False)
+
+    start = time.perf_counter()
+
+    if params.get("incremental", False):
+        if chunk_size:
+            logger.warning(
+                "⚠️ chunk_size is ignored in incremental mode "
+                "(the raw file is read whole)"
+            )
+        raw_shape, cleaned_shape = perform_incremental_data_cleaning(
+            raw_path, save_path, save_dir / "partitions",
+            params.get("n_jobs", -1), export_csv,
+        )
+    elif chunk_size:
+        raw_shape, cleaned_shape = perform_chunked_data_cleaning(
+            raw_path, save_path, chunk_size,
+            params.get("n_jobs", -1), export_csv,
+        )
+    else:
+        df = load_data(raw_path)
+        raw_shape = df.shape
+        cleaned_shape = perform_data_cleaning(df, save_path, export_csv).shape
 
-    df = load_data(raw_path)
-    cleaned_df = perform_data_cleaning(df, save_path)
+    elapsed = time.perf_counter() - start
 
     print("\n==============================")
     print("✅ DATA CLEANING COMPLETE")
-    print(f"➡️ Raw Data Shape     : {df.shape}")
-    print(f"➡️ Cleaned Data Shape : {cleaned_df.shape}")
+    print(f"➡️ Raw Data Shape     : {raw_shape}")
+    print(f"➡️ Cleaned Data Shape : {cleaned_shape}")
+    print(f"➡️ Time Taken         : {elapsed:.2f}s")
     print(f"➡️ Saved to           : {save_path}")
     print("==============================\n")
@@ -2,8 +2,13 @@ import pandas as pd
 from sklearn.model_selection import train_test_split
 import yaml
 import logging
+import sys
 from pathlib import Path
 
+# Repo root on sys.path so `src.*` imports work when run by DVC
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from src.data.storage import save_table, load_table
+
 # ==========================================================
 # CONSTANT
 # ==========================================================
@@ -30,7 +35,7 @@ logger.addHandler(handler)
 def load_data(data_path: Path) -> pd.DataFrame:
     """Load cleaned dataset."""
     try:
-        df = pd.read_csv(data_path)
+        df = load_table(data_path)
         logger.info(f"Loaded cleaned dataset → {df.shape}")
     except FileNotFoundError:
         logger.error(f"File not found at: {data_path}")
@@ -58,8 +63,8 @@ def read_params(file_path: Path):
 # ==========================================================
 # SAVE DATA
 # ==========================================================
-def save_data(data: pd.DataFrame, save_path: Path):
-    data.to_csv(save_path, index=False)
+def save_data(data: pd.DataFrame, save_path: Path, export_csv: bool = False):
+    save_table(data, save_path, export_csv)
 
 # ==========================================================
 # MAIN EXECUTION (DVC STAGE)
@@ -68,17 +73,19 @@ if __name__ == "__main__":
 
     root_path = Path(__file__).parent.parent.parent
 
-    data_path = root_path / "data" / "cleaned" / "swiggy_cleaned.csv"
+    data_path = root_path / "data" / "cleaned" / "swiggy_cleaned.parquet"
 
     save_data_dir = root_path / "data" / "interim"
     save_data_dir.mkdir(exist_ok=True, parents=True)
 
-    train_path = save_data_dir / "train.csv"
-    test_path = save_data_dir / "test.csv"
+    train_path = save_data_dir / "train.parquet"
+    test_path = save_data_dir / "test.parquet"
 
     df = load_data(data_path)
 
-    params = read_params(root_path / "params.yaml")["Data_Preparation"]
+    all_params = read_params(root_path / "params.yaml")
+    params = all_params["Data_Preparation"]
+    export_csv = all_params.get("Storage", {}).get("export_csv", False)
     test_size = params["test_size"]
     random_state = params["random_state"]
 
@@ -89,8 +96,8 @@ if __name__ == "__main__":
     logger.info(f"Train NA count: {train_data.isna().sum().sum()}")
     logger.info(f"Test NA count: {test_data.isna().sum().sum()}")
 
-    save_data(train_data, train_path)
-    save_data(test_data, test_path)
+    save_data(train_data, train_path, export_csv)
+    save_data(test_data, test_path, export_csv)
 
     logger.info(f"Train saved → {train_path}")
     logger.info(f"Test saved → {test_path}")
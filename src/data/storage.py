@@ -0,0 +1,139 @@
+import logging
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# ================================================================
+# LOGGER
+# ================================================================
+logger = logging.getLogger("storage")
+logger.setLevel(logging.INFO)
+handler = logging.StreamHandler()
+handler.setFormatter(logging.Formatter(
+    "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+))
+logger.addHandler(handler)
+
+# ================================================================
+# STAGE STORAGE (typed Parquet, optional CSV export)
+# ----------------------------------------------------------------
+# Every DVC stage hands data to the next one as Parquet: dtypes,
+# categoricals (dictionary-encoded) and real NaNs survive the round
+# trip, and files are zstd-compressed. A CSV copy next to the
+# Parquet file can be written for humans / external tools.
+# ================================================================
+COMPRESSION = "zstd"
+
+
+def _mb(path: Path) -> float:
+    return path.stat().st_size / 2**20
+
+
+def save_table(df: pd.DataFrame, path: Path, export_csv: bool = False):
+    """Write `df` to `path` (Parquet), optionally also as a .csv copy."""
+
+    path = Path(path)
+
+    start = time.perf_counter()
+    df.to_parquet(path, index=False, compression=COMPRESSION)
+    elapsed = time.perf_counter() - start
+
+    logger.info(
+        f"💾 Wrote {path.name} → {df.shape}, "
+        f"{_mb(path):.2f} MB in {elapsed:.3f}s"
+    )
+
+    if export_csv:
+        csv_path = path.with_suffix(".csv")
+        df.to_csv(csv_path, index=False)
+        logger.info(
+            f"📝 Exported CSV copy → {csv_path.name} "
+            f"({_mb(csv_path):.2f} MB)"
+        )
+
+
+def load_table(path: Path, columns: list = None) -> pd.DataFrame:
+    """Read a stage output written by save_table / TableWriter."""
+
+    path = Path(path)
+
+    start = time.perf_counter()
+    df = pd.read_parquet(path, columns=columns)
+    elapsed = time.perf_counter() - start
+
+    logger.info(
+        f"📂 Read {path.name} → {df.shape}, "
+        f"{_mb(path):.2f} MB in {elapsed:.3f}s"
+    )
+    return df
+
+
+# ================================================================
+# INCREMENTAL WRITER (one row group per chunk)
+# ================================================================
+class TableWriter:
+    """
+    Appends DataFrames with the same columns to one Parquet file.
+    The schema is fixed by the first chunk (categoricals as
+    dictionary<int32, string>) so later chunks with other category
+    sets, or an all-missing column, still line up.
+    """
+
+    def __init__(self, path: Path, export_csv: bool = False):
+        self.path = Path(path)
+        self.csv_path = self.path.with_suffix(".csv") if export_csv else None
+        self.schema = None
+        self.n_rows = 0
+        self._writer = None
+        self._elapsed = 0.0
+
+    def _schema_for(self, df: pd.DataFrame) -> pa.Schema:
+        schema = pa.Schema.from_pandas(df, preserve_index=False)
+        for i, field in enumerate(schema):
+            if pa.types.is_dictionary(field.type):
+                value_type = field.type.value_type
+                if pa.types.is_null(value_type):
+                    value_type = pa.string()
+                dict_type = pa.dictionary(
+                    pa.int32(), value_type, field.type.ordered
+                )
+                schema = schema.set(i, field.with_type(dict_type))
+        return schema
+
+    def write(self, df: pd.DataFrame):
+        start = time.perf_counter()
+
+        if self._writer is None:
+            self.schema = self._schema_for(df)
+            self._writer = pq.ParquetWriter(
+                self.path, self.schema, compression=COMPRESSION
+            )
+
+        table = pa.Table.from_pandas(
+            df, schema=self.schema, preserve_index=False
+        )
+        self._writer.write_table(table)
+        self._elapsed += time.perf_counter() - start
+
+        if self.csv_path is not None:
+            df.to_csv(self.csv_path, mode="w" if self.n_rows == 0 else "a",
+                      header=self.n_rows == 0, index=False)
+
+        self.n_rows += len(df)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            logger.info(
+                f"💾 Wrote {self.path.name} → {self.n_rows} rows, "
+                f"{_mb(self.path):.2f} MB in {self._elapsed:.3f}s"
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
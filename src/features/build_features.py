@@ -0,0 +1,392 @@
+import logging
+import re
+
+import numpy as np
+import pandas as pd
+
+# ================================================================
+# LOGGER
+# ================================================================
+logger = logging.getLogger("build_features")
+logger.setLevel(logging.INFO)
+handler = logging.StreamHandler()
+handler.setFormatter(logging.Formatter(
+    "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+))
+logger.addHandler(handler)
+
+# ================================================================
+# SHARED FEATURE ENGINEERING (DVC cleaning stage + API)
+# ----------------------------------------------------------------
+# Raw orders → cleaned feature frame, in one columnar pass:
+#
+#   * string columns are normalized once per distinct value
+#     (factorize → fix the few uniques → remap codes), not per row
+#   * dates are parsed once per distinct string with an explicit
+#     format; only non-matching values fall back to pandas inference
+#   * order / pickup times go straight to integer seconds since
+#     midnight (no datetimes, no inference)
+#   * the haversine distance is computed on float64 arrays with
+#     in-place ufuncs, no intermediate Series
+#   * only the columns that end up in the output are built
+#
+# src/data/data_cleaning.py (with the target) and
+# scripts/data_clean_utils.py (without) both call build_features(),
+# so training and serving cannot drift apart.
+# ================================================================
+
+RAW_TARGET = "Time_taken(min)"
+TARGET = "time_taken"
+
+# Column order of the cleaned frame (target goes after city_type)
+FEATURE_COLUMNS = [
+    "age",
+    "ratings",
+    "weather",
+    "traffic",
+    "vehicle_condition",
+    "type_of_order",
+    "type_of_vehicle",
+    "multiple_deliveries",
+    "festival",
+    "city_type",
+    "is_weekend",
+    "pickup_time_minutes",
+    "order_time_of_day",
+    "distance",
+    "distance_type",
+]
+
+# Low-cardinality string columns
+CATEGORICAL_COLUMNS = [
+    "weather",
+    "traffic",
+    "type_of_order",
+    "type_of_vehicle",
+    "festival",
+    "city_type",
+]
+
+# Raw missing-value marker
+MISSING = "NaN "
+
+ORDER_DATE_FORMAT = "%d-%m-%Y"
+
+# Raw order / pickup times: "HH:MM", "HH:MM:SS[.ffffff]" or a
+# fraction of a day ("0.458333333" = 11:00:00)
+CLOCK_TIME_PATTERN = re.compile(
+    r"^\s*(\d{1,2}):(\d{2})(?::(\d{2}(?:\.\d*)?))?\s*$"
+)
+SECONDS_PER_DAY = 86_400
+
+# Hour → time of day, bins (0, 6], (6, 12], ... (right-closed)
+TIME_OF_DAY_EDGES = [0, 6, 12, 17, 20, 24]
+TIME_OF_DAY_LABELS = [
+    "after_midnight", "morning", "afternoon", "evening", "night"
+]
+
+# Distance (km) → type, bins [0, 5), [5, 10), ... (left-closed)
+DISTANCE_EDGES = [0, 5, 10, 15, 25]
+DISTANCE_LABELS = ["short", "medium", "long", "very_long"]
+
+EARTH_RADIUS_KM = 6371
+
+
+# ================================================================
+# EXPLICIT-FORMAT DATETIME PARSING
+# ================================================================
+def parse_datetime(series: pd.Series, fmt: str, **fallback) -> pd.Series:
+    """
+    Parse with one explicit format (no per-value inference); only the
+    values that do not match fall back to pandas inference. Anything
+    still unparseable becomes NaT.
+    """
+    parsed = pd.to_datetime(series, format=fmt, errors="coerce")
+
+    leftover = parsed.isna() & series.notna()
+    if leftover.any():
+        parsed[leftover] = pd.to_datetime(
+            series[leftover], errors="coerce", **fallback
+        )
+
+    return parsed
+
+
+def _parse_unique(values: pd.Series, fmt: str, **fallback) -> np.ndarray:
+    """parse_datetime() once per distinct string, "NaN " → NaT."""
+    codes, uniques = pd.factorize(values)
+    uniques = np.asarray(uniques, dtype=object)
+    uniques[uniques == MISSING] = None
+    parsed = parse_datetime(pd.Series(uniques), fmt, **fallback).to_numpy()
+    # Missing values have code -1 → the NaT appended last
+    return np.append(parsed, np.datetime64("NaT")).take(codes)
+
+
+# ================================================================
+# TIME-OF-DAY PARSING (seconds since midnight)
+# ================================================================
+def time_to_seconds(value: str):
+    """Seconds since midnight for one raw time string, None if unparseable."""
+    match = CLOCK_TIME_PATTERN.match(value)
+    if match:
+        hours, minutes = int(match[1]), int(match[2])
+        seconds = float(match[3] or 0)
+        if hours < 24 and minutes < 60 and seconds < 60:
+            return hours * 3600 + minutes * 60 + int(seconds)
+        return None
+
+    try:
+        fraction = float(value)
+    except ValueError:
+        return None
+    if 0 <= fraction <= 1:
+        return round(fraction * SECONDS_PER_DAY) % SECONDS_PER_DAY
+    return None
+
+
+def parse_time_of_day(values: pd.Series):
+    """
+    Vectorized time_to_seconds() over each distinct raw string.
+
+    Returns (seconds, unparseable): int32 seconds since midnight, -1
+    where the value is missing or unparseable, and a boolean mask of
+    the unparseable ones (present but in no known format).
+    """
+    codes, uniques = pd.factorize(values)
+    uniques = pd.Series(uniques, dtype=object)
+    present = uniques.notna().to_numpy() & (uniques != MISSING).to_numpy()
+
+    # HH:MM(:SS)
+    parts = uniques.str.extract(CLOCK_TIME_PATTERN).astype(np.float64)
+    hours = parts[0].to_numpy()
+    minutes = parts[1].to_numpy()
+    seconds = parts[2].fillna(0).to_numpy()
+    clock = (hours < 24) & (minutes < 60) & (seconds < 60)
+
+    # Fraction of a day (only for strings that are not clock times)
+    fraction = pd.to_numeric(
+        uniques.where(parts[0].isna()), errors="coerce"
+    ).to_numpy(np.float64)
+    day_fraction = (fraction >= 0) & (fraction <= 1)
+
+    parsed = np.full(len(uniques) + 1, -1, dtype=np.int32)
+    clock_seconds = hours * 3600 + minutes * 60 + np.floor(seconds)
+    parsed[:-1][clock] = clock_seconds[clock]
+    day_seconds = np.rint(fraction[day_fraction] * SECONDS_PER_DAY)
+    parsed[:-1][day_fraction] = day_seconds % SECONDS_PER_DAY
+
+    unparseable = np.append(present & ~clock & ~day_fraction, False)
+
+    # Missing values have code -1 → the sentinel appended last
+    return parsed.take(codes), unparseable.take(codes)
+
+
+# ================================================================
+# COLUMN HELPERS
+# ================================================================
+def _to_float(series: pd.Series) -> np.ndarray:
+    """float64 values; raw strings are converted once per distinct value."""
+    if series.dtype != object:
+        return series.to_numpy(dtype=np.float64, na_value=np.nan)
+
+    codes, uniques = pd.factorize(series)
+    values = (
+        pd.Series(uniques, dtype=object)
+        .replace(MISSING, np.nan)
+        .astype(np.float64)
+        .to_numpy()
+    )
+    return np.append(values, np.nan).take(codes)
+
+
+def _normalize_strings(series: pd.Series, normalize, categorical: bool):
+    """
+    Apply `normalize` to every distinct string (None → missing) and
+    return a Categorical (sorted categories, like .astype("category"))
+    or an object array.
+    """
+    codes, uniques = pd.factorize(series)
+
+    normalized = [
+        None if value == MISSING else normalize(value) for value in uniques
+    ]
+    categories = sorted({value for value in normalized if value is not None})
+    lookup = {value: code for code, value in enumerate(categories)}
+
+    remap = np.array(
+        [lookup.get(value, -1) for value in normalized] + [-1],
+        dtype=np.int32,
+    )
+    new_codes = remap.take(codes)
+
+    if categorical:
+        return pd.Categorical.from_codes(new_codes, categories)
+
+    labels = np.append(np.array(categories, dtype=object), np.nan)
+    return labels.take(new_codes)
+
+
+def _strip_lower(value: str) -> str:
+    return value.rstrip().lower()
+
+
+def _weather(value: str):
+    value = value.replace("conditions ", "").lower()
+    return None if value == "nan" else value
+
+
+def _cut(values: np.ndarray, edges: list, labels: list,
+         right: bool) -> pd.Categorical:
+    """pd.cut(values, edges, labels=labels, right=right) via searchsorted."""
+    side = "left" if right else "right"
+    codes = np.searchsorted(edges, values, side=side) - 1
+    codes[(codes < 0) | (codes >= len(labels)) | np.isnan(values)] = -1
+    return pd.Categorical.from_codes(
+        codes, dtype=pd.CategoricalDtype(labels, ordered=True)
+    )
+
+
+def haversine_distance(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """
+    Great-circle distance (km) between |lat1|, |lon1| and |lat2|, |lon2|
+    in degrees. Same formula as the per-column numpy version, fused
+    into four float64 buffers that are updated in place.
+    """
+    lat1, lon1, lat2, lon2 = (
+        np.radians(np.abs(np.asarray(values, dtype=np.float64)))
+        for values in (lat1, lon1, lat2, lon2)
+    )
+
+    # sin²(dlat / 2)
+    a = np.subtract(lat2, lat1)
+    a /= 2
+    np.sin(a, out=a)
+    np.square(a, out=a)
+
+    # sin²(dlon / 2), reusing lon2
+    np.subtract(lon2, lon1, out=lon2)
+    lon2 /= 2
+    np.sin(lon2, out=lon2)
+    np.square(lon2, out=lon2)
+
+    # cos(lat1) · cos(lat2) · sin²(dlon / 2), reusing lat1
+    np.cos(lat1, out=lat1)
+    np.cos(lat2, out=lat2)
+    lat1 *= lat2
+    lat1 *= lon2
+
+    a += lat1
+    np.sqrt(a, out=a)
+    np.arcsin(a, out=a)
+    a *= 2
+    a *= EARTH_RADIUS_KM
+    return a
+
+
+# ================================================================
+# FEATURE BUILDER
+# ================================================================
+def build_features(df: pd.DataFrame, target: bool = False,
+                   categorical: bool = False) -> pd.DataFrame:
+    """
+    Cleaned feature frame for raw orders (raw column names).
+
+    Minors and 6-star ratings are dropped; rows with missing values
+    are kept (NaN) so callers can report or drop them. The index of
+    the surviving rows is preserved. With `target` the parsed
+    "Time_taken(min)" is included as `time_taken`; with `categorical`
+    the string columns come back as categoricals.
+    """
+
+    # Rejected rows (ratings only match "6" when they are raw strings)
+    age = _to_float(df["Delivery_person_Age"])
+    six_stars = (df["Delivery_person_Ratings"] == "6").to_numpy()
+    keep = ~((age < 18) | six_stars)
+
+    if not keep.all():
+        df = df.loc[keep]
+        age = age[keep]
+
+    def strings(column, normalize=_strip_lower):
+        return _normalize_strings(df[column], normalize, categorical)
+
+    columns = {
+        "age": age,
+        "ratings": _to_float(df["Delivery_person_Ratings"]),
+        "weather": strings("Weatherconditions", _weather),
+        "traffic": strings("Road_traffic_density"),
+        "vehicle_condition": df["Vehicle_condition"].array,
+        "type_of_order": strings("Type_of_order"),
+        "type_of_vehicle": strings("Type_of_vehicle"),
+        "multiple_deliveries": _to_float(df["multiple_deliveries"]),
+        "festival": strings("Festival"),
+        "city_type": strings("City"),
+    }
+
+    if target:
+        codes, uniques = pd.factorize(df[RAW_TARGET])
+        minutes = (
+            pd.Series(uniques, dtype=object)
+            .str.replace("(min) ", "")
+            .astype(int)
+            .to_numpy()
+        )
+        columns[TARGET] = minutes.take(codes)
+
+    # Date → weekend flag
+    order_date = _parse_unique(
+        df["Order_Date"], ORDER_DATE_FORMAT, dayfirst=True
+    )
+    weekday = pd.DatetimeIndex(order_date).dayofweek
+    is_weekend = (weekday >= 5).astype(np.int64)
+
+    # Present but unparseable → NaN, so the row is dropped like a bad time
+    date_given = df["Order_Date"].notna() & (df["Order_Date"] != MISSING)
+    bad_date = np.isnat(order_date) & date_given.to_numpy()
+    if bad_date.any():
+        examples = df.loc[bad_date, "Order_Date"].head(3).tolist()
+        logger.warning(
+            f"⚠️ {bad_date.sum()} rows with unparseable order date, "
+            f"e.g. {examples}"
+        )
+        is_weekend = np.where(bad_date, np.nan, is_weekend)
+    columns["is_weekend"] = is_weekend
+
+    # Times → pickup duration and hour of the order
+    order_time, bad_order = parse_time_of_day(df["Time_Orderd"])
+    picked_time, bad_picked = parse_time_of_day(df["Time_Order_picked"])
+
+    unparseable = bad_order | bad_picked
+    if unparseable.any():
+        examples = (
+            df.loc[unparseable, ["Time_Orderd", "Time_Order_picked"]]
+            .head(3).to_numpy().tolist()
+        )
+        logger.warning(
+            f"⚠️ {unparseable.sum()} rows with unparseable order / pickup "
+            f"time, e.g. {examples}"
+        )
+
+    # A pickup earlier in the day than the order wraps around midnight
+    known = (order_time >= 0) & (picked_time >= 0)
+    columns["pickup_time_minutes"] = np.where(
+        known, (picked_time - order_time) % SECONDS_PER_DAY / 60, np.nan
+    )
+
+    order_hour = np.where(order_time >= 0, order_time // 3600, np.nan)
+    columns["order_time_of_day"] = _cut(
+        order_hour, TIME_OF_DAY_EDGES, TIME_OF_DAY_LABELS, right=True
+    )
+
+    distance = haversine_distance(
+        df["Restaurant_latitude"],
+        df["Restaurant_longitude"],
+        df["Delivery_location_latitude"],
+        df["Delivery_location_longitude"],
+    )
+    columns["distance"] = distance
+    columns["distance_type"] = _cut(
+        distance, DISTANCE_EDGES, DISTANCE_LABELS, right=False
+    )
+
+    return pd.DataFrame(columns, index=df.index)
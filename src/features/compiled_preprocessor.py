@@ -0,0 +1,216 @@
+import numpy as np
+from sklearn.compose import ColumnTransformer
+from sklearn.preprocessing import (
+    FunctionTransformer,
+    MinMaxScaler,
+    OneHotEncoder,
+    OrdinalEncoder,
+)
+
+# ================================================================
+# COMPILED PREPROCESSOR
+# ----------------------------------------------------------------
+# Flattens a fitted ColumnTransformer (MinMaxScaler + OneHotEncoder
+# + OrdinalEncoder + passthrough) into plain lookup tables so serving
+# can write features straight into a NumPy buffer, without joblib
+# workers or a labelled DataFrame.
+# ================================================================
+
+# Marker for the OneHotEncoder category removed by drop="first"
+_DROPPED = -1
+_UNKNOWN = -2
+
+
+def _py(value):
+    """numpy scalar → python scalar, so dict lookups hash the same."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _unknown_category(value, col) -> ValueError:
+    return ValueError(f"Found unknown category {value!r} in column {col!r}")
+
+
+class CompiledPreprocessor:
+    """
+    Numeric equivalent of a fitted ColumnTransformer.
+
+    Output columns follow `preprocessor.get_feature_names_out()`.
+    Values are computed in float64 with the same operations as
+    scikit-learn and stored as `dtype`, so the result is identical
+    to `preprocessor.transform(X).to_numpy(dtype)`.
+    """
+
+    def __init__(self, preprocessor: ColumnTransformer, dtype=np.float32):
+
+        self.dtype = np.dtype(dtype)
+        self.feature_names_in_ = list(preprocessor.feature_names_in_)
+        self.feature_names_out_ = list(preprocessor.get_feature_names_out())
+        self.n_features_out_ = len(self.feature_names_out_)
+
+        # (column, out_index, scale, min, clip_range | None)
+        self.numeric = []
+        # (column, {category: out_index | _DROPPED}, strict)
+        self.onehot = []
+        # (column, out_index, {category: code})
+        self.ordinal = []
+        # (column, out_index)
+        self.passthrough = []
+
+        for name, transformer, columns in preprocessor.transformers_:
+            if transformer == "drop":
+                continue
+
+            start = preprocessor.output_indices_[name].start
+            columns = [
+                self.feature_names_in_[c]
+                if isinstance(c, (int, np.integer)) else c
+                for c in columns
+            ]
+
+            if isinstance(transformer, MinMaxScaler):
+                self._add_numeric(transformer, columns, start)
+            elif isinstance(transformer, OneHotEncoder):
+                self._add_onehot(name, transformer, columns, start)
+            elif isinstance(transformer, OrdinalEncoder):
+                self._add_ordinal(name, transformer, columns, start)
+            elif transformer == "passthrough" or (
+                isinstance(transformer, FunctionTransformer)
+                and transformer.func is None
+            ):
+                for k, col in enumerate(columns):
+                    self.passthrough.append((col, start + k))
+            else:
+                raise TypeError(
+                    f"Cannot compile transformer '{name}' "
+                    f"({type(transformer).__name__})"
+                )
+
+    def _add_numeric(self, transformer: MinMaxScaler, columns, start: int):
+        clip = tuple(transformer.feature_range) if transformer.clip else None
+        for k, col in enumerate(columns):
+            self.numeric.append((
+                col, start + k,
+                float(transformer.scale_[k]), float(transformer.min_[k]),
+                clip,
+            ))
+
+    def _add_onehot(self, name: str, transformer: OneHotEncoder, columns,
+                    start: int):
+        grouped = (
+            transformer.max_categories is not None
+            or transformer.min_frequency is not None
+        )
+        if transformer.sparse_output or grouped:
+            raise TypeError(f"Cannot compile OneHotEncoder '{name}'")
+
+        strict = transformer.handle_unknown == "error"
+        drop_idx = transformer.drop_idx_
+        offset = start
+        for k, col in enumerate(columns):
+            lut = {}
+            for i, category in enumerate(transformer.categories_[k]):
+                if drop_idx is not None and drop_idx[k] == i:
+                    lut[_py(category)] = _DROPPED
+                else:
+                    lut[_py(category)] = offset
+                    offset += 1
+            self.onehot.append((col, lut, strict))
+
+    def _add_ordinal(self, name: str, transformer: OrdinalEncoder, columns,
+                     start: int):
+        if transformer.handle_unknown != "error":
+            raise TypeError(f"Cannot compile OrdinalEncoder '{name}'")
+
+        for k, col in enumerate(columns):
+            lut = {
+                _py(category): float(code)
+                for code, category in enumerate(transformer.categories_[k])
+            }
+            self.ordinal.append((col, start + k, lut))
+
+    # ============================================================
+    # SINGLE ROW (dict of cleaned features)
+    # ============================================================
+    def transform_record(self, features: dict,
+                         out: np.ndarray = None) -> np.ndarray:
+        """One cleaned feature dict → (1, n_features_out_) array."""
+
+        if out is None:
+            out = np.zeros((1, self.n_features_out_), dtype=self.dtype)
+        else:
+            out.fill(0)
+
+        row = out[0]
+
+        for col, j, scale, min_, clip in self.numeric:
+            value = float(features[col]) * scale + min_
+            if clip is not None:
+                value = min(max(value, clip[0]), clip[1])
+            row[j] = value
+
+        self._encode_categories(features, row)
+
+        for col, j in self.passthrough:
+            row[j] = features[col]
+
+        return out
+
+    def _encode_categories(self, features: dict, row: np.ndarray):
+        for col, lut, strict in self.onehot:
+            j = lut.get(features[col], _UNKNOWN)
+            if j >= 0:
+                row[j] = 1
+            elif j == _UNKNOWN and strict:
+                raise _unknown_category(features[col], col)
+
+        for col, j, lut in self.ordinal:
+            try:
+                row[j] = lut[features[col]]
+            except KeyError:
+                raise _unknown_category(features[col], col) from None
+
+    # ============================================================
+    # BATCH (DataFrame or mapping of columns)
+    # ============================================================
+    def transform(self, X, out: np.ndarray = None) -> np.ndarray:
+        """Cleaned DataFrame → (n_rows, n_features_out_) array."""
+
+        n_rows = len(X)
+
+        if out is None:
+            out = np.zeros((n_rows, self.n_features_out_), dtype=self.dtype)
+        else:
+            out.fill(0)
+
+        rows = np.arange(n_rows)
+
+        for col, j, scale, min_, clip in self.numeric:
+            values = np.asarray(X[col], dtype=np.float64) * scale
+            values += min_
+            if clip is not None:
+                np.clip(values, clip[0], clip[1], out=values)
+            out[:, j] = values
+
+        for col, lut, strict in self.onehot:
+            codes = np.fromiter(
+                (lut.get(_py(v), _UNKNOWN) for v in X[col]),
+                dtype=np.intp, count=n_rows,
+            )
+            if strict and (codes == _UNKNOWN).any():
+                raise ValueError(f"Found unknown categories in column {col!r}")
+            hit = codes >= 0
+            out[rows[hit], codes[hit]] = 1
+
+        for col, j, lut in self.ordinal:
+            codes = np.fromiter(
+                (lut.get(_py(v), np.nan) for v in X[col]),
+                dtype=np.float64, count=n_rows,
+            )
+            if np.isnan(codes).any():
+                raise ValueError(f"Found unknown categories in column {col!r}")
+            out[:, j] = codes
+
+        for col, j in self.passthrough:
+            out[:, j] = np.asarray(X[col], dtype=np.float64)
+
+        return out
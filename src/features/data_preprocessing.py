@@ -1,12 +1,20 @@
 import pandas as pd
 import numpy as np
 import logging
+import sys
 from pathlib import Path
 import joblib
+import yaml
 from sklearn.compose import ColumnTransformer
 from sklearn.preprocessing import MinMaxScaler, OneHotEncoder, OrdinalEncoder
 from sklearn import set_config
 
+# Repo root on sys.path so `src.*` imports work when run by DVC
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from src.features.compiled_preprocessor import CompiledPreprocessor
+from src.data.storage import save_table, load_table
+from src.features.feature_matrix import save_feature_matrix
+
 # ================================================================
 # LOGGER SETUP
 # ================================================================
@@ -62,36 +70,34 @@ if __name__ == "__main__":
 
     root = Path(__file__).parent.parent.parent
 
-    train_path = root / "data" / "interim" / "train.csv"
-    test_path = root / "data" / "interim" / "test.csv"
+    train_path = root / "data" / "interim" / "train.parquet"
+    test_path = root / "data" / "interim" / "test.parquet"
 
     out_dir = root / "data" / "processed"
     out_dir.mkdir(exist_ok=True, parents=True)
 
-    train_out = out_dir / "train_trans.csv"
-    test_out = out_dir / "test_trans.csv"
+    train_out = out_dir / "train_trans.parquet"
+    test_out = out_dir / "test_trans.parquet"
 
     preproc_path = root / "models" / "preprocessor.joblib"
+    compiled_path = root / "models" / "compiled_preprocessor.joblib"
+
+    with open(root / "params.yaml") as f:
+        storage = yaml.safe_load(f).get("Storage", {})
+    export_csv = storage.get("export_csv", False)
 
     # ============================================================
     # 1️⃣ LOAD RAW TRAIN & TEST
     # ============================================================
-    train = pd.read_csv(train_path)
-    test = pd.read_csv(test_path)
+    # Parquet keeps real NaNs and dtypes, so no string "NaN" fix-up is needed
+    train = load_table(train_path)
+    test = load_table(test_path)
 
     logger.info(f"Loaded TRAIN → {train.shape}")
     logger.info(f"Loaded TEST  → {test.shape}")
 
     # ============================================================
-    # 2️⃣ CONVERT STRING 'NaN' TO REAL np.nan
-    # ============================================================
-    nan_values = ["NaN", "NaN ", "nan", "NA", "na", "NAN"]
-
-    train = train.replace(nan_values, np.nan)
-    test = test.replace(nan_values, np.nan)
-
-    # ============================================================
-    # 3️⃣ DROP ALL ROWS WITH ANY NaN
+    # 2️⃣ DROP ALL ROWS WITH ANY NaN
     # ============================================================
     before_train = train.shape[0]
     before_test = test.shape[0]
@@ -106,7 +112,7 @@ if __name__ == "__main__":
     logger.info(f"TEST  after dropna() → {test.shape}")
 
     # ============================================================
-    # 4️⃣ SPLIT INTO X AND y
+    # 3️⃣ SPLIT INTO X AND y
     # ============================================================
     X_train = train.drop(columns=[TARGET])
     y_train = train[TARGET]
@@ -118,27 +124,49 @@ if __name__ == "__main__":
     logger.info(f"Final TEST  (clean) → {X_test.shape}")
 
     # ============================================================
-    # 5️⃣ FIT PREPROCESSOR ON CLEANED TRAINING DATA
+    # 4️⃣ FIT PREPROCESSOR ON CLEANED TRAINING DATA
     # ============================================================
     preprocessor.fit(X_train)
     logger.info("Preprocessor fitted on cleaned train dataset.")
 
     # ============================================================
-    # 6️⃣ TRANSFORM TRAIN & TEST
+    # 5️⃣ TRANSFORM TRAIN & TEST
     # ============================================================
     X_train_t = preprocessor.transform(X_train)
     X_test_t = preprocessor.transform(X_test)
 
-    train_final = X_train_t.join(y_train)
-    test_final = X_test_t.join(y_test)
+    # Features stored as float32 (what both boosters use internally)
+    train_final = X_train_t.astype(np.float32).join(y_train)
+    test_final = X_test_t.astype(np.float32).join(y_test)
 
     logger.info(f"TRAIN transformed → {train_final.shape}")
     logger.info(f"TEST  transformed → {test_final.shape}")
 
-    train_final.to_csv(train_out, index=False)
-    test_final.to_csv(test_out, index=False)
+    save_table(train_final, train_out, export_csv)
+    save_table(test_final, test_out, export_csv)
+
+    # Memory-mappable float32 matrices read by train / evaluate / tuning
+    save_feature_matrix(train_final, TARGET, out_dir / "matrix", "train")
+    save_feature_matrix(test_final, TARGET, out_dir / "matrix", "test")
 
     joblib.dump(preprocessor, preproc_path)
     logger.info(f"Saved preprocessor → {preproc_path}")
 
+    # ============================================================
+    # 6️⃣ EXPORT COMPILED (LOOKUP-TABLE) PREPROCESSOR FOR SERVING
+    # ============================================================
+    compiled = CompiledPreprocessor(preprocessor, dtype=np.float32)
+
+    if not np.array_equal(
+        compiled.transform(X_test), X_test_t.to_numpy(dtype=np.float32)
+    ):
+        raise ValueError(
+            "Compiled preprocessor differs from ColumnTransformer on TEST"
+        )
+
+    joblib.dump(compiled, compiled_path)
+    logger.info(
+        f"Compiled preprocessor matches on TEST → saved {compiled_path}"
+    )
+
     logger.info("✅ Finished: NaN cleaning + preprocessing applied.")
@@ -0,0 +1,102 @@
+import json
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# ================================================================
+# LOGGER
+# ================================================================
+logger = logging.getLogger("feature_matrix")
+logger.setLevel(logging.INFO)
+handler = logging.StreamHandler()
+handler.setFormatter(logging.Formatter(
+    "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+))
+logger.addHandler(handler)
+
+# ================================================================
+# MEMORY-MAPPED FEATURE MATRIX
+# ----------------------------------------------------------------
+# <dir>/<name>_X.npy     C-contiguous float32 (n_rows, n_features)
+# <dir>/<name>_y.npy     target vector
+# <dir>/<name>.json      column names, target name, shapes, dtypes
+#
+# Opening with mmap_mode="r" means every process (train, evaluate,
+# joblib CV workers) reads the same page-cache copy instead of
+# parsing and holding its own.
+# ================================================================
+DTYPE = np.float32
+
+
+def save_feature_matrix(df: pd.DataFrame, target: str, directory: Path,
+                        name: str) -> dict:
+    """Write the features of `df` as float32 .npy plus target and metadata."""
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    features = df.drop(columns=[target])
+    X = np.ascontiguousarray(features.to_numpy(dtype=DTYPE))
+    y = df[target].to_numpy()
+
+    np.save(directory / f"{name}_X.npy", X)
+    np.save(directory / f"{name}_y.npy", y)
+
+    meta = {
+        "columns": list(features.columns),
+        "target": target,
+        "n_rows": int(X.shape[0]),
+        "n_features": int(X.shape[1]),
+        "dtype": np.dtype(DTYPE).name,
+        "target_dtype": y.dtype.name,
+    }
+    with open(directory / f"{name}.json", "w") as f:
+        json.dump(meta, f, indent=2)
+
+    logger.info(
+        f"🧱 Saved {name} matrix → {X.shape} {meta['dtype']} "
+        f"({X.nbytes / 2**20:.2f} MB)"
+    )
+    return meta
+
+
+def open_feature_matrix(directory: Path, name: str, as_frame: bool = True):
+    """
+    Memory-map a matrix written by save_feature_matrix.
+
+    Returns (X, y). With `as_frame` X is a DataFrame view over the
+    mapping (no copy, keeps feature names) and y a Series; otherwise
+    the raw read-only memmaps, which joblib hands to worker
+    processes by file reference instead of pickling the data.
+
+    Frames use a copy-on-write mapping: sklearn flips pandas-backed
+    arrays to writeable, which a read-only mapping refuses. Pages
+    stay shared until something actually writes to them.
+    """
+
+    directory = Path(directory)
+
+    with open(directory / f"{name}.json") as f:
+        meta = json.load(f)
+
+    mode = "c" if as_frame else "r"
+    X = np.load(directory / f"{name}_X.npy", mmap_mode=mode)
+    y = np.load(directory / f"{name}_y.npy", mmap_mode=mode)
+
+    if X.shape != (meta["n_rows"], meta["n_features"]):
+        raise ValueError(
+            f"{name}_X.npy has shape {X.shape}, metadata says "
+            f"({meta['n_rows']}, {meta['n_features']})"
+        )
+
+    logger.info(f"🧱 Mapped {name} matrix → {X.shape} {X.dtype}")
+
+    if not as_frame:
+        return X, y
+
+    return (
+        pd.DataFrame(X, columns=meta["columns"], copy=False),
+        pd.Series(y, name=meta["target"], copy=False),
+    )
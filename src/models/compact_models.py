@@ -0,0 +1,356 @@
+import io
+import json
+import logging
+import sys
+import time
+import joblib
+import numpy as np
+import yaml
+import lightgbm as lgb
+from pathlib import Path
+from catboost import CatBoostRegressor
+from sklearn.base import clone
+from sklearn.model_selection import train_test_split
+
+# Repo root on sys.path so `src.*` imports work when run by DVC
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from src.features.feature_matrix import open_feature_matrix
+from src.models.ensemble import FusedEnsemble
+from src.models.find_best_weights import read_ensemble_weights
+
+# ================================================================
+# LOGGER SETUP
+# ================================================================
+logger = logging.getLogger("compact_models")
+logger.setLevel(logging.INFO)
+
+handler = logging.StreamHandler()
+handler.setLevel(logging.INFO)
+
+formatter = logging.Formatter(
+    fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+handler.setFormatter(formatter)
+logger.addHandler(handler)
+
+# ================================================================
+# MODEL COMPACTION
+# ----------------------------------------------------------------
+# Trees are added in segments of Compact.segment; the MAE after
+# every segment (the boosters' staged predictions, one pass over the
+# trees) is measured on a Compact.validation_size holdout of the
+# training matrix, scored by copies of the boosters (same params and
+# tree count) fit without it. Each booster is cut at the first
+# segment whose holdout MAE is within Compact.mae_tolerance of the
+# full model; the test matrix is only used to report the effect.
+# The cut models are saved in their native format:
+#   CatBoost → models/compact/catboost_model.cbm (binary)
+#   LightGBM → models/compact/lgbm_model.txt (its only native format)
+# register.py builds the served bundle from these when present.
+# ================================================================
+CATBOOST_FILE = "catboost_model.cbm"
+LIGHTGBM_FILE = "lgbm_model.txt"
+LOAD_REPEATS = 5
+
+
+def checkpoints(n_trees: int, segment: int) -> list:
+    """Tree counts after each segment; the last one is the full model."""
+    return list(range(segment, n_trees, segment)) + [n_trees]
+
+
+def staged_mae_catboost(model: CatBoostRegressor, X, y,
+                        segment: int) -> list:
+    y = np.asarray(y)
+    return [
+        float(np.abs(pred - y).mean())
+        for pred in model.staged_predict(X, eval_period=segment)
+    ]
+
+
+def staged_mae_lightgbm(booster: lgb.Booster, X, y,
+                        segment: int) -> list:
+    # Each segment's raw contribution is added to the running total
+    y = np.asarray(y)
+    total = np.zeros(len(y))
+    maes, start = [], 0
+    for end in checkpoints(booster.num_trees(), segment):
+        total += booster.predict(
+            X, start_iteration=start, num_iteration=end - start,
+            raw_score=True,
+        )
+        maes.append(float(np.abs(total - y).mean()))
+        start = end
+    return maes
+
+
+def holdout_curves(cat_model: CatBoostRegressor, lgb_model, X_fit, y_fit,
+                   X_val, y_val, segment: int) -> dict:
+    """
+    Staged holdout MAE per booster, from copies of the served models
+    (same params and tree count) fit on X_fit only.
+    """
+    cat_copy = clone(cat_model).set_params(iterations=cat_model.tree_count_)
+    cat_copy.fit(X_fit, y_fit)
+
+    lgb_trees = lgb_model.booster_.num_trees()
+    lgb_copy = clone(lgb_model).set_params(n_estimators=lgb_trees)
+    lgb_copy.fit(X_fit, y_fit)
+
+    return {
+        "CatBoost": staged_mae_catboost(cat_copy, X_val, y_val, segment),
+        "LightGBM": staged_mae_lightgbm(
+            lgb_copy.booster_, X_val, y_val, segment
+        ),
+    }
+
+
+def choose_tree_count(trees: list, maes: list,
+                      tolerance: float) -> int:
+    """Fewest trees whose MAE is at most the full model's + `tolerance`."""
+    limit = maes[-1] + tolerance
+    return next(n for n, mae in zip(trees, maes) if mae <= limit)
+
+
+def segment_report(trees: list, maes: list) -> list:
+    """MAE after each segment and its change (negative = helped)."""
+    previous = [None] + maes[:-1]
+    return [
+        {
+            "trees": n,
+            "mae": mae,
+            "delta": None if before is None else mae - before,
+        }
+        for n, mae, before in zip(trees, maes, previous)
+    ]
+
+
+# ================================================================
+# NATIVE EXPORT / LOAD
+# ================================================================
+def export_compact(cat_model: CatBoostRegressor, cat_trees: int,
+                   booster: lgb.Booster, lgb_trees: int, out_dir: Path):
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    cat_model = cat_model.copy()
+    cat_model.shrink(ntree_end=cat_trees)
+    cat_model.save_model(str(out_dir / CATBOOST_FILE), format="cbm")
+
+    booster.save_model(str(out_dir / LIGHTGBM_FILE), num_iteration=lgb_trees)
+
+
+def load_compact(compact_dir: Path):
+    """(CatBoostRegressor, lightgbm.Booster) from the native files."""
+    compact_dir = Path(compact_dir)
+    cat_model = CatBoostRegressor().load_model(
+        str(compact_dir / CATBOOST_FILE)
+    )
+    booster = lgb.Booster(model_file=str(compact_dir / LIGHTGBM_FILE))
+    return cat_model, booster
+
+
+def native_models(compact_dir: Path) -> dict:
+    """The native files' contents, as registered for serving."""
+    compact_dir = Path(compact_dir)
+    return {
+        "catboost": (compact_dir / CATBOOST_FILE).read_bytes(),
+        "lightgbm": (compact_dir / LIGHTGBM_FILE).read_text(),
+    }
+
+
+def boosters_from_native(native: dict):
+    """(CatBoostRegressor, lightgbm.Booster) from native_models()."""
+    cat_model = CatBoostRegressor().load_model(blob=native["catboost"])
+    booster = lgb.Booster(model_str=native["lightgbm"])
+    return cat_model, booster
+
+
+# ================================================================
+# BEFORE / AFTER MEASUREMENTS
+# ================================================================
+def median_seconds(fn, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def pickled_size(obj) -> int:
+    buffer = io.BytesIO()
+    joblib.dump(obj, buffer)
+    return len(buffer.getvalue())
+
+
+def compare(name: str, before_path: Path, before_load, after_path: Path,
+            after_load, row, repeats: int) -> dict:
+    """Artifact size, load time and 1-row predict latency, before/after."""
+
+    # scikit-learn wrapper before, native object after
+    before, after = before_load(), after_load()
+    before.predict(row)
+    after.predict(row)
+
+    def row_ms(model):
+        return median_seconds(lambda: model.predict(row), repeats) * 1e3
+
+    report = {
+        "size_bytes": {
+            "before": before_path.stat().st_size,
+            "after": after_path.stat().st_size,
+        },
+        "pickled_bytes": {
+            "before": pickled_size(before),
+            "after": pickled_size(after),
+        },
+        "load_ms": {
+            "before": median_seconds(before_load, LOAD_REPEATS) * 1e3,
+            "after": median_seconds(after_load, LOAD_REPEATS) * 1e3,
+        },
+        "single_row_ms": {"before": row_ms(before), "after": row_ms(after)},
+    }
+
+    size, load, latency = (
+        report["size_bytes"], report["load_ms"], report["single_row_ms"]
+    )
+    logger.info(
+        f"{name}: {size['before'] / 1e6:.2f} MB → "
+        f"{size['after'] / 1e6:.2f} MB, "
+        f"load {load['before']:.1f} → {load['after']:.1f} ms, "
+        f"1 row {latency['before']:.3f} → {latency['after']:.3f} ms"
+    )
+    return report
+
+
+# ================================================================
+# MAIN
+# ================================================================
+if __name__ == "__main__":
+    root = Path(__file__).parent.parent.parent
+    model_dir = root / "models"
+    compact_dir = model_dir / "compact"
+    matrix_dir = root / "data" / "processed" / "matrix"
+
+    params = yaml.safe_load(open(root / "params.yaml"))["Compact"]
+    segment, tolerance = params["segment"], params["mae_tolerance"]
+
+    cat_path = model_dir / "catboost_model.joblib"
+    lgb_path = model_dir / "lgbm_model.joblib"
+    cat_model = joblib.load(cat_path)
+    lgb_model = joblib.load(lgb_path)
+    lgb_booster = lgb_model.booster_
+
+    X_train, y_train = open_feature_matrix(
+        matrix_dir, "train", as_frame=False
+    )
+    X_test, y_test = open_feature_matrix(matrix_dir, "test", as_frame=False)
+
+    # Cut chosen on held-out training rows, never on the test matrix
+    X_fit, X_val, y_fit, y_val = train_test_split(
+        X_train, y_train,
+        test_size=params["validation_size"],
+        random_state=params["random_state"],
+    )
+    holdout = holdout_curves(
+        cat_model, lgb_model, X_fit, y_fit, X_val, y_val, segment
+    )
+
+    def test_mae(pred) -> float:
+        return float(np.abs(pred - y_test).mean())
+
+    # Test MAE of the served boosters at a tree count, reported only
+    truncated_test_mae = {
+        "CatBoost": lambda n: test_mae(cat_model.predict(X_test, ntree_end=n)),
+        "LightGBM": lambda n: test_mae(
+            lgb_booster.predict(X_test, num_iteration=n)
+        ),
+    }
+    n_trees = {
+        "CatBoost": cat_model.tree_count_,
+        "LightGBM": lgb_booster.num_trees(),
+    }
+
+    report, kept = {}, {}
+    for name, maes in holdout.items():
+        trees = checkpoints(n_trees[name], segment)
+        kept[name] = choose_tree_count(trees, maes, tolerance)
+        mae_kept = maes[trees.index(kept[name])]
+        report[name] = {
+            "trees": {"before": n_trees[name], "after": kept[name]},
+            "holdout_mae": {"before": maes[-1], "after": mae_kept},
+            "test_mae": {
+                "before": truncated_test_mae[name](n_trees[name]),
+                "after": truncated_test_mae[name](kept[name]),
+            },
+            "segments": segment_report(trees, maes),
+        }
+        test_before, test_after = report[name]["test_mae"].values()
+        logger.info(
+            f"{name}: keeping {kept[name]}/{n_trees[name]} trees "
+            f"(holdout MAE {maes[-1]:.4f} → {mae_kept:.4f}, "
+            f"tolerance {tolerance}; "
+            f"test MAE {test_before:.4f} → {test_after:.4f})"
+        )
+
+    export_compact(
+        cat_model, kept["CatBoost"], lgb_booster, kept["LightGBM"],
+        compact_dir,
+    )
+    logger.info(f"💾 Saved native compact models → {compact_dir}")
+
+    row = np.ascontiguousarray(X_test[:1])
+    repeats = params["latency_repeats"]
+    cat_file = str(compact_dir / CATBOOST_FILE)
+    lgb_file = str(compact_dir / LIGHTGBM_FILE)
+    report["CatBoost"].update(compare(
+        "CatBoost",
+        cat_path, lambda: joblib.load(cat_path),
+        compact_dir / CATBOOST_FILE,
+        lambda: CatBoostRegressor().load_model(cat_file),
+        row, repeats,
+    ))
+    report["LightGBM"].update(compare(
+        "LightGBM",
+        lgb_path, lambda: joblib.load(lgb_path),
+        compact_dir / LIGHTGBM_FILE,
+        lambda: lgb.Booster(model_file=lgb_file),
+        row, repeats,
+    ))
+
+    # What the API runs: the fused blend, full vs compact boosters
+    weights = read_ensemble_weights(
+        model_dir / "ensemble_weights.json", root / "params.yaml"
+    )
+    full = FusedEnsemble(
+        cat_model, lgb_booster, weights["cat"], weights["lgbm"]
+    )
+    compact = FusedEnsemble(
+        *load_compact(compact_dir), weights["cat"], weights["lgbm"]
+    )
+    full.predict(row)
+    compact.predict(row)
+    report["ensemble"] = {
+        "test_mae": {
+            "before": test_mae(full.predict(X_test)),
+            "after": test_mae(compact.predict(X_test)),
+        },
+        "single_row_ms": {
+            "before": median_seconds(lambda: full.predict(row), repeats) * 1e3,
+            "after": median_seconds(
+                lambda: compact.predict(row), repeats
+            ) * 1e3,
+        },
+    }
+    mae, latency = report["ensemble"].values()
+    logger.info(
+        f"Ensemble: test MAE {mae['before']:.4f} → {mae['after']:.4f}, "
+        f"1 row {latency['before']:.3f} → {latency['after']:.3f} ms"
+    )
+
+    report["params"] = params
+
+    with open(model_dir / "compaction_report.json", "w") as f:
+        json.dump(report, f, indent=2)
+    logger.info(
+        f"✅ Saved compaction report → {model_dir / 'compaction_report.json'}"
+    )
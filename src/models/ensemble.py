@@ -0,0 +1,128 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+import numpy as np
+
+# ================================================================
+# FUSED CATBOOST + LIGHTGBM ENSEMBLE
+# ----------------------------------------------------------------
+# The serving blend in one object, saved in the registered bundle:
+#   1. the input is converted once into a C-contiguous float32 array
+#      (the dtype the boosters were trained on: the feature matrix is
+#      float32, see src/features/feature_matrix.py)
+#   2. both boosters are called on that array through public APIs:
+#      lightgbm.Booster.predict (skipping the scikit-learn wrapper's
+#      validation) and CatBoost's predict with an explicit thread_count
+#   3. optionally the two calls run concurrently (both release the GIL)
+#   4. the weighted blend is written into one float64 buffer
+# Output equals w_cat * cat.predict(X) + w_lgb * lgb.predict(X) for
+# the same float32 X.
+# ================================================================
+
+_pool_lock = threading.Lock()
+
+
+class FusedEnsemble:
+    """
+    Weighted CatBoost + LightGBM regressor.
+
+    `cat_model` is a fitted CatBoostRegressor, `lgb_model` a fitted
+    LGBMRegressor (or its Booster). The scikit-learn models are kept
+    as attributes so callers can still reach each booster on its own.
+    """
+
+    def __init__(self, cat_model, lgb_model, w_cat: float, w_lgb: float,
+                 dtype=np.float32):
+        self.cat_model = cat_model
+        self.lgb_model = lgb_model
+        self.lgb_booster = getattr(lgb_model, "booster_", lgb_model)
+        self.w_cat = float(w_cat)
+        self.w_lgb = float(w_lgb)
+        self.dtype = np.dtype(dtype)
+        self.n_features_in_ = self.lgb_booster.num_feature()
+        self._executor = None
+
+    # Thread pool is per process and not part of the pickled bundle
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_executor"] = None
+        return state
+
+    @property
+    def weights(self) -> dict:
+        return {"catboost": self.w_cat, "lightgbm": self.w_lgb}
+
+    # ============================================================
+    # SINGLE BOOSTERS
+    # ============================================================
+    def predict_catboost(self, X: np.ndarray,
+                         n_threads: int = -1) -> np.ndarray:
+        return self.cat_model.predict(X, thread_count=n_threads)
+
+    def predict_lightgbm(self, X: np.ndarray,
+                         n_threads: int = -1) -> np.ndarray:
+        # num_threads <= 0: LightGBM's OpenMP default (all cores)
+        return self.lgb_booster.predict(X, num_threads=n_threads)
+
+    # ============================================================
+    # BLEND
+    # ============================================================
+    def as_input(self, X) -> np.ndarray:
+        """The one conversion: C-contiguous `dtype` array (copied if not)."""
+        X = np.ascontiguousarray(X, dtype=self.dtype)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"Expected (n_rows, {self.n_features_in_}) features, "
+                f"got {X.shape}"
+            )
+        return X
+
+    def predict(self, X, n_threads: int = -1, parallel: bool = False,
+                on_timing=None) -> np.ndarray:
+        """
+        Blended predictions for preprocessed rows `X`.
+
+        `parallel` runs CatBoost on a helper thread while LightGBM runs
+        on the caller's; worth it with spare cores (each booster still
+        uses up to `n_threads`). `on_timing(cat_seconds, lgb_seconds)`
+        receives the time spent in each booster.
+        """
+
+        X = self.as_input(X)
+
+        if parallel and len(X) > 0:
+            future = self._pool().submit(self._timed_catboost, X, n_threads)
+            start = perf_counter()
+            pred_lgb = self.predict_lightgbm(X, n_threads)
+            lgb_seconds = perf_counter() - start
+            pred_cat, cat_seconds = future.result()
+        else:
+            pred_cat, cat_seconds = self._timed_catboost(X, n_threads)
+            start = perf_counter()
+            pred_lgb = self.predict_lightgbm(X, n_threads)
+            lgb_seconds = perf_counter() - start
+
+        if on_timing is not None:
+            on_timing(cat_seconds, lgb_seconds)
+
+        # w_cat * cat + w_lgb * lgb, reusing the boosters' output buffers
+        out = np.multiply(pred_cat, self.w_cat, out=pred_cat)
+        out += np.multiply(pred_lgb, self.w_lgb, out=pred_lgb)
+        return out
+
+    def _timed_catboost(self, X: np.ndarray, n_threads: int):
+        start = perf_counter()
+        pred = self.predict_catboost(X, n_threads)
+        return pred, perf_counter() - start
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with _pool_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=os.cpu_count() or 1,
+                        thread_name_prefix="ensemble",
+                    )
+        return self._executor
@@ -1,8 +1,6 @@
-import pandas as pd
 import logging
-import joblib
-import yaml
 import numpy as np
+import sys
 from pathlib import Path
 from sklearn.metrics import (
     mean_absolute_error,
@@ -11,6 +9,11 @@ from sklearn.metrics import (
 )
 import matplotlib.pyplot as plt
 
+# Repo root on sys.path so `src.*` imports work when run by DVC
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from src.features.feature_matrix import open_feature_matrix
+from src.models.register import build_bundle
+
 # ================================================================
 # LOGGER
 # ================================================================
@@ -45,48 +48,33 @@ if __name__ == "__main__":
     root = Path(__file__).parent.parent.parent
 
     # Paths
-    train_path = root / "data" / "processed" / "train_trans.csv"
-    test_path = root / "data" / "processed" / "test_trans.csv"
+    matrix_dir = root / "data" / "processed" / "matrix"
     params_path = root / "params.yaml"
-    cat_path = root / "models" / "catboost_model.joblib"
-    lgb_path = root / "models" / "lgbm_model.joblib"
+    model_dir = root / "models"
 
     # Plot directory
     plot_dir = root / "plots"
     plot_dir.mkdir(parents=True, exist_ok=True)
 
-    # Load data
-    train_df = pd.read_csv(train_path)
-    test_df = pd.read_csv(test_path)
-
-    logger.info(f"Loaded TRAIN → {train_df.shape}")
-    logger.info(f"Loaded TEST  → {test_df.shape}")
-
-    X_train = train_df.drop(columns=[TARGET])
-    y_train = train_df[TARGET]
-
-    X_test  = test_df.drop(columns=[TARGET])
-    y_test  = test_df[TARGET]
-
-    # Load params
-    params = yaml.safe_load(open(params_path))
-    weights = params["Train"]["weights"]
-    w_cat = weights["cat"]
-    w_lgb = weights["lgbm"]
-
-    # Load models
-    cat = joblib.load(cat_path)
-    lgb = joblib.load(lgb_path)
-
-    # Predictions (train)
-    pred_train_cat = cat.predict(X_train)
-    pred_train_lgb = lgb.predict(X_train)
-    pred_train = (w_cat * pred_train_cat) + (w_lgb * pred_train_lgb)
-
-    # Predictions (test)
-    pred_test_cat = cat.predict(X_test)
-    pred_test_lgb = lgb.predict(X_test)
-    pred_test = (w_cat * pred_test_cat) + (w_lgb * pred_test_lgb)
+    # Load data (memory-mapped, shared with other stages)
+    X_train, y_train = open_feature_matrix(matrix_dir, "train")
+    X_test, y_test = open_feature_matrix(matrix_dir, "test")
+
+    logger.info(f"Loaded TRAIN → {X_train.shape}")
+    logger.info(f"Loaded TEST  → {X_test.shape}")
+
+    # The blend the API serves: compact boosters when present, with
+    # the find_weights stage's weights (else params.yaml)
+    bundle = build_bundle(model_dir, params_path)
+    ensemble = bundle["ensemble"]
+    logger.info(
+        f"Scoring {type(bundle['catboost']).__name__} + "
+        f"{type(bundle['lightgbm']).__name__}, weights {bundle['weights']}"
+    )
+
+    # Predictions
+    pred_train = ensemble.predict(X_train)
+    pred_test = ensemble.predict(X_test)
 
     # Compute metrics
     train_mae, train_rmse, train_r2 = compute_metrics(y_train, pred_train)
@@ -1,61 +1,227 @@
-import pandas as pd
+import json
+import logging
+import sys
+import time
 import numpy as np
-import joblib
+import yaml
+from itertools import combinations
 from pathlib import Path
-from sklearn.metrics import mean_absolute_error
-
-TARGET = "time_taken"
-
-def load_data(path: Path) -> pd.DataFrame:
-    return pd.read_csv(path)
-
-def make_X_y(df: pd.DataFrame, target_col: str):
-    X = df.drop(columns=[target_col])
-    y = df[target_col]
-    return X, y
 
+# Repo root on sys.path so `src.*` imports work when run by DVC
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from src.models.oof_predictions import load_oof
+
+# ================================================================
+# LOGGER SETUP
+# ================================================================
+logger = logging.getLogger("find_best_weights")
+logger.setLevel(logging.INFO)
+
+handler = logging.StreamHandler()
+handler.setLevel(logging.INFO)
+
+formatter = logging.Formatter(
+    fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+handler.setFormatter(formatter)
+logger.addHandler(handler)
+
+# Elements of the (rows × candidates) error block evaluated at once (~32 MB)
+CHUNK_ELEMENTS = 1 << 22
+
+
+# ================================================================
+# CANDIDATE WEIGHTS
+# ================================================================
+def simplex_grid(n_models: int, step: float) -> np.ndarray:
+    """
+    Every weight vector with components in multiples of `step`,
+    non-negative and summing to 1: (n_candidates, n_models), with
+    the first model's weight ascending as in the old 0.05 loop.
+    C(1/step + n_models - 1, n_models - 1) rows, so fine grids are
+    for 2-3 models; use the optimizer beyond that.
+    """
+
+    k = int(round(1 / step))
+    if not np.isclose(k * step, 1):
+        raise ValueError(f"grid_step must divide 1, got {step}")
+
+    # Stars and bars: n_models - 1 bar positions among k + n_models - 1 slots
+    slots = k + n_models - 1
+    bars = np.array(
+        list(combinations(range(slots), n_models - 1)), dtype=np.int64
+    )
+    edges = np.hstack([
+        np.full((len(bars), 1), -1), bars, np.full((len(bars), 1), slots)
+    ])
+    counts = np.diff(edges, axis=1) - 1
+    return counts / k
+
+
+# ================================================================
+# VECTORIZED SCORING
+# ================================================================
+def blend_mae(predictions: np.ndarray, y: np.ndarray,
+              candidates: np.ndarray) -> np.ndarray:
+    """
+    MAE of every candidate blend at once: the stacked per-model
+    predictions (n_rows, n_models) times candidates.T gives all
+    blended predictions; rows are processed in chunks so memory
+    stays bounded for millions of rows.
+    """
+
+    y = np.asarray(y, dtype=np.float64)
+    weights_t = np.ascontiguousarray(candidates.T)
+    totals = np.zeros(len(candidates))
+    rows = max(1, CHUNK_ELEMENTS // len(candidates))
+
+    for start in range(0, len(y), rows):
+        errors = predictions[start:start + rows] @ weights_t
+        errors -= y[start:start + rows, None]
+        np.abs(errors, out=errors)
+        totals += errors.sum(axis=0)
+
+    return totals / len(y)
+
+
+def refine_on_simplex(predictions: np.ndarray, y: np.ndarray, w0: np.ndarray):
+    """
+    SLSQP from `w0` with w >= 0, sum(w) = 1 (MAE subgradient). Returns
+    (weights, mae); `w0` is kept if the optimizer does not improve on it.
+    """
+    from scipy.optimize import minimize
+
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+
+    def objective(w):
+        residual = predictions @ w - y
+        return np.abs(residual).mean(), predictions.T @ np.sign(residual) / n
+
+    result = minimize(
+        objective, w0, jac=True, method="SLSQP",
+        bounds=[(0.0, 1.0)] * len(w0),
+        constraints=[{
+            "type": "eq",
+            "fun": lambda w: w.sum() - 1,
+            "jac": lambda w: np.ones_like(w),
+        }],
+    )
+
+    w = np.clip(result.x, 0, None)
+    w /= w.sum()
+    start_mae, mae = blend_mae(predictions, y, np.vstack([w0, w]))
+    return (w, mae) if mae < start_mae else (w0, start_mae)
+
+
+def search_weights(predictions: np.ndarray, y: np.ndarray,
+                   method: str = "grid", grid_step: float = 0.01) -> dict:
+    """
+    Best blend weights by MAE. "grid" scores the whole simplex grid
+    in one pass; "slsqp" refines the best grid point (coarser grid for
+    many models) with a constrained optimizer.
+    """
+
+    n_models = predictions.shape[1]
+    if method not in ("grid", "slsqp"):
+        raise ValueError(f"Unknown weight search method: {method}")
+    if method == "slsqp" and n_models > 3:
+        # Starting point only; keep the grid small
+        grid_step = max(grid_step, 0.1)
+
+    candidates = simplex_grid(n_models, grid_step)
+    maes = blend_mae(predictions, y, candidates)
+    best = int(np.argmin(maes))
+    weights, mae = candidates[best], float(maes[best])
+
+    if method == "slsqp":
+        weights, mae = refine_on_simplex(predictions, y, weights)
+
+    return {
+        "weights": weights,
+        "mae": float(mae),
+        "n_candidates": len(candidates),
+    }
+
+
+# ================================================================
+# WEIGHTS FILE (read by register.py and evaluation.py)
+# ================================================================
+def save_weights(path: Path, names: list, result: dict, **info):
+    report = {
+        "weights": {
+            name: round(float(w), 10)
+            for name, w in zip(names, result["weights"])
+        },
+        "oof_mae": result["mae"],
+        **info,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def read_ensemble_weights(weights_path: Path, params_path: Path) -> dict:
+    """
+    {"cat": w, "lgbm": w} from the find_weights stage output, falling
+    back to Train.weights in params.yaml until that stage has run.
+    """
+
+    weights_path = Path(weights_path)
+    if weights_path.exists():
+        with open(weights_path) as f:
+            return json.load(f)["weights"]
+
+    params = yaml.safe_load(open(params_path))
+    return dict(params["Train"]["weights"])
+
+
+# ================================================================
+# MAIN
+# ================================================================
 if __name__ == "__main__":
 
     root = Path(__file__).parent.parent.parent
+    oof_path = root / "data" / "processed" / "oof_predictions.npz"
+    weights_path = root / "models" / "ensemble_weights.json"
 
-    # Load processed test data
-    test_path = root / "data" / "processed" / "test_trans.csv"
-    df_test = load_data(test_path)
-
-    X_test, y_test = make_X_y(df_test, TARGET)
+    params = yaml.safe_load(open(root / "params.yaml"))["Ensemble"]
 
-    # Load models
-    model_dir = root / "models"
-    cat = joblib.load(model_dir / "catboost_model.joblib")
-    lgb = joblib.load(model_dir / "lgbm_model.joblib")
-
-    # Get predictions
-    pred_cat = cat.predict(X_test)
-    pred_lgb = lgb.predict(X_test)
+    names, predictions, y = load_oof(oof_path)
+    logger.info(
+        f"Loaded out-of-fold predictions → {predictions.shape} "
+        f"({', '.join(names)})"
+    )
 
     print("\n🔎 Searching for best weights...")
     print("------------------------------------")
 
-    best_w_cat = None
-    best_w_lgb = None
-    best_mae = float("inf")
-
-    # Try weights from 0.0 to 1.0 (step = 0.05)
-    for w_cat in np.arange(0, 1.05, 0.05):
-        w_lgb = 1 - w_cat
-
-        blended_pred = (w_cat * pred_cat) + (w_lgb * pred_lgb)
-        mae = mean_absolute_error(y_test, blended_pred)
-
-        print(f"w_cat = {w_cat:.2f}, w_lgb = {w_lgb:.2f} → MAE = {mae:.4f}")
+    start = time.perf_counter()
+    result = search_weights(
+        predictions, y, params["method"], params["grid_step"]
+    )
+    elapsed = time.perf_counter() - start
 
-        if mae < best_mae:
-            best_mae = mae
-            best_w_cat = w_cat
-            best_w_lgb = w_lgb
+    single = blend_mae(predictions, y, np.eye(len(names)))
 
     print("\n🎯 BEST WEIGHTS FOUND")
     print("------------------------------------")
-    print(f"Best w_cat  = {best_w_cat:.3f}")
-    print(f"Best w_lgb  = {best_w_lgb:.3f}")
-    print(f"Best MAE    = {best_mae:.4f}")
+    for name, w, mae in zip(names, result["weights"], single):
+        print(f"w_{name:<5} = {w:.4f}   (alone: MAE = {mae:.4f})")
+    print(f"Best MAE   = {result['mae']:.4f}  (out-of-fold, {len(y):,} rows)")
+    print(
+        f"Searched {result['n_candidates']:,} candidates "
+        f"({params['method']}) in {elapsed:.2f}s\n"
+    )
+
+    save_weights(
+        weights_path, names, result,
+        single_model_oof_mae={
+            name: float(mae) for name, mae in zip(names, single)
+        },
+        method=params["method"],
+        grid_step=params["grid_step"],
+        n_candidates=result["n_candidates"],
+        n_rows=int(len(y)),
+    )
+    logger.info(f"✅ Saved ensemble weights → {weights_path}")
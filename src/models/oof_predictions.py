@@ -0,0 +1,122 @@
+import json
+import logging
+import sys
+import time
+import numpy as np
+import yaml
+from pathlib import Path
+from sklearn.model_selection import KFold
+
+# Repo root on sys.path so `src.*` imports work when run by DVC
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from src.features.feature_matrix import open_feature_matrix
+from src.models.train_model import fit_booster, thread_counts
+
+# ================================================================
+# LOGGER SETUP
+# ================================================================
+logger = logging.getLogger("oof_predictions")
+logger.setLevel(logging.INFO)
+
+handler = logging.StreamHandler()
+handler.setLevel(logging.INFO)
+
+formatter = logging.Formatter(
+    fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+handler.setFormatter(formatter)
+logger.addHandler(handler)
+
+# ================================================================
+# ENSEMBLE MEMBERS
+# ----------------------------------------------------------------
+# Weight key (as in the bundle's "weights") → its section under
+# Train in params.yaml. Order = column order of the out-of-fold
+# prediction matrix.
+# ================================================================
+MODELS = {
+    "cat": "CatBoost",
+    "lgbm": "LightGBM",
+}
+
+
+# ================================================================
+# OUT-OF-FOLD PREDICTIONS
+# ================================================================
+def out_of_fold_predictions(X, y, train_params: dict, n_folds: int,
+                            random_state: int):
+    """
+    (n_rows, n_models) predictions where every row is scored by
+    models that never saw it: K-fold over the training matrix, each
+    member fit per fold exactly as train_model.py fits the served
+    one (early stopping, refit, thread budget).
+    """
+
+    names = list(MODELS)
+    oof = np.empty((len(y), len(names)), dtype=np.float64)
+    folds = KFold(n_splits=n_folds, shuffle=True, random_state=random_state)
+
+    # One booster at a time, as in train_model.py's sequential mode
+    n_threads = thread_counts({**train_params["threads"], "parallel": False})
+
+    for fold, (fit_idx, val_idx) in enumerate(folds.split(X), start=1):
+        for j, (name, section) in enumerate(MODELS.items()):
+            start = time.perf_counter()
+            model, _ = fit_booster(
+                section, X.iloc[fit_idx], y.iloc[fit_idx],
+                train_params, n_threads[section],
+            )
+            oof[val_idx, j] = model.predict(X.iloc[val_idx])
+            elapsed = time.perf_counter() - start
+            logger.info(
+                f"Fold {fold}/{n_folds} {name}: "
+                f"fit + predict in {elapsed:.1f}s"
+            )
+
+    return names, oof
+
+
+def save_oof(path: Path, names: list, oof: np.ndarray, y: np.ndarray,
+             n_folds: int):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez(
+        path, predictions=oof, target=np.asarray(y), models=np.array(names)
+    )
+
+    meta = {"models": names, "n_rows": int(len(y)), "n_folds": n_folds}
+    with open(path.with_suffix(".json"), "w") as f:
+        json.dump(meta, f, indent=2)
+
+    logger.info(f"💾 Saved out-of-fold predictions → {path} {oof.shape}")
+
+
+def load_oof(path: Path):
+    """(model names, (n_rows, n_models) predictions, target) of save_oof."""
+    with np.load(path, allow_pickle=False) as data:
+        return data["models"].tolist(), data["predictions"], data["target"]
+
+
+# ================================================================
+# MAIN
+# ================================================================
+if __name__ == "__main__":
+    root = Path(__file__).parent.parent.parent
+    matrix_dir = root / "data" / "processed" / "matrix"
+    params_path = root / "params.yaml"
+    output_path = root / "data" / "processed" / "oof_predictions.npz"
+
+    params = yaml.safe_load(open(params_path))
+    n_folds = params["Ensemble"]["n_folds"]
+
+    X_train, y_train = open_feature_matrix(matrix_dir, "train")
+
+    names, oof = out_of_fold_predictions(
+        X_train, y_train, params["Train"], n_folds,
+        params["Ensemble"]["random_state"],
+    )
+
+    for j, name in enumerate(names):
+        mae = np.abs(oof[:, j] - y_train.to_numpy()).mean()
+        logger.info(f"Out-of-fold MAE {name}: {mae:.4f}")
+
+    save_oof(output_path, names, oof, y_train.to_numpy(), n_folds)
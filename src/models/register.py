@@ -3,10 +3,21 @@ import mlflow.sklearn
 import os
 import joblib
 import logging
-import yaml
+import sys
 from pathlib import Path
 from dotenv import load_dotenv
 
+# Repo root on sys.path so pickled `src.*` objects can be loaded
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from src.models.ensemble import FusedEnsemble
+from src.models.find_best_weights import read_ensemble_weights
+from src.models.compact_models import (
+    CATBOOST_FILE,
+    LIGHTGBM_FILE,
+    load_compact,
+    native_models,
+)
+
 # ============================================================
 # LOGGER
 # ============================================================
@@ -19,36 +30,112 @@ handler.setFormatter(logging.Formatter(
 logger.addHandler(handler)
 
 # ============================================================
-# LOAD ENV (.env)
+# ENSEMBLE BUNDLE (what the API serves)
 # ============================================================
-load_dotenv()
-tracking_uri = os.getenv("MLFLOW_TRACKING_URI")
+def has_compact(compact_dir: Path) -> bool:
+    """Whether the compact stage wrote both native model files."""
+    compact_dir = Path(compact_dir)
+    return ((compact_dir / CATBOOST_FILE).exists()
+            and (compact_dir / LIGHTGBM_FILE).exists())
+
+
+def build_bundle(model_dir: Path, params_path: Path) -> dict:
+    """
+    Preprocessor(s) + boosters + blend weights from the trained
+    artifacts. Weights come from the find_weights stage
+    (models/ensemble_weights.json), else params.yaml. Boosters are
+    the compact stage's native models (models/compact) when present,
+    else the full training pickles.
+    """
+
+    model_dir = Path(model_dir)
+
+    weights = read_ensemble_weights(
+        model_dir / "ensemble_weights.json", params_path
+    )
+
+    compact_dir = model_dir / "compact"
+    if has_compact(compact_dir):
+        cat_model, lgb_model = load_compact(compact_dir)
+    else:
+        cat_model = joblib.load(model_dir / "catboost_model.joblib")
+        lgb_model = joblib.load(model_dir / "lgbm_model.joblib")
+
+    bundle = {
+        "preprocessor": joblib.load(model_dir / "preprocessor.joblib"),
+        "catboost": cat_model,
+        "lightgbm": lgb_model,
+        "weights": {
+            "cat": weights["cat"],
+            "lgbm": weights["lgbm"],
+        }
+    }
+
+    # Fused blend the API calls (shares the booster objects above)
+    bundle["ensemble"] = FusedEnsemble(
+        bundle["catboost"],
+        bundle["lightgbm"],
+        bundle["weights"]["cat"],
+        bundle["weights"]["lgbm"],
+    )
+
+    # Optional lookup-table preprocessor used by the API when present
+    compiled_path = model_dir / "compiled_preprocessor.joblib"
+    if compiled_path.exists():
+        bundle["compiled_preprocessor"] = joblib.load(compiled_path)
+
+    return bundle
+
+
+def registered_bundle(bundle: dict, compact_dir: Path) -> dict:
+    """
+    What gets registered. With the compact stage's output the
+    boosters travel as their native files (.cbm bytes, LightGBM model
+    text) instead of pickled objects; ServingModel rebuilds them with
+    boosters_from_native(). Otherwise the bundle as built.
+    """
+
+    if not has_compact(compact_dir):
+        return bundle
 
-if tracking_uri is None:
-    raise ValueError("❌ MLFLOW_TRACKING_URI not found in .env")
+    package = {
+        key: value for key, value in bundle.items()
+        if key not in ("catboost", "lightgbm", "ensemble")
+    }
+    package["native_models"] = native_models(compact_dir)
+    return package
 
-logger.info(f"🚀 Using MLflow Tracking URI: {tracking_uri}")
-mlflow.set_tracking_uri(tracking_uri)
 
 # ============================================================
 # MAIN
 # ============================================================
 if __name__ == "__main__":
 
+    # MLflow tracking URI from .env
+    load_dotenv()
+    tracking_uri = os.getenv("MLFLOW_TRACKING_URI")
+
+    if tracking_uri is None:
+        raise ValueError("❌ MLFLOW_TRACKING_URI not found in .env")
+
+    logger.info(f"🚀 Using MLflow Tracking URI: {tracking_uri}")
+    mlflow.set_tracking_uri(tracking_uri)
+
     root = Path(__file__).parent.parent.parent
     model_dir = root / "models"
 
-    # Paths
-    cat_path = model_dir / "catboost_model.joblib"
-    lgb_path = model_dir / "lgbm_model.joblib"
+    # Paths (native compact boosters when the compact stage has run)
+    compact_dir = model_dir / "compact"
+    cat_path = compact_dir / CATBOOST_FILE
+    lgb_path = compact_dir / LIGHTGBM_FILE
+    if not (cat_path.exists() and lgb_path.exists()):
+        cat_path = model_dir / "catboost_model.joblib"
+        lgb_path = model_dir / "lgbm_model.joblib"
+    compaction_report = model_dir / "compaction_report.json"
     preprocess_path = model_dir / "preprocessor.joblib"
+    compiled_path = model_dir / "compiled_preprocessor.joblib"
     params_path = root / "params.yaml"
 
-    # Load params (weights included)
-    params = yaml.safe_load(open(params_path))
-    w_cat = params["Train"]["weights"]["cat"]
-    w_lgb = params["Train"]["weights"]["lgbm"]
-
     # Experiment
     experiment_name = "Model Registration FOR TIME ESTIMATION"
     mlflow.set_experiment(experiment_name)
@@ -59,13 +146,19 @@ if __name__ == "__main__":
         logger.info(f"📌 Started MLflow Run: {run_id}")
 
         # ---------------------------------------------
-        # Load artifacts
+        # Load artifacts (weights from the find_weights stage)
         # ---------------------------------------------
-        cat_model = joblib.load(cat_path)
-        lgbm_model = joblib.load(lgb_path)
-        preprocessor = joblib.load(preprocess_path)
-
-        logger.info("Loaded CatBoost, LightGBM & Preprocessor successfully.")
+        combined_package = build_bundle(model_dir, params_path)
+        w_cat = combined_package["weights"]["cat"]
+        w_lgb = combined_package["weights"]["lgbm"]
+        compiled_preprocessor = combined_package.get("compiled_preprocessor")
+
+        logger.info(
+            f"Loaded CatBoost ({cat_path.name}), LightGBM "
+            f"({lgb_path.name}) & Preprocessor successfully."
+        )
+        if compiled_preprocessor is not None:
+            logger.info("Loaded compiled preprocessor.")
 
         # ---------------------------------------------
         # Log raw artifacts
@@ -73,6 +166,10 @@ if __name__ == "__main__":
         mlflow.log_artifact(cat_path, artifact_path="models")
         mlflow.log_artifact(lgb_path, artifact_path="models")
         mlflow.log_artifact(preprocess_path, artifact_path="preprocessor")
+        if compiled_preprocessor is not None:
+            mlflow.log_artifact(compiled_path, artifact_path="preprocessor")
+        if compaction_report.exists():
+            mlflow.log_artifact(compaction_report, artifact_path="models")
 
         # ---------------------------------------------
         # Log ensemble weights
@@ -83,20 +180,11 @@ if __name__ == "__main__":
         # ---------------------------------------------
         # Save combined ensemble pipeline
         # ---------------------------------------------
-        combined_package = {
-            "preprocessor": preprocessor,
-            "catboost": cat_model,
-            "lightgbm": lgbm_model,
-            "weights": {
-                "cat": w_cat,
-                "lgbm": w_lgb,
-            }
-        }
-
         logger.info("Packaging preprocessor + models + weights...")
 
+        # Native booster files when the compact stage has run
         mlflow.sklearn.log_model(
-            sk_model=combined_package,
+            sk_model=registered_bundle(combined_package, compact_dir),
             artifact_path="full_pipeline",
             registered_model_name="Swiggy-Ensemble-Model"
         )
@@ -0,0 +1,503 @@
+import argparse
+import logging
+import os
+import sqlite3
+import sys
+import time
+import warnings
+import numpy as np
+import yaml
+import optuna
+import lightgbm as lgb
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from catboost import CatBoostRegressor
+from sklearn.model_selection import KFold
+
+# Repo root on sys.path so `src.*` imports work when run by DVC
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from src.features.feature_matrix import open_feature_matrix
+
+# ================================================================
+# LOGGER SETUP
+# ================================================================
+logger = logging.getLogger("tune")
+logger.setLevel(logging.INFO)
+
+handler = logging.StreamHandler()
+handler.setLevel(logging.INFO)
+
+formatter = logging.Formatter(
+    fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+handler.setFormatter(formatter)
+logger.addHandler(handler)
+
+# ================================================================
+# HYPERPARAMETER TUNING (CatBoost + LightGBM)
+# ----------------------------------------------------------------
+# One Optuna study per booster in a local SQLite file (Tune.storage):
+#   - resumable: rerunning continues the same study until it holds
+#     Tune.n_trials finished (complete + pruned) trials; trials lost
+#     to a killed process are failed by the heartbeat and replaced
+#   - parallel: Tune.n_workers processes share the study, each
+#     booster limited to its share of the cores
+#   - cheap trials: every fold trains up to Tune.max_trees with early
+#     stopping on its held-out part, so the tree count is found rather
+#     than searched, and the validation MAE reported every
+#     Tune.report_every iterations lets the median pruner stop trials
+#     that trail earlier ones at the same fold and iteration (past
+#     the fold's first Tune.warmup_iterations)
+# Best params (tree count = mean best iteration over the folds) are
+# written into the booster's Train section of params.yaml.
+# ================================================================
+
+# Intermediate-value step = fold * STEP_STRIDE + iteration, so a fold's
+# curve is only compared with the same fold of other trials
+STEP_STRIDE = 100_000
+
+
+def suggest_lightgbm(trial) -> dict:
+    return {
+        "learning_rate": trial.suggest_float(
+            "learning_rate", 0.005, 0.1, log=True
+        ),
+        "num_leaves": trial.suggest_int("num_leaves", 20, 200),
+        "max_depth": trial.suggest_int("max_depth", 5, 20),
+        "subsample": trial.suggest_float("subsample", 0.5, 1.0),
+        "colsample_bytree": trial.suggest_float("colsample_bytree", 0.5, 1.0),
+        "min_child_samples": trial.suggest_int("min_child_samples", 10, 100),
+        "reg_alpha": trial.suggest_float("reg_alpha", 0.0, 2.0),
+        "reg_lambda": trial.suggest_float("reg_lambda", 0.0, 2.0),
+    }
+
+
+def suggest_catboost(trial) -> dict:
+    return {
+        "depth": trial.suggest_int("depth", 4, 10),
+        "learning_rate": trial.suggest_float(
+            "learning_rate", 0.005, 0.1, log=True
+        ),
+        "l2_leaf_reg": trial.suggest_float(
+            "l2_leaf_reg", 0.01, 10.0, log=True
+        ),
+    }
+
+
+# Booster → (section under Train in params.yaml, tree-count key, search space)
+BOOSTERS = {
+    "lgbm": ("LightGBM", "n_estimators", suggest_lightgbm),
+    "cat": ("CatBoost", "iterations", suggest_catboost),
+}
+
+
+# ================================================================
+# PRUNING (intermediate validation MAE)
+# ================================================================
+class IntermediateReporter:
+    """
+    Reports a fold's validation MAE to the trial every `every`
+    iterations and stops training once the pruner says so, but never
+    in the fold's first `warmup` iterations. Works as a LightGBM
+    callback (called with the CallbackEnv) and as a CatBoost callback
+    (after_iteration).
+    """
+
+    def __init__(self, trial, fold: int, every: int, warmup: int = 0):
+        self.trial = trial
+        self.offset = fold * STEP_STRIDE
+        self.every = every
+        self.warmup = warmup
+        self.pruned = False
+
+    def _report(self, iteration: int, mae: float) -> bool:
+        """True to keep training."""
+        if iteration % self.every:
+            return True
+        self.trial.report(mae, self.offset + iteration)
+        # Per fold: the pruner's own n_warmup_steps counts raw steps,
+        # which would only cover fold 0
+        if iteration < self.warmup:
+            return True
+        self.pruned = self.trial.should_prune()
+        return not self.pruned
+
+    # LightGBM: env.iteration is 0-based; metric is l1 only
+    def __call__(self, env):
+        mae = env.evaluation_result_list[0][2]
+        if not self._report(env.iteration + 1, mae):
+            raise optuna.TrialPruned(
+                f"pruned at fold {self.offset // STEP_STRIDE}, "
+                f"iteration {env.iteration + 1}"
+            )
+
+    # CatBoost: info.iteration is 1-based; returning False stops fitting
+    def after_iteration(self, info) -> bool:
+        mae = info.metrics["validation"]["MAE"][-1]
+        return self._report(info.iteration, mae)
+
+    def raise_if_pruned(self):
+        if self.pruned:
+            raise optuna.TrialPruned(
+                f"pruned at fold {self.offset // STEP_STRIDE}"
+            )
+
+
+# ================================================================
+# ONE FOLD PER BOOSTER
+# ----------------------------------------------------------------
+# Each returns (validation MAE at the best iteration, best number of
+# trees). LightGBM goes through lgb.train, which takes the
+# scikit-learn parameter names in params.yaml as aliases.
+# ================================================================
+def fit_lightgbm_fold(params: dict, fold_data, tune: dict, n_threads: int,
+                      reporter):
+    X_fit, y_fit, X_val, y_val = fold_data
+    params = {
+        **params, "metric": "l1", "num_threads": n_threads, "verbose": -1
+    }
+    params.pop("n_estimators", None)
+    params.pop("n_jobs", None)
+
+    booster = lgb.train(
+        params,
+        lgb.Dataset(X_fit, y_fit),
+        num_boost_round=tune["max_trees"],
+        valid_sets=[lgb.Dataset(X_val, y_val)],
+        callbacks=[
+            lgb.early_stopping(tune["early_stopping_rounds"], verbose=False),
+            reporter,
+        ],
+    )
+
+    pred = booster.predict(
+        X_val, num_iteration=booster.best_iteration, num_threads=n_threads
+    )
+    return float(np.abs(pred - y_val).mean()), booster.best_iteration
+
+
+def fit_catboost_fold(params: dict, fold_data, tune: dict, n_threads: int,
+                      reporter):
+    X_fit, y_fit, X_val, y_val = fold_data
+    params = {
+        **params,
+        "iterations": tune["max_trees"],
+        "eval_metric": "MAE",
+        "thread_count": n_threads,
+        "allow_writing_files": False,
+        "verbose": False,
+    }
+
+    model = CatBoostRegressor(**params)
+    model.fit(
+        X_fit, y_fit,
+        eval_set=(X_val, y_val),
+        early_stopping_rounds=tune["early_stopping_rounds"],
+        callbacks=[reporter],
+    )
+    reporter.raise_if_pruned()
+
+    # use_best_model: predictions come from the best iteration
+    pred = model.predict(X_val)
+    return float(np.abs(pred - y_val).mean()), model.get_best_iteration() + 1
+
+
+FIT_FOLD = {"lgbm": fit_lightgbm_fold, "cat": fit_catboost_fold}
+
+
+# ================================================================
+# OBJECTIVE
+# ================================================================
+def make_folds(X: np.ndarray, y: np.ndarray, n_folds: int,
+               random_state: int) -> list:
+    """Same K-fold split for every trial, materialized once per worker."""
+    splitter = KFold(
+        n_splits=n_folds, shuffle=True, random_state=random_state
+    )
+    return [
+        (X[fit_idx], y[fit_idx], X[val_idx], y[val_idx])
+        for fit_idx, val_idx in splitter.split(X)
+    ]
+
+
+def objective(trial, booster: str, base_params: dict, folds: list,
+              tune: dict, n_threads: int) -> float:
+    """Mean K-fold validation MAE of one sampled configuration."""
+
+    _, trees_key, suggest = BOOSTERS[booster]
+    params = {**base_params, **suggest(trial)}
+
+    start = time.perf_counter()
+    maes, best_iterations = [], []
+
+    for fold, fold_data in enumerate(folds):
+        reporter = IntermediateReporter(
+            trial, fold, tune["report_every"], tune["warmup_iterations"]
+        )
+        mae, best_iteration = FIT_FOLD[booster](
+            params, fold_data, tune, n_threads, reporter
+        )
+        maes.append(mae)
+        best_iterations.append(int(best_iteration))
+
+    trial.set_user_attr(trees_key, int(round(np.mean(best_iterations))))
+    trial.set_user_attr("fold_mae", maes)
+    trial.set_user_attr("seconds", time.perf_counter() - start)
+    return float(np.mean(maes))
+
+
+# ================================================================
+# STUDY (SQLite storage, shared by the worker processes)
+# ================================================================
+def open_storage(path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # WAL journal (persistent in the file): a commit no longer rewrites
+    # a rollback journal (~75 ms -> <1 ms here; every report and trial
+    # update is one), and readers in other workers don't block writers
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.close()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", optuna.exceptions.ExperimentalWarning)
+        return optuna.storages.RDBStorage(
+            url=f"sqlite:///{path}",
+            # Concurrent writers wait for SQLite's file lock instead of failing
+            engine_kwargs={"connect_args": {"timeout": 60}},
+            # Trials of a killed process are marked failed and not counted
+            heartbeat_interval=60,
+            grace_period=180,
+        )
+
+
+def study_name(booster: str, tune: dict) -> str:
+    # Trials are only comparable on the same folds
+    return f"{booster}-{tune['n_folds']}fold-seed{tune['random_state']}"
+
+
+def load_study(booster: str, tune: dict, storage_path: Path):
+    return optuna.create_study(
+        study_name=study_name(booster, tune),
+        storage=open_storage(storage_path),
+        direction="minimize",
+        # Warmup is applied per fold by IntermediateReporter
+        pruner=optuna.pruners.MedianPruner(
+            n_startup_trials=tune["startup_trials"]
+        ),
+        load_if_exists=True,
+    )
+
+
+# Trials that count towards Tune.n_trials
+FINISHED = (optuna.trial.TrialState.COMPLETE, optuna.trial.TrialState.PRUNED)
+
+
+def finished_trials(study) -> int:
+    return len(study.get_trials(deepcopy=False, states=FINISHED))
+
+
+def run_worker(booster: str, matrix_dir: Path, base_params: dict, tune: dict,
+               storage_path: Path, n_threads: int):
+    """One tuning process: trials until Tune.n_trials are finished."""
+
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    X, y = open_feature_matrix(matrix_dir, "train", as_frame=False)
+    folds = make_folds(X, y, tune["n_folds"], tune["random_state"])
+
+    study = load_study(booster, tune, storage_path)
+    study.optimize(
+        lambda trial: objective(
+            trial, booster, base_params, folds, tune, n_threads
+        ),
+        callbacks=[
+            optuna.study.MaxTrialsCallback(tune["n_trials"], states=FINISHED)
+        ],
+    )
+
+
+def tune_booster(booster: str, matrix_dir: Path, base_params: dict, tune: dict,
+                 storage_path: Path, n_workers: int):
+    """Runs (or resumes) the booster's study with `n_workers` processes."""
+
+    study = load_study(booster, tune, storage_path)
+    done = finished_trials(study)
+    if done >= tune["n_trials"]:
+        logger.info(
+            f"{booster}: study already holds {done} finished trials, "
+            "nothing to run"
+        )
+        return study
+
+    n_threads = max(1, (os.cpu_count() or 1) // n_workers)
+    logger.info(
+        f"🔧 Tuning {booster}: {tune['n_trials'] - done} trials to go "
+        f"({done} already in {storage_path.name}), "
+        f"{n_workers} processes × {n_threads} threads"
+    )
+
+    args = (booster, matrix_dir, base_params, tune, storage_path, n_threads)
+    if n_workers == 1:
+        run_worker(*args)
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            futures = [
+                pool.submit(run_worker, *args) for _ in range(n_workers)
+            ]
+            for future in futures:
+                future.result()
+
+    return load_study(booster, tune, storage_path)
+
+
+def summarize(study) -> dict:
+    trials = study.get_trials(deepcopy=False)
+    states = optuna.trial.TrialState
+    complete = [t for t in trials if t.state == states.COMPLETE]
+    pruned = [t for t in trials if t.state == states.PRUNED]
+    seconds = [t.user_attrs["seconds"] for t in complete]
+    return {
+        "complete": len(complete),
+        "pruned": len(pruned),
+        "mean_trial_seconds": float(np.mean(seconds)) if complete else 0.0,
+        "best_mae": study.best_value,
+    }
+
+
+# ================================================================
+# PARAMS.YAML
+# ----------------------------------------------------------------
+# Rewrites only the tuned keys in Train.<section>, in place, so the
+# file's comments and key order survive (yaml.safe_dump drops them).
+# ================================================================
+def _yaml_scalar(value) -> str:
+    if isinstance(value, (bool, np.bool_)):
+        return str(bool(value))
+    if isinstance(value, (int, np.integer)):
+        return str(int(value))
+    if isinstance(value, (float, np.floating)):
+        return repr(float(value))
+    return f'"{value}"'
+
+
+def update_train_section(params_path: Path, section: str, values: dict):
+    lines = Path(params_path).read_text().splitlines(keepends=True)
+
+    def indent(line):
+        return len(line) - len(line.lstrip(" "))
+
+    train = next(
+        i for i, line in enumerate(lines) if line.rstrip() == "Train:"
+    )
+    header = next(
+        i for i in range(train + 1, len(lines))
+        if lines[i].strip() == f"{section}:"
+    )
+    key_indent = indent(lines[header + 1])
+
+    remaining = dict(values)
+    last_key = header
+    for i in range(header + 1, len(lines)):
+        stripped = lines[i].strip()
+        if stripped and indent(lines[i]) < key_indent:
+            break
+        if not stripped or stripped.startswith("#"):
+            continue
+        last_key = i
+        key, _, rest = stripped.partition(":")
+        if key in remaining:
+            comment = rest[rest.index("#"):] if "#" in rest else ""
+            value = _yaml_scalar(remaining.pop(key))
+            new = f"{' ' * key_indent}{key}: {value}"
+            lines[i] = (f"{new}  {comment}" if comment else new) + "\n"
+
+    new_keys = [
+        f"{' ' * key_indent}{key}: {_yaml_scalar(v)}\n"
+        for key, v in remaining.items()
+    ]
+    lines[last_key + 1:last_key + 1] = new_keys
+
+    text = "".join(lines)
+    written = yaml.safe_load(text)["Train"][section]
+    mismatched = [k for k, v in values.items() if written.get(k) != v]
+    if mismatched:
+        raise ValueError(
+            f"Could not update Train.{section} keys {mismatched} "
+            f"in {params_path}"
+        )
+    Path(params_path).write_text(text)
+
+
+# ================================================================
+# MAIN
+# ================================================================
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(
+        description="Tune CatBoost and LightGBM hyperparameters"
+    )
+    parser.add_argument(
+        "--boosters", nargs="+", choices=list(BOOSTERS),
+        help="default: Tune.boosters",
+    )
+    parser.add_argument(
+        "--n-trials", type=int,
+        help="finished trials per study (default: Tune.n_trials)",
+    )
+    parser.add_argument(
+        "--n-workers", type=int,
+        help="processes per study (default: Tune.n_workers)",
+    )
+    parser.add_argument(
+        "--no-write", action="store_true",
+        help="report best params, leave params.yaml alone",
+    )
+    args = parser.parse_args()
+
+    root = Path(__file__).parent.parent.parent
+    matrix_dir = root / "data" / "processed" / "matrix"
+    params_path = root / "params.yaml"
+
+    params = yaml.safe_load(open(params_path))
+    tune = dict(params["Tune"])
+    if args.n_trials:
+        tune["n_trials"] = args.n_trials
+
+    n_workers = args.n_workers or tune["n_workers"]
+    n_workers = n_workers if n_workers > 0 else os.cpu_count()
+    storage_path = root / tune["storage"]
+
+    for booster in args.boosters or tune["boosters"]:
+        section, trees_key, _ = BOOSTERS[booster]
+
+        start = time.perf_counter()
+        study = tune_booster(
+            booster, matrix_dir, params["Train"][section], tune,
+            storage_path, n_workers,
+        )
+        elapsed = time.perf_counter() - start
+
+        summary = summarize(study)
+        best = {
+            **study.best_params,
+            trees_key: study.best_trial.user_attrs[trees_key],
+        }
+
+        print(f"\n🎯 BEST {section.upper()} PARAMS FOUND")
+        print("------------------------------------")
+        for key, value in best.items():
+            print(f"{key:<18} = {value}")
+        print(f"CV MAE             = {summary['best_mae']:.5f}")
+        print(
+            f"Trials: {summary['complete']} complete, "
+            f"{summary['pruned']} pruned, "
+            f"{summary['mean_trial_seconds']:.1f}s per complete trial; "
+            f"this run {elapsed:.1f}s\n"
+        )
+
+        if not args.no_write:
+            update_train_section(params_path, section, best)
+            logger.info(
+                f"✅ Wrote best {section} params → {params_path} "
+                f"(Train.{section})"
+            )
@@ -0,0 +1,95 @@
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import pytest
+from fastapi.testclient import TestClient
+
+# App import loads the latest model bundle from MLflow (.env)
+from app import app
+
+# -----------------------------------------------------------
+# Path to raw dataset
+# -----------------------------------------------------------
+ROOT = Path(__file__).parent.parent
+DATA_PATH = ROOT / "data" / "raw" / "swiggy.csv"
+
+NUMERIC_COLS = [
+    "Delivery_person_Age", "Delivery_person_Ratings", "multiple_deliveries"
+]
+
+client = TestClient(app)
+
+
+def build_payload(sample):
+    """Raw CSV row → /predict JSON payload (same as scripts/test_api.py)."""
+    payload = {
+        k: (v.item() if hasattr(v, "item") else v)
+        for k, v in sample.items()
+        if k != "Time_taken(min)"
+    }
+    for col in NUMERIC_COLS:
+        payload[col] = float(str(payload[col]).strip())
+    return payload
+
+
+# -----------------------------------------------------------
+# Valid payloads + one row that cleaning must reject
+# -----------------------------------------------------------
+df = pd.read_csv(DATA_PATH)
+df = df[~df.isin(["NaN "]).any(axis=1)].sample(64, random_state=7)
+payloads = [build_payload(row) for _, row in df.iterrows()]
+
+rejected = [
+    dict(payloads[0], Delivery_person_Age=15.0),
+    dict(payloads[1], Road_traffic_density="NaN "),
+    dict(payloads[2], Time_Orderd="half past eleven"),
+]
+
+
+@pytest.mark.parametrize("rows", [payloads])
+def test_batch_matches_single(rows):
+
+    response = client.post("/predict/batch", json=rows + rejected)
+    assert response.status_code == 200, (
+        f"❌ API returned {response.status_code}"
+    )
+
+    result = response.json()
+    assert result["n_rows"] == len(rows) + len(rejected)
+    assert result["n_rejected"] >= len(rejected)
+
+    # Rejected rows must come back with a reason, in request order
+    minor, no_traffic, bad_time = result["predictions"][-3:]
+    assert "under 18" in minor["error"]
+    assert "traffic" in no_traffic["error"]
+    assert "Unparseable order or pickup time" in bad_time["error"]
+
+    for row, pred in zip(rows, result["predictions"]):
+        single = client.post("/predict", json=row).json()
+
+        if "error" in pred:
+            assert "error" in single
+        else:
+            assert np.isclose(
+                pred["predicted_time_minutes"],
+                single["predicted_time_minutes"],
+            ), "❌ Batch prediction differs from /predict"
+
+
+def test_batch_too_large():
+    too_many = [payloads[0]] * 5000
+    response = client.post("/predict/batch", json=too_many)
+    assert response.status_code == 413
+
+
+def test_batch_bad_date_rejects_only_that_row():
+    rows = payloads[:4] + [dict(payloads[4], Order_Date="not a date")]
+
+    response = client.post("/predict/batch", json=rows)
+    assert response.status_code == 200, (
+        f"❌ API returned {response.status_code}"
+    )
+
+    *good, bad_date = response.json()["predictions"]
+    assert "Unparseable order date" in bad_date["error"]
+    assert all("predicted_time_minutes" in pred for pred in good)
@@ -0,0 +1,36 @@
+import json
+
+import pytest
+
+from scripts.benchmark_serving import run_benchmark, summarize, STAGES
+
+
+def test_summarize_percentiles():
+    timings = [i / 1000 for i in range(1, 101)]  # 1..100 ms
+
+    stats = summarize(timings, batch_size=10)
+
+    assert stats["n_iter"] == 100
+    assert stats["p50_ms"] == pytest.approx(50.5)
+    assert stats["p95_ms"] == pytest.approx(95.05)
+    assert stats["p99_ms"] == pytest.approx(99.01)
+    assert stats["rows_per_sec"] == pytest.approx(1000 / sum(timings))
+
+
+def test_every_stage_reported_per_batch_size(tmp_path):
+    report = run_benchmark(
+        batch_sizes=[1, 8], min_iters=2, max_iters=2, budget=0
+    )
+
+    seen = {(r["stage"], r["batch_size"]) for r in report["results"]}
+    assert seen == {(stage, size) for stage in STAGES for size in (1, 8)}
+
+    for result in report["results"]:
+        assert result["n_iter"] == 2
+        assert 0 < result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"]
+
+    api = [r for r in report["results"] if r["stage"] == "api"]
+    assert [r["endpoint"] for r in api] == ["/predict", "/predict/batch"]
+
+    # Report is plain JSON
+    json.dumps(report)
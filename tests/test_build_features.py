@@ -0,0 +1,187 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.features.build_features import (
+    build_features,
+    haversine_distance,
+    parse_time_of_day,
+    time_to_seconds,
+    _cut,
+    FEATURE_COLUMNS,
+    CATEGORICAL_COLUMNS,
+    TARGET,
+    TIME_OF_DAY_EDGES,
+    TIME_OF_DAY_LABELS,
+    DISTANCE_EDGES,
+    DISTANCE_LABELS,
+)
+
+# -----------------------------------------------------------
+# Raw orders as the DVC stage reads them (all strings)
+# -----------------------------------------------------------
+RAW = pd.DataFrame({
+    "ID": ["0x1", "0x2", "0x3", "0x4", "0x5"],
+    "Delivery_person_ID": [
+        "INDORES13DEL02", "BANGRES18DEL01", "SURRES01DEL03",
+        "INDORES02DEL01", "BANGRES05DEL02",
+    ],
+    "Delivery_person_Age": ["30", "15", "NaN ", "28", "41"],
+    "Delivery_person_Ratings": ["4.7", "4.1", "4.9", "6", "NaN "],
+    "Restaurant_latitude": [22.745049, -12.913041, 21.173343, 22.745049, 0.0],
+    "Restaurant_longitude": [
+        75.892471, 77.683237, 72.792731, 75.892471, 0.0
+    ],
+    "Delivery_location_latitude": [
+        22.765049, 13.043041, 21.233343, 22.795049, 0.2
+    ],
+    "Delivery_location_longitude": [
+        75.912471, 77.813237, 72.852731, 75.942471, 0.0
+    ],
+    "Order_Date": [
+        "19-03-2022", "25-03-2022", "NaN ", "12-02-2022", "13-02-2022"
+    ],
+    "Time_Orderd": ["11:30:00", "19:45", "NaN ", "00:10:00", "23:50:00"],
+    "Time_Order_picked": [
+        "11:45:00", "19:55:00", "20:05:00", "00:20:00", "00:05:00"
+    ],
+    "Weatherconditions": [
+        "conditions Sunny", "conditions Fog", "conditions NaN",
+        "conditions Sunny", "conditions Stormy",
+    ],
+    "Road_traffic_density": ["High ", "Jam ", "NaN ", "Low ", "Low "],
+    "Vehicle_condition": [2, 1, 0, 2, 3],
+    "Type_of_order": ["Snack ", "Meal ", "Drinks ", "Snack ", "Buffet "],
+    "Type_of_vehicle": [
+        "motorcycle ", "scooter ", "motorcycle ", "bicycle ", "motorcycle "
+    ],
+    "multiple_deliveries": ["0", "1", "NaN ", "0", "3"],
+    "Festival": ["No ", "No ", "Yes ", "No ", "NaN "],
+    "City": [
+        "Urban ", "Metropolitian ", "Urban ", "Semi-Urban ", "Urban "
+    ],
+    "Time_taken(min)": [
+        "(min) 24", "(min) 33", "(min) 26", "(min) 21", "(min) 30"
+    ],
+})
+
+
+def test_batch_output():
+    cleaned = build_features(RAW, target=True, categorical=True)
+
+    # Minor (row 1) and 6-star rating (row 3) dropped, index kept
+    assert list(cleaned.index) == [0, 2, 4]
+    assert list(cleaned.columns) == (
+        FEATURE_COLUMNS[:10] + [TARGET] + FEATURE_COLUMNS[10:]
+    )
+
+    row = cleaned.loc[0]
+    assert row["weather"] == "sunny" and row["traffic"] == "high"
+    assert row["is_weekend"] == 1
+    assert row["pickup_time_minutes"] == 15
+    assert row["order_time_of_day"] == "morning"
+    assert row[TARGET] == 24
+
+    # Missing markers become NaN; pickup wraps past midnight
+    missing = ["age", "weather", "traffic", "multiple_deliveries"]
+    assert cleaned.loc[2, missing].isna().all()
+    assert cleaned.loc[4, "pickup_time_minutes"] == 15
+    assert pd.isna(cleaned.loc[4, "festival"])
+
+    assert list(cleaned["traffic"].cat.categories) == ["high", "low"]
+
+
+def test_api_typed_input_gives_same_features():
+    # InputData delivers numbers instead of raw strings
+    api = RAW.drop(columns=["Time_taken(min)"]).drop(index=3)
+    numeric = [
+        "Delivery_person_Age", "Delivery_person_Ratings",
+        "multiple_deliveries",
+    ]
+    for col in numeric:
+        api[col] = pd.to_numeric(api[col].str.strip(), errors="coerce")
+
+    expected = build_features(RAW.drop(index=3), categorical=True)
+    features = build_features(api)
+
+    assert features["weather"].dtype == object
+    pd.testing.assert_frame_equal(
+        features.astype({col: "category" for col in CATEGORICAL_COLUMNS}),
+        expected,
+    )
+
+
+@pytest.mark.parametrize("value, seconds, unparseable", [
+    ("11:30:00", 41400, False),
+    ("11:30", 41400, False),
+    ("9:05", 32700, False),
+    (" 23:59:59.75 ", 86399, False),
+    ("0.458333333", 39600, False),
+    ("1", 0, False),
+    ("NaN ", -1, False),
+    (None, -1, False),
+    ("25:00:00", -1, True),
+    ("12:60", -1, True),
+    ("1.5", -1, True),
+    ("noon", -1, True),
+])
+def test_parse_time_of_day(value, seconds, unparseable):
+    parsed, flags = parse_time_of_day(
+        pd.Series([value, "10:00:00", value], dtype=object)
+    )
+
+    assert parsed.tolist() == [seconds, 36000, seconds]
+    assert flags.tolist() == [unparseable, False, unparseable]
+
+    # Scalar path used by the single-record API builder agrees
+    if isinstance(value, str) and value != "NaN ":
+        assert time_to_seconds(value) == (None if seconds < 0 else seconds)
+
+
+def test_unparseable_time_is_flagged_not_fatal(caplog):
+    raw = RAW.copy()
+    raw.loc[0, "Time_Orderd"] = "half past eleven"
+    raw.loc[2, "Time_Orderd"] = "0.5"
+
+    with caplog.at_level("WARNING", logger="build_features"):
+        cleaned = build_features(raw, target=True)
+
+    assert "1 rows with unparseable order / pickup time" in caplog.text
+    times = ["pickup_time_minutes", "order_time_of_day"]
+    assert cleaned.loc[0, times].isna().all()
+    # 12:00:00 → 20:05:00
+    assert cleaned.loc[2, "pickup_time_minutes"] == 485
+    assert cleaned.loc[2, "order_time_of_day"] == "morning"
+
+
+@pytest.mark.parametrize("edges, labels, right, values", [
+    (TIME_OF_DAY_EDGES, TIME_OF_DAY_LABELS, True,
+     [0, 1, 6, 6.5, 12, 17, 20, 23, 24, 25, -1, np.nan]),
+    (DISTANCE_EDGES, DISTANCE_LABELS, False,
+     [0, 4.99, 5, 10, 14.9, 15, 24.99, 25, 30, -0.1, np.nan]),
+])
+def test_cut_matches_pd_cut(edges, labels, right, values):
+    values = np.array(values, dtype=np.float64)
+    expected = pd.cut(values, bins=edges, labels=labels, right=right)
+    pd.testing.assert_series_equal(
+        pd.Series(_cut(values, edges, labels, right)), pd.Series(expected)
+    )
+
+
+def test_haversine_matches_reference():
+    rng = np.random.default_rng(0)
+    coords = [rng.uniform(-40, 40, 1000) for _ in range(4)]
+
+    lat1, lon1, lat2, lon2 = (np.radians(np.abs(c)) for c in coords)
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    expected = 6371 * (2 * np.arcsin(np.sqrt(a)))
+
+    before = [c.copy() for c in coords]
+    np.testing.assert_array_equal(haversine_distance(*coords), expected)
+
+    # Inputs are not modified
+    for c, b in zip(coords, before):
+        np.testing.assert_array_equal(c, b)
@@ -0,0 +1,138 @@
+import numpy as np
+import pytest
+from catboost import CatBoostRegressor
+from lightgbm import LGBMRegressor
+
+from scripts.serving_model import ServingModel
+from src.models.compact_models import (
+    boosters_from_native,
+    checkpoints,
+    choose_tree_count,
+    export_compact,
+    holdout_curves,
+    load_compact,
+    native_models,
+    segment_report,
+    staged_mae_catboost,
+    staged_mae_lightgbm,
+)
+from src.models.register import registered_bundle
+
+SEGMENT = 10
+
+
+@pytest.fixture(scope="module")
+def fitted():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(400, 4)).astype(np.float32)
+    y = 3 * X[:, 0] + rng.normal(size=400)
+    cat = CatBoostRegressor(
+        iterations=53, verbose=False, allow_writing_files=False,
+        random_seed=0,
+    ).fit(X, y)
+    lgbm = LGBMRegressor(n_estimators=47, verbose=-1, random_state=0).fit(X, y)
+    return X, y, cat, lgbm
+
+
+def mae(pred, y) -> float:
+    return float(np.abs(pred - y).mean())
+
+
+def test_checkpoints_end_at_full_model():
+    assert checkpoints(53, 10) == [10, 20, 30, 40, 50, 53]
+    assert checkpoints(50, 10) == [10, 20, 30, 40, 50]
+    assert checkpoints(7, 10) == [7]
+
+
+def test_staged_mae_matches_truncated_predictions(fitted):
+    X, y, cat, lgbm = fitted
+    booster = lgbm.booster_
+
+    cat_maes = staged_mae_catboost(cat, X, y, SEGMENT)
+    lgb_maes = staged_mae_lightgbm(booster, X, y, SEGMENT)
+
+    for n, value in zip(checkpoints(53, SEGMENT), cat_maes):
+        assert value == pytest.approx(mae(cat.predict(X, ntree_end=n), y))
+    for n, value in zip(checkpoints(47, SEGMENT), lgb_maes):
+        pred = booster.predict(X, num_iteration=n)
+        assert value == pytest.approx(mae(pred, y))
+
+
+def test_tree_count_within_tolerance():
+    trees = [10, 20, 30, 40]
+    maes = [2.0, 1.2, 1.05, 1.0]
+
+    assert choose_tree_count(trees, maes, 0.0) == 40
+    assert choose_tree_count(trees, maes, 0.1) == 30
+    assert choose_tree_count(trees, maes, 1.5) == 10
+
+    report = segment_report(trees, maes)
+    assert report[0]["delta"] is None
+    assert report[1]["delta"] == pytest.approx(-0.8)
+
+
+def test_native_export_round_trip(fitted, tmp_path):
+    X, y, cat, lgbm = fitted
+    booster = lgbm.booster_
+
+    export_compact(cat, 20, booster, 30, tmp_path)
+    compact_cat, compact_lgb = load_compact(tmp_path)
+
+    assert (tmp_path / "catboost_model.cbm").exists()
+    assert (tmp_path / "lgbm_model.txt").exists()
+    assert compact_cat.tree_count_ == 20 and compact_lgb.num_trees() == 30
+    # Source model untouched
+    assert cat.tree_count_ == 53
+
+    np.testing.assert_allclose(
+        compact_cat.predict(X), cat.predict(X, ntree_end=20)
+    )
+    np.testing.assert_allclose(
+        compact_lgb.predict(X), booster.predict(X, num_iteration=30)
+    )
+
+
+def test_registered_bundle_serves_native_files(fitted, tmp_path):
+    X, y, cat, lgbm = fitted
+    export_compact(cat, 20, lgbm.booster_, 30, tmp_path)
+    compact_cat, compact_lgb = load_compact(tmp_path)
+    bundle = {
+        "preprocessor": None,
+        "catboost": compact_cat,
+        "lightgbm": compact_lgb,
+        "weights": {"cat": 0.4, "lgbm": 0.6},
+    }
+
+    package = registered_bundle(bundle, tmp_path)
+
+    # Native file contents registered instead of the pickled boosters
+    assert "catboost" not in package and "lightgbm" not in package
+    assert package["native_models"] == native_models(tmp_path)
+    cat_model, booster = boosters_from_native(package["native_models"])
+    np.testing.assert_allclose(cat_model.predict(X), compact_cat.predict(X))
+    np.testing.assert_allclose(booster.predict(X), compact_lgb.predict(X))
+
+    served = ServingModel(1, package).ensemble.predict(X)
+    expected = 0.4 * compact_cat.predict(X) + 0.6 * compact_lgb.predict(X)
+    np.testing.assert_allclose(served, expected, rtol=1e-6)
+
+
+def test_registered_bundle_without_compact_is_unchanged(tmp_path):
+    bundle = {"catboost": object(), "lightgbm": object()}
+    assert registered_bundle(bundle, tmp_path) is bundle
+
+
+def test_holdout_curves_use_fresh_copies(fitted):
+    X, y, cat, lgbm = fitted
+
+    curves = holdout_curves(
+        cat, lgbm, X[:300], y[:300], X[300:], y[300:], SEGMENT
+    )
+
+    # One MAE per served checkpoint, scored on rows the copies never saw
+    assert len(curves["CatBoost"]) == len(checkpoints(53, SEGMENT))
+    assert len(curves["LightGBM"]) == len(checkpoints(47, SEGMENT))
+    served_mae = mae(cat.predict(X[300:]), y[300:])
+    assert curves["CatBoost"][-1] != pytest.approx(served_mae)
+    # Served models untouched
+    assert cat.tree_count_ == 53 and lgbm.booster_.num_trees() == 47
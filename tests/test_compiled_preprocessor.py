@@ -0,0 +1,50 @@
+import pandas as pd
+import numpy as np
+import joblib
+from pathlib import Path
+import pytest
+
+from src.features.compiled_preprocessor import CompiledPreprocessor
+
+# =====================================================================
+# Paths (created by the DVC preprocess stage)
+# =====================================================================
+ROOT = Path(__file__).parent.parent
+TEST_DATA_PATH = ROOT / "data" / "interim" / "test.parquet"
+PREPROCESSOR_PATH = ROOT / "models" / "preprocessor.joblib"
+
+TARGET = "time_taken"
+
+preprocessor = joblib.load(PREPROCESSOR_PATH)
+
+X_test = pd.read_parquet(TEST_DATA_PATH).dropna().drop(columns=[TARGET])
+expected = preprocessor.transform(X_test)
+
+
+# =====================================================================
+# TEST : compiled lookup tables == ColumnTransformer, bit for bit
+# =====================================================================
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_compiled_matches_column_transformer(dtype):
+
+    compiled = CompiledPreprocessor(preprocessor, dtype=dtype)
+    reference = expected.to_numpy(dtype=dtype)
+
+    assert compiled.feature_names_out_ == list(expected.columns)
+
+    # Whole test split in one call
+    assert np.array_equal(compiled.transform(X_test), reference)
+
+    # Row by row into a reused buffer (serving path)
+    buffer = np.empty((1, compiled.n_features_out_), dtype=dtype)
+    for i, record in enumerate(X_test.to_dict("records")):
+        compiled.transform_record(record, out=buffer)
+        assert np.array_equal(buffer[0], reference[i]), f"❌ Row {i} differs"
+
+
+def test_unknown_ordinal_category_raises():
+    compiled = CompiledPreprocessor(preprocessor)
+    record = dict(X_test.iloc[0], traffic="gridlock")
+
+    with pytest.raises(ValueError):
+        compiled.transform_record(record)
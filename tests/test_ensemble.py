@@ -0,0 +1,94 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.ensemble import FusedEnsemble
+from src.models.register import build_bundle
+from scripts.benchmark_serving import MODEL_DIR, PARAMS_PATH
+
+
+@pytest.fixture(scope="module")
+def bundle():
+    return build_bundle(MODEL_DIR, PARAMS_PATH)
+
+
+def features(n_rows: int, n_features: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.random((n_rows, n_features)).astype(np.float32)
+
+
+def reference(bundle, X):
+    """The blend as ServingModel used to compute it."""
+    w = bundle["weights"]
+    return (
+        w["cat"] * bundle["catboost"].predict(X)
+        + w["lgbm"] * bundle["lightgbm"].predict(X)
+    )
+
+
+def test_bundle_carries_ensemble(bundle):
+    ensemble = bundle["ensemble"]
+
+    assert ensemble.cat_model is bundle["catboost"]
+    assert ensemble.lgb_model is bundle["lightgbm"]
+    assert ensemble.weights == {
+        "catboost": bundle["weights"]["cat"],
+        "lightgbm": bundle["weights"]["lgbm"],
+    }
+
+
+@pytest.mark.parametrize("n_rows", [1, 7, 300])
+@pytest.mark.parametrize("parallel", [False, True])
+def test_matches_separate_predictions(bundle, n_rows, parallel):
+    ensemble = bundle["ensemble"]
+    X = features(n_rows, ensemble.n_features_in_)
+
+    timings = []
+    pred = ensemble.predict(
+        X, parallel=parallel, on_timing=lambda *t: timings.append(t)
+    )
+
+    np.testing.assert_array_equal(pred, reference(bundle, X))
+    assert pred.dtype == np.float64 and pred.shape == (n_rows,)
+    assert len(timings) == 1 and all(t > 0 for t in timings[0])
+
+
+def test_input_converted_once_to_float32(bundle):
+    ensemble = bundle["ensemble"]
+    X = features(5, ensemble.n_features_in_)
+
+    # float64 frame (sklearn preprocessor output) → same as the float32 array
+    frame = pd.DataFrame(X.astype(np.float64))
+    np.testing.assert_array_equal(ensemble.predict(frame), ensemble.predict(X))
+
+    # Already contiguous float32: used as is
+    assert ensemble.as_input(X) is X
+
+    with pytest.raises(ValueError):
+        ensemble.predict(X[:, :-1])
+
+
+def test_pickle_drops_thread_pool(bundle):
+    ensemble = bundle["ensemble"]
+    X = features(3, ensemble.n_features_in_)
+    ensemble.predict(X, parallel=True)
+
+    restored = pickle.loads(pickle.dumps(ensemble))
+
+    assert restored._executor is None
+    np.testing.assert_array_equal(
+        restored.predict(X, parallel=True), ensemble.predict(X)
+    )
+
+
+def test_accepts_booster_directly(bundle):
+    lgb = bundle["lightgbm"]
+    # Native Booster already when the bundle comes from the compact stage
+    booster = getattr(lgb, "booster_", lgb)
+    ensemble = FusedEnsemble(bundle["catboost"], booster, 0.5, 0.5)
+    X = features(4, ensemble.n_features_in_)
+
+    expected = 0.5 * bundle["catboost"].predict(X) + 0.5 * lgb.predict(X)
+    np.testing.assert_array_equal(ensemble.predict(X), expected)
@@ -0,0 +1,67 @@
+import pandas as pd
+from pathlib import Path
+import pytest
+
+from scripts.data_clean_utils import perform_data_cleaning
+from scripts.fast_features import build_feature_row, FEATURE_COLUMNS
+
+# -----------------------------------------------------------
+# Path to raw dataset
+# -----------------------------------------------------------
+ROOT = Path(__file__).parent.parent
+DATA_PATH = ROOT / "data" / "raw" / "swiggy.csv"
+
+# -----------------------------------------------------------
+# Raw rows typed the way InputData delivers them to the API
+# -----------------------------------------------------------
+df = pd.read_csv(DATA_PATH).drop(columns=["Time_taken(min)"])
+
+NUMERIC = ["Delivery_person_Age", "Delivery_person_Ratings",
+           "multiple_deliveries"]
+for col in NUMERIC:
+    df[col] = pd.to_numeric(df[col].astype(str).str.strip(), errors="coerce")
+
+records = df.to_dict("records")
+
+# Reference: vectorized pandas path over the whole dataset
+cleaned = perform_data_cleaning(df)
+
+
+@pytest.mark.parametrize("columns", [FEATURE_COLUMNS])
+def test_fast_path_matches_pandas(columns):
+
+    assert list(cleaned.columns) == columns, "❌ Feature column order changed"
+
+    kept = set(cleaned.index)
+    mismatches = []
+
+    for idx, record in enumerate(records):
+        features, reason = build_feature_row(record)
+
+        if idx not in kept:
+            # pandas dropped the row → fast path must reject it too
+            if features is not None:
+                mismatches.append((idx, "kept", features))
+            continue
+
+        if features is None:
+            mismatches.append((idx, "rejected", reason))
+            continue
+
+        expected = cleaned.loc[idx]
+        for col in columns:
+            if features[col] != expected[col]:
+                mismatches.append((idx, col, features[col], expected[col]))
+
+    print(f"\n✅ Compared {len(records)} raw rows ({len(kept)} kept by pandas)")
+
+    assert not mismatches, (
+        f"❌ {len(mismatches)} mismatches, e.g. {mismatches[:5]}"
+    )
+
+
+def test_minor_is_rejected():
+    record = dict(records[0], Delivery_person_Age=15.0)
+    features, reason = build_feature_row(record)
+    assert features is None
+    assert "under 18" in reason
@@ -0,0 +1,68 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import mean_absolute_error
+
+from src.features.feature_matrix import (
+    save_feature_matrix, open_feature_matrix,
+)
+
+TARGET = "time_taken"
+
+
+def backed_by_memmap(array) -> bool:
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = getattr(array, "base", None)
+    return False
+
+
+@pytest.fixture
+def matrix_dir(tmp_path):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        rng.random((50, 4)), columns=["age", "ratings", "distance", "traffic"]
+    )
+    df[TARGET] = rng.integers(10, 50, 50)
+    save_feature_matrix(df, TARGET, tmp_path, "train")
+    return tmp_path, df
+
+
+def test_round_trip_as_frame(matrix_dir):
+
+    directory, df = matrix_dir
+    X, y = open_feature_matrix(directory, "train")
+
+    assert list(X.columns) == ["age", "ratings", "distance", "traffic"]
+    assert (X.dtypes == np.float32).all()
+    np.testing.assert_array_equal(
+        X.to_numpy(), df.drop(columns=[TARGET]).to_numpy(np.float32)
+    )
+    np.testing.assert_array_equal(y.to_numpy(), df[TARGET].to_numpy())
+
+    # Frame is a view over the mapping and still usable by sklearn helpers
+    assert backed_by_memmap(X.to_numpy())
+    mean_absolute_error(y, X["age"])
+
+
+def test_raw_memmaps_are_read_only(matrix_dir):
+
+    directory, _ = matrix_dir
+    X, y = open_feature_matrix(directory, "train", as_frame=False)
+
+    assert isinstance(X, np.memmap) and X.flags.c_contiguous
+    assert not X.flags.writeable
+
+
+def test_metadata_mismatch_is_rejected(matrix_dir):
+
+    directory, _ = matrix_dir
+    meta_path = directory / "train.json"
+    meta = json.loads(meta_path.read_text())
+    meta["n_features"] += 1
+    meta_path.write_text(json.dumps(meta))
+
+    with pytest.raises(ValueError, match="metadata says"):
+        open_feature_matrix(directory, "train")
@@ -0,0 +1,165 @@
+import json
+from math import comb
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import mean_absolute_error
+
+from src.models.find_best_weights import (
+    simplex_grid,
+    blend_mae,
+    search_weights,
+    save_weights,
+    read_ensemble_weights,
+)
+from src.models import oof_predictions
+from src.models.oof_predictions import (
+    out_of_fold_predictions, save_oof, load_oof,
+)
+
+
+def stacked(n_rows: int, seed: int = 0):
+    """Three noisy 'models' of the same target, with different bias / noise."""
+    rng = np.random.default_rng(seed)
+    y = rng.normal(30, 8, n_rows)
+    predictions = np.column_stack([
+        y + rng.normal(0, 4, n_rows),
+        y + rng.normal(1, 3, n_rows),
+        y + rng.normal(-1, 5, n_rows),
+    ])
+    return predictions, y
+
+
+@pytest.mark.parametrize("n_models, step", [
+    (1, 0.5), (2, 0.05), (3, 0.1), (4, 0.25),
+])
+def test_simplex_grid(n_models, step):
+    grid = simplex_grid(n_models, step)
+
+    k = round(1 / step)
+    assert grid.shape == (comb(k + n_models - 1, n_models - 1), n_models)
+    np.testing.assert_allclose(grid.sum(axis=1), 1)
+    assert (grid >= 0).all()
+    # Multiples of step, no duplicates
+    np.testing.assert_allclose(grid * k, np.round(grid * k))
+    assert len(np.unique(grid, axis=0)) == len(grid)
+
+
+def test_grid_step_must_divide_one():
+    with pytest.raises(ValueError):
+        simplex_grid(2, 0.3)
+
+
+def test_blend_mae_matches_sklearn(monkeypatch):
+    predictions, y = stacked(1000)
+    candidates = simplex_grid(3, 0.25)
+
+    # Small chunks: exercise the row loop
+    monkeypatch.setattr("src.models.find_best_weights.CHUNK_ELEMENTS", 64)
+    maes = blend_mae(predictions, y, candidates)
+
+    expected = [mean_absolute_error(y, predictions @ w) for w in candidates]
+    np.testing.assert_allclose(maes, expected, rtol=1e-12)
+
+
+def test_grid_search_matches_old_two_model_loop():
+    predictions, y = stacked(5000)
+    pred_cat, pred_lgb = predictions[:, 0], predictions[:, 1]
+
+    # The loop this replaces
+    best_mae, best_w_cat = float("inf"), None
+    for w_cat in np.arange(0, 1.05, 0.05):
+        mae = mean_absolute_error(y, w_cat * pred_cat + (1 - w_cat) * pred_lgb)
+        if mae < best_mae:
+            best_mae, best_w_cat = mae, w_cat
+
+    result = search_weights(predictions[:, :2], y, "grid", 0.05)
+
+    assert result["n_candidates"] == 21
+    assert result["weights"][0] == pytest.approx(best_w_cat)
+    assert result["mae"] == pytest.approx(best_mae)
+
+
+def test_optimizer_stays_on_simplex_and_improves():
+    predictions, y = stacked(20_000)
+
+    grid = search_weights(predictions, y, "grid", 0.1)
+    refined = search_weights(predictions, y, "slsqp", 0.1)
+
+    w = refined["weights"]
+    assert (w >= 0).all() and w.sum() == pytest.approx(1)
+    assert refined["mae"] <= grid["mae"]
+    expected = mean_absolute_error(y, predictions @ w)
+    assert refined["mae"] == pytest.approx(expected)
+
+
+def test_weights_file_round_trip(tmp_path):
+    params = tmp_path / "params.yaml"
+    params.write_text("Train:\n  weights:\n    cat: 0.4\n    lgbm: 0.6\n")
+    weights_path = tmp_path / "ensemble_weights.json"
+
+    # Stage not run yet: params.yaml fallback
+    weights = read_ensemble_weights(weights_path, params)
+    assert weights == {"cat": 0.4, "lgbm": 0.6}
+
+    result = {"weights": np.array([0.35, 0.65]), "mae": 3.2}
+    save_weights(weights_path, ["cat", "lgbm"], result, method="grid")
+
+    weights = read_ensemble_weights(weights_path, params)
+    assert weights == {"cat": 0.35, "lgbm": 0.65}
+    assert json.loads(weights_path.read_text())["oof_mae"] == 3.2
+
+
+def test_oof_file_round_trip(tmp_path):
+    predictions, y = stacked(10)
+    path = tmp_path / "oof_predictions.npz"
+
+    save_oof(path, ["cat", "lgbm", "other"], predictions, y, n_folds=5)
+    names, loaded, target = load_oof(path)
+
+    assert names == ["cat", "lgbm", "other"]
+    np.testing.assert_array_equal(loaded, predictions)
+    np.testing.assert_array_equal(target, y)
+    assert json.loads(path.with_suffix(".json").read_text())["n_folds"] == 5
+
+
+def test_oof_members_fit_like_the_served_models(monkeypatch):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(300, 3)), columns=list("abc"))
+    y = pd.Series(3 * X["a"] + rng.normal(size=300))
+    train_params = {
+        "CatBoost": {"iterations": 300, "learning_rate": 0.3, "depth": 4,
+                     "verbose": False, "random_seed": 0,
+                     "allow_writing_files": False},
+        "LightGBM": {"n_estimators": 300, "learning_rate": 0.3,
+                     "num_leaves": 8, "random_state": 0, "verbose": -1},
+        "threads": {"budget": 2, "parallel": True,
+                    "share": {"CatBoost": 0.5, "LightGBM": 0.5}},
+        "early_stopping": {"enabled": True, "validation_size": 0.2,
+                           "rounds": 10, "refit": True, "random_state": 0},
+    }
+
+    fits = []
+
+    def spy(section, X_fit, y_fit, params, n_threads):
+        model, info = fit_booster(section, X_fit, y_fit, params, n_threads)
+        fits.append((section, info))
+        return model, info
+
+    fit_booster = oof_predictions.fit_booster
+    monkeypatch.setattr(oof_predictions, "fit_booster", spy)
+
+    names, oof = out_of_fold_predictions(
+        X, y, train_params, n_folds=3, random_state=0
+    )
+
+    assert names == ["cat", "lgbm"] and oof.shape == (300, 2)
+    assert np.abs(oof - y.to_numpy()[:, None]).mean(axis=0).max() < 1.5
+    # Early-stopped like train_model.py, with the whole budget (one
+    # booster at a time)
+    assert len(fits) == 6
+    assert all(
+        info["trees"] == info["best_iteration"] < 300 for _, info in fits
+    )
+    assert all(info["threads"] == 2 for _, info in fits)
@@ -0,0 +1,88 @@
+import gc
+import weakref
+import pytest
+from fastapi.testclient import TestClient
+
+# App import loads the model bundle (cache first, then MLflow registry)
+import app as serving
+from scripts.model_cache import ModelCache
+from scripts.serving_model import WARMUP_RECORD
+
+ADMIN_TOKEN = "test-token"
+
+client = TestClient(serving.app, headers={"X-Admin-Token": ADMIN_TOKEN})
+
+
+def bundle_of(model, w_cat):
+    return {
+        "preprocessor": model.preprocessor,
+        "compiled_preprocessor": model.compiled_preprocessor,
+        "catboost": model.cat_model,
+        "lightgbm": model.lgb_model,
+        "weights": {"cat": w_cat, "lgbm": 1 - w_cat},
+    }
+
+
+@pytest.fixture
+def staged_versions(tmp_path, monkeypatch):
+    """Temp cache holding two versions built from the serving bundle."""
+
+    original = serving.current_model
+    cache = ModelCache(tmp_path / "cache", serving.MODEL_NAME)
+    cache.store(1001, bundle_of(original, 0.4))
+    cache.store(1002, bundle_of(original, 0.5))
+
+    monkeypatch.setattr(serving, "model_cache", cache)
+    monkeypatch.setattr(serving, "ADMIN_TOKEN", ADMIN_TOKEN)
+    yield cache
+    serving.current_model = original
+    serving.MODEL_VERSION.set(original.version)
+
+
+def test_reload_swaps_version_and_releases_old(staged_versions):
+
+    serving.reload_model(1001)
+    old = weakref.ref(serving.current_model)
+
+    response = client.post("/admin/reload", params={"version": 1002})
+    assert response.status_code == 200
+    assert response.json() == {"previous_version": 1001, "model_version": 1002}
+
+    # The response reports the version that actually served it
+    result = client.post("/predict", json=WARMUP_RECORD).json()
+    assert result["model_version_used"] == 1002
+    assert result["weights"] == {"catboost": 0.5, "lightgbm": 0.5}
+
+    # Nothing keeps the replaced model alive
+    gc.collect()
+    assert old() is None
+
+
+def test_broken_bundle_is_not_swapped_in(staged_versions):
+
+    serving.reload_model(1001)
+
+    broken = bundle_of(serving.current_model, 0.4)
+    broken["lightgbm"] = None
+    staged_versions.store(1003, broken)
+
+    response = client.post("/admin/reload", params={"version": 1003})
+    assert response.status_code == 500
+    assert serving.current_model.version == 1001
+
+
+@pytest.mark.parametrize("configured, sent", [
+    (None, None), (None, "anything"), (ADMIN_TOKEN, "wrong"),
+])
+def test_reload_refused_without_valid_token(staged_versions, monkeypatch,
+                                            configured, sent):
+
+    serving.reload_model(1001)
+    monkeypatch.setattr(serving, "ADMIN_TOKEN", configured)
+
+    headers = {} if sent is None else {"X-Admin-Token": sent}
+    response = TestClient(serving.app).post(
+        "/admin/reload", params={"version": 1002}, headers=headers
+    )
+    assert response.status_code == 403
+    assert serving.current_model.version == 1001
@@ -0,0 +1,60 @@
+import asyncio
+import threading
+import pytest
+
+from scripts.inference_pool import (
+    InferencePool, PoolOverloaded, INFERENCE_REJECTED,
+)
+
+
+async def flood(pool, n_jobs, release):
+    def job(i):
+        release.wait(timeout=5)
+        return i
+
+    tasks = [asyncio.ensure_future(pool.run(job, i)) for i in range(n_jobs)]
+    await asyncio.sleep(0.05)
+    release.set()
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
+
+@pytest.mark.parametrize("workers, queue", [(1, 0), (2, 3)])
+def test_excess_jobs_are_refused(workers, queue):
+
+    pool = InferencePool(max_workers=workers, max_queue=queue)
+    rejected_before = INFERENCE_REJECTED.value
+
+    results = asyncio.run(flood(pool, 10, threading.Event()))
+
+    accepted = [r for r in results if not isinstance(r, PoolOverloaded)]
+    refused = [r for r in results if isinstance(r, PoolOverloaded)]
+
+    # Exactly workers + queue jobs are admitted, the rest fail fast
+    assert len(accepted) == workers + queue
+    assert len(refused) == 10 - (workers + queue)
+    assert INFERENCE_REJECTED.value - rejected_before == len(refused)
+    assert pool.pending == 0
+
+
+def test_cancelled_caller_keeps_slot_until_job_finishes():
+
+    async def scenario():
+        pool = InferencePool(max_workers=1, max_queue=0)
+        release = threading.Event()
+
+        caller = asyncio.ensure_future(pool.run(release.wait, 5))
+        await asyncio.sleep(0.05)
+        caller.cancel()
+        await asyncio.sleep(0.05)
+
+        # The job still occupies the only thread: new work is refused
+        assert pool.pending == 1
+        with pytest.raises(PoolOverloaded):
+            await pool.run(lambda: None)
+
+        release.set()
+        await asyncio.sleep(0.05)
+        assert pool.pending == 0
+        assert await pool.run(lambda: "ok") == "ok"
+
+    asyncio.run(scenario())
@@ -0,0 +1,120 @@
+import asyncio
+from itertools import islice
+
+import pandas as pd
+
+from scripts.load_test import Window, LoadTest
+from scripts.payloads import build_payload, iter_payloads
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class FakeClient:
+    """Answers after `delay` seconds; every 5th call is a 503."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+
+    async def post(self, endpoint, json):
+        self.calls.append((endpoint, json))
+        n = len(self.calls)
+        await asyncio.sleep(self.delay)
+        return FakeResponse(503 if n % 5 == 0 else 200)
+
+
+def test_window_summary():
+    window = Window()
+    for ms in [0.5, 1.5, 3, 3, 40]:
+        window.record(ms / 1e3, 200, 2)
+    window.record(0.001, 503, 1)
+    window.dropped += 1
+
+    stats = window.summary(2.0)
+
+    assert stats["requests"] == 6 and stats["ok"] == 5
+    assert stats["errors"] == 1
+    assert stats["overloaded"] == 1 and stats["dropped"] == 1
+    assert stats["throughput_rps"] == 2.5
+    assert stats["rows_per_sec"] == 5.0
+    assert stats["p50_ms"] == 3.0
+    assert stats["histogram"]["<=1ms"] == 1
+    assert stats["histogram"]["<=2ms"] == 1
+    assert stats["histogram"]["<=5ms"] == 2
+    assert stats["histogram"]["<=50ms"] == 1
+    assert sum(stats["histogram"].values()) == 5
+
+
+def test_iter_payloads_streams_and_loops(tmp_path):
+    path = tmp_path / "raw.csv"
+    pd.DataFrame({
+        "ID": ["0x1", "0x2", "0x3", "0x4", "0x5"],
+        "Delivery_person_ID": ["INDORES13DEL02"] * 5,
+        "Delivery_person_Age": ["30", "25", "NaN ", "28", "41"],
+        "Delivery_person_Ratings": ["4.7", "4.1", "4.9", "4.2", "NaN "],
+        "Restaurant_latitude": [22.745049] * 5,
+        "Restaurant_longitude": [75.892471] * 5,
+        "Delivery_location_latitude": [22.765049] * 5,
+        "Delivery_location_longitude": [75.912471] * 5,
+        "Order_Date": ["19-03-2022"] * 5,
+        "Time_Orderd": ["11:30:00"] * 5,
+        "Time_Order_picked": ["11:45:00"] * 5,
+        "Weatherconditions": ["conditions Sunny"] * 5,
+        "Road_traffic_density": ["High "] * 5,
+        "Vehicle_condition": [2] * 5,
+        "Type_of_order": ["Snack "] * 5,
+        "Type_of_vehicle": ["motorcycle "] * 5,
+        "multiple_deliveries": ["0"] * 5,
+        "Festival": ["No "] * 5,
+        "City": ["Urban "] * 5,
+        "Time_taken(min)": ["(min) 24"] * 5,
+    }).to_csv(path, index=False)
+
+    payloads = list(islice(iter_payloads(path, chunk_size=2), 7))
+
+    assert [p["ID"] for p in payloads] == [
+        "0x1", "0x2", "0x3", "0x4", "0x5", "0x1", "0x2"
+    ]
+    assert payloads[0] == build_payload(pd.read_csv(path).iloc[0])
+    assert len(list(iter_payloads(path, chunk_size=2, loop=False))) == 5
+
+
+def test_open_loop_run():
+    client = FakeClient(delay=0.01)
+    payloads = iter({"ID": i} for i in range(10_000))
+
+    report = asyncio.run(LoadTest(
+        client, payloads, rate=200, duration=0.5, batch_size=8,
+        batch_ratio=0.5, interval=0.25, verbose=False,
+    ).run())
+
+    # Constant arrivals: rate * duration sends, none waiting on earlier replies
+    total = report["total"]
+    assert total["requests"] == len(client.calls) == 100
+    assert total["overloaded"] == 20 and total["dropped"] == 0
+
+    endpoints = {endpoint for endpoint, _ in client.calls}
+    assert endpoints == {"/predict", "/predict/batch"}
+    batch = next(
+        body for endpoint, body in client.calls
+        if endpoint == "/predict/batch"
+    )
+    assert len(batch) == 8
+
+    assert report["elapsed_seconds"] < 1.0
+    assert sum(i["requests"] for i in report["intervals"]) == 100
+
+
+def test_arrivals_over_concurrency_are_dropped():
+    client = FakeClient(delay=0.2)
+    payloads = iter({"ID": i} for i in range(10_000))
+
+    report = asyncio.run(LoadTest(
+        client, payloads, rate=100, duration=0.1, concurrency=3, verbose=False,
+    ).run())
+
+    assert len(client.calls) == 3
+    assert report["total"]["dropped"] == 7
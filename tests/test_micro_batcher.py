@@ -0,0 +1,137 @@
+import asyncio
+import pytest
+
+from scripts.inference_pool import PoolOverloaded
+from scripts.micro_batcher import MicroBatcher, BATCH_SIZE
+
+
+# -----------------------------------------------------------
+# Fake scorer: records the batches it was called with
+# -----------------------------------------------------------
+class RecordingScorer:
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, items):
+        self.batches.append(list(items))
+        if "bad" in items:
+            raise ValueError("bad row")
+        return [item * 2 for item in items]
+
+
+async def run_inline(func, *args):
+    return func(*args)
+
+
+async def submit_all(batcher, items):
+    batcher.start()
+    try:
+        return await asyncio.gather(
+            *(batcher.submit(item) for item in items), return_exceptions=True
+        )
+    finally:
+        await batcher.stop()
+
+
+@pytest.mark.parametrize("max_batch_size", [8, 64])
+def test_concurrent_calls_are_coalesced(max_batch_size):
+
+    scorer = RecordingScorer()
+    batcher = MicroBatcher(
+        scorer, run_inline, max_wait_ms=20, max_batch_size=max_batch_size
+    )
+
+    count_before = BATCH_SIZE.count
+    results = asyncio.run(submit_all(batcher, list(range(40))))
+
+    # Every caller gets its own result back
+    assert results == [i * 2 for i in range(40)]
+
+    # Fewer scoring calls than requests, none above the size limit
+    assert len(scorer.batches) < 40
+    assert max(len(b) for b in scorer.batches) <= max_batch_size
+    assert BATCH_SIZE.count - count_before == len(scorer.batches)
+
+
+def test_bad_row_only_fails_its_caller():
+
+    scorer = RecordingScorer()
+    batcher = MicroBatcher(
+        scorer, run_inline, max_wait_ms=20, max_batch_size=16
+    )
+
+    results = asyncio.run(submit_all(batcher, [1, "bad", 3]))
+
+    assert results[0] == 2 and results[2] == 6
+    assert isinstance(results[1], ValueError)
+
+
+def test_queue_limit_is_enforced():
+
+    async def scenario():
+        batcher = MicroBatcher(
+            RecordingScorer(), run_inline,
+            max_wait_ms=20, max_batch_size=64, max_queued=2,
+        )
+        batcher.start()
+        try:
+            waiting = [
+                asyncio.ensure_future(batcher.submit(i)) for i in range(3)
+            ]
+            results = await asyncio.gather(*waiting, return_exceptions=True)
+        finally:
+            await batcher.stop()
+        return results
+
+    results = asyncio.run(scenario())
+    assert isinstance(results[2], PoolOverloaded)
+
+
+def test_zero_queue_limit_is_rejected():
+    # asyncio.Queue(maxsize=0) would be unbounded
+    with pytest.raises(ValueError):
+        MicroBatcher(
+            RecordingScorer(), run_inline,
+            max_wait_ms=1, max_batch_size=8, max_queued=0,
+        )
+
+
+def test_stop_drains_pending_requests():
+
+    async def scenario():
+        release = asyncio.Event()
+        scored = []
+
+        async def run_slow(func, items):
+            await release.wait()
+            scored.extend(items)
+            return func(items)
+
+        batcher = MicroBatcher(
+            RecordingScorer(), run_slow,
+            max_wait_ms=10_000, max_batch_size=2, max_queued=8,
+        )
+        batcher.start()
+
+        # Two full batches are being scored, the last one is still filling
+        waiting = [asyncio.ensure_future(batcher.submit(i)) for i in range(5)]
+        await asyncio.sleep(0.05)
+
+        stopping = asyncio.ensure_future(batcher.stop())
+        await asyncio.sleep(0.01)
+        release.set()
+        await stopping
+
+        results = await asyncio.wait_for(
+            asyncio.gather(*waiting, return_exceptions=True), 1
+        )
+        with pytest.raises(PoolOverloaded):
+            await batcher.submit(9)
+        return scored, results
+
+    scored, results = asyncio.run(scenario())
+
+    # Batches handed off before stop() finish; nobody is left hanging
+    assert sorted(scored) == [0, 1, 2, 3]
+    assert results[:4] == [0, 2, 4, 6]
+    assert isinstance(results[4], PoolOverloaded)
@@ -0,0 +1,179 @@
+"""
+Model cache tests against a local file-based MLflow registry
+(no tracking server needed).
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import mlflow
+import mlflow.sklearn
+from mlflow import MlflowClient
+import pytest
+
+from scripts.model_cache import ModelCache, load_bundle, refresh_cache
+
+MODEL_NAME = "Swiggy-Ensemble-Model"
+
+
+class RegistryDown:
+    """Stand-in client for an unreachable tracking server."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_latest_versions(self, *args, **kwargs):
+        self.calls += 1
+        raise ConnectionError("registry unavailable")
+
+
+def register(bundle):
+    with mlflow.start_run():
+        mlflow.sklearn.log_model(
+            sk_model=bundle,
+            artifact_path="full_pipeline",
+            registered_model_name=MODEL_NAME,
+        )
+
+
+@pytest.fixture
+def registry(tmp_path):
+    previous = mlflow.get_tracking_uri()
+    mlflow.set_tracking_uri((tmp_path / "mlruns").as_uri())
+    yield MlflowClient()
+    mlflow.set_tracking_uri(previous)
+
+
+def test_cache_first_then_background_refresh(registry, tmp_path):
+
+    cache = ModelCache(tmp_path / "cache", MODEL_NAME)
+    register({"weights": {"cat": 0.4, "lgbm": 0.6}})
+
+    # 1️⃣ Cold start: cache empty → download from registry
+    version, bundle = load_bundle(registry, MODEL_NAME, cache)
+    assert version == 1
+    assert bundle["weights"]["cat"] == 0.4
+    assert cache.versions() == [1]
+
+    # 2️⃣ Warm start: served from the cache without asking the registry
+    down = RegistryDown()
+    version, bundle = load_bundle(down, MODEL_NAME, cache)
+    assert version == 1
+    assert bundle["weights"]["lgbm"] == 0.6
+    assert down.calls == 0
+
+    # 3️⃣ Background check: nothing new, then a new version appears
+    assert refresh_cache(registry, MODEL_NAME, cache) is None
+
+    register({"weights": {"cat": 0.5, "lgbm": 0.5}})
+    assert refresh_cache(registry, MODEL_NAME, cache) == 2
+
+    version, bundle = load_bundle(RegistryDown(), MODEL_NAME, cache)
+    assert version == 2
+    assert bundle["weights"]["cat"] == 0.5
+
+
+def test_identical_bundles_share_one_object(tmp_path):
+
+    cache = ModelCache(tmp_path / "cache", MODEL_NAME)
+    sha_1 = cache.store(1, {"weights": {"cat": 0.4}})
+    sha_2 = cache.store(2, {"weights": {"cat": 0.4}})
+
+    assert sha_1 == sha_2
+    assert len(list(cache.objects.glob("*.joblib"))) == 1
+
+
+def test_corrupt_object_is_detected(tmp_path):
+
+    cache = ModelCache(tmp_path / "cache", MODEL_NAME)
+    sha = cache.store(1, {"weights": {"cat": 0.4}})
+    (cache.objects / f"{sha}.joblib").write_bytes(b"garbage")
+
+    with pytest.raises(ValueError):
+        cache.load(1)
+
+
+def test_registry_rollback_is_honoured(registry, tmp_path):
+
+    cache = ModelCache(tmp_path / "cache", MODEL_NAME)
+    register({"weights": {"cat": 0.4, "lgbm": 0.6}})
+    register({"weights": {"cat": 0.5, "lgbm": 0.5}})
+    assert load_bundle(registry, MODEL_NAME, cache)[0] == 2
+
+    # Version 2 withdrawn: the poller reports the rollback to a worker
+    # still serving 2
+    registry.delete_model_version(MODEL_NAME, "2")
+    assert refresh_cache(registry, MODEL_NAME, cache, current=2) == 1
+    assert refresh_cache(registry, MODEL_NAME, cache, current=1) is None
+
+    # ...and a restart serves 1 even though 2 is still cached
+    version, bundle = load_bundle(RegistryDown(), MODEL_NAME, cache)
+    assert version == 1
+    assert bundle["weights"]["cat"] == 0.4
+    assert cache.versions() == [1, 2]
+
+
+def test_old_versions_are_evicted(tmp_path):
+
+    cache = ModelCache(tmp_path / "cache", MODEL_NAME, max_versions=2)
+    for version in (1, 2, 3):
+        cache.store(version, {"weights": {"cat": version / 10}})
+
+    assert cache.versions() == [2, 3]
+    assert not cache.has(1)
+    assert len(list(cache.objects.glob("*.joblib"))) == 2
+    assert cache.load(2)["weights"]["cat"] == 0.2
+
+
+def test_concurrent_writers_keep_every_version(tmp_path):
+
+    # One ModelCache per "worker", same directory
+    def store(version):
+        cache = ModelCache(tmp_path / "cache", MODEL_NAME, max_versions=50)
+        cache.store(version, {"v": version})
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(store, range(40)))
+
+    cache = ModelCache(tmp_path / "cache", MODEL_NAME, max_versions=50)
+    assert cache.versions() == list(range(40))
+    assert all(cache.load(v)["v"] == v for v in range(40))
+
+
+def test_registry_latest_is_never_evicted(tmp_path):
+
+    cache = ModelCache(tmp_path / "cache", MODEL_NAME, max_versions=2)
+    cache.store(1, {"v": 1})
+    cache.mark_latest(1)
+    for version in (2, 3):
+        cache.store(version, {"v": version})
+
+    assert cache.versions() == [1, 3]
+    assert cache.load_current() == (1, {"v": 1})
+
+
+def test_reads_do_not_race_eviction(tmp_path):
+
+    # One worker keeps caching (and evicting) while others load
+    writer = ModelCache(tmp_path / "cache", MODEL_NAME, max_versions=1)
+    writer.store(0, {"v": 0})
+    done = threading.Event()
+
+    def write():
+        for version in range(1, 60):
+            writer.store(version, {"v": version, "pad": "x" * 100_000})
+        done.set()
+
+    def read():
+        reader = ModelCache(tmp_path / "cache", MODEL_NAME, max_versions=1)
+        loaded = 0
+        while not done.is_set():
+            version, bundle = reader.load_current()
+            assert bundle["v"] == version
+            loaded += 1
+        return loaded
+
+    with ThreadPoolExecutor(4) as pool:
+        readers = [pool.submit(read) for _ in range(3)]
+        pool.submit(write).result()
+        assert all(future.result() > 0 for future in readers)
@@ -9,6 +9,8 @@ import joblib
 import numpy as np
 from sklearn.metrics import mean_absolute_error
 
+from src.models.compact_models import boosters_from_native
+
 # =====================================================================
 # 1. Load MLflow Tracking URI from .env
 # =====================================================================
@@ -29,7 +31,8 @@ MODEL_NAME = "Swiggy-Ensemble-Model"   # your model name
 def load_latest_model():
     """
     Fetch latest version of the registered model and load it.
-    Returns the model bundle: {preprocessor, catboost, lgbm, weights}
+    Returns the model bundle: {preprocessor, catboost + lightgbm or
+    native_models, weights}
     """
     latest = client.get_latest_versions(MODEL_NAME, stages=None)[0].version
     model_uri = f"models:/{MODEL_NAME}/{latest}"
@@ -41,7 +44,7 @@ def load_latest_model():
 # 3. Path to cleaned test data
 # =====================================================================
 ROOT = Path(__file__).parent.parent
-TEST_DATA_PATH = ROOT / "data" / "interim" / "test.csv"
+TEST_DATA_PATH = ROOT / "data" / "interim" / "test.parquet"
 # Make sure this file exists — created during DVC pipeline
 
 
@@ -55,7 +58,7 @@ TEST_DATA_PATH = ROOT / "data" / "interim" / "test.csv"
 def test_model_performance(threshold_mae):
 
     # Load test data
-    df = pd.read_csv(TEST_DATA_PATH)
+    df = pd.read_parquet(TEST_DATA_PATH)
 
     # Remove missing rows
     df = df.dropna()
@@ -68,8 +71,12 @@ def test_model_performance(threshold_mae):
     model_bundle, version = load_latest_model()
 
     preprocessor = model_bundle["preprocessor"]
-    cat = model_bundle["catboost"]
-    lgb = model_bundle["lightgbm"]
+    if "native_models" in model_bundle:
+        # Registered as the compact stage's native files
+        cat, lgb = boosters_from_native(model_bundle["native_models"])
+    else:
+        cat = model_bundle["catboost"]
+        lgb = model_bundle["lightgbm"]
     w_cat = model_bundle["weights"]["cat"]
     w_lgb = model_bundle["weights"]["lgbm"]
 
@@ -0,0 +1,98 @@
+import time
+import numpy as np
+import pytest
+
+from scripts.prediction_cache import (
+    PredictionCache, CACHE_HITS, CACHE_MISSES, CACHE_EVICTIONS,
+)
+
+# App import loads the model bundle (cache first, then MLflow registry)
+import app as serving
+from scripts.fast_features import build_feature_row
+from scripts.serving_model import ServingModel, WARMUP_RECORD
+
+
+def key(i, version=1):
+    return (version, np.array([i], dtype=np.float32).tobytes())
+
+
+def clone(model, version, w_cat):
+    return ServingModel(version, {
+        "preprocessor": model.preprocessor,
+        "compiled_preprocessor": model.compiled_preprocessor,
+        "catboost": model.cat_model,
+        "lightgbm": model.lgb_model,
+        "weights": {"cat": w_cat, "lgbm": 1 - w_cat},
+    })
+
+
+def test_hits_misses_and_lru_eviction():
+
+    cache = PredictionCache(max_bytes=3 * (4 + 200), ttl_seconds=60)
+    hits, misses = CACHE_HITS.value, CACHE_MISSES.value
+    evictions = CACHE_EVICTIONS.value
+
+    cache.put_many([key(0), key(1), key(2)], [0.0, 1.0, 2.0])
+    assert cache.get_many([key(0), key(5)]) == [0.0, None]
+
+    # key(0) was just used, so key(1) is the least recent and goes first
+    cache.put_many([key(3)], [3.0])
+    assert len(cache) == 3
+    assert cache.get_many([key(1), key(0), key(3)]) == [None, 0.0, 3.0]
+
+    assert CACHE_HITS.value - hits == 3
+    assert CACHE_MISSES.value - misses == 2
+    assert CACHE_EVICTIONS.value - evictions == 1
+    assert cache.size_bytes <= cache.max_bytes
+
+
+def test_expired_entries_are_misses():
+
+    cache = PredictionCache(max_bytes=1 << 20, ttl_seconds=0.01)
+    cache.put_many([key(0)], [1.0])
+    time.sleep(0.02)
+
+    assert cache.get_many([key(0)]) == [None]
+    assert len(cache) == 0 and cache.size_bytes == 0
+
+
+@pytest.mark.parametrize("n_rows", [1, 8])
+def test_cached_predictions_match_and_skip_boosters(n_rows):
+
+    model = serving.current_model
+    features, _ = build_feature_row(WARMUP_RECORD)
+    rows = [
+        dict(features, distance=features["distance"] + i)
+        for i in range(n_rows)
+    ]
+
+    expected = model.predict_feature_rows(rows)
+    cache = PredictionCache(max_bytes=1 << 20, ttl_seconds=60)
+
+    np.testing.assert_allclose(
+        model.predict_feature_rows(rows, cache), expected
+    )
+
+    # Second pass is served from the cache without touching the boosters
+    calls = []
+    model_copy = clone(model, model.version, model.w_cat)
+    model_copy._blend = lambda X: calls.append(len(X))
+    np.testing.assert_allclose(
+        model_copy.predict_feature_rows(rows, cache), expected
+    )
+    assert calls == []
+
+
+def test_new_version_never_sees_old_entries():
+
+    model = serving.current_model
+    features, _ = build_feature_row(WARMUP_RECORD)
+    cache = PredictionCache(max_bytes=1 << 20, ttl_seconds=60)
+
+    model.predict_feature_rows([features], cache)
+
+    bumped = clone(model, model.version + 1, 1.0)
+    pred = bumped.predict_feature_rows([features], cache)
+
+    np.testing.assert_allclose(pred, bumped.predict_feature_rows([features]))
+    assert len(cache) == 2
@@ -0,0 +1,45 @@
+import numpy as np
+from fastapi.testclient import TestClient
+
+# App import loads the model bundle (cache first, then MLflow registry)
+import app as serving
+from scripts.fast_features import build_feature_row
+from scripts.process_memory import memory_usage
+from scripts.serving_model import ServingModel, WARMUP_RECORD
+
+client = TestClient(serving.app)
+
+
+def test_memory_usage_reports_rss():
+
+    usage = memory_usage()
+    assert usage["rss"] > 0
+    if "pss" in usage:
+        assert usage["shared"] + usage["private"] == usage["rss"]
+
+
+def test_metrics_expose_worker_memory():
+
+    body = client.get("/metrics").text
+    assert "eta_process_rss_bytes" in body
+    assert "eta_process_pss_bytes" in body
+
+
+def test_thread_cap_does_not_change_predictions():
+
+    model = serving.current_model
+    bundle = {
+        "preprocessor": model.preprocessor,
+        "compiled_preprocessor": model.compiled_preprocessor,
+        "catboost": model.cat_model,
+        "lightgbm": model.lgb_model,
+        "weights": {"cat": model.w_cat, "lgbm": model.w_lgb},
+    }
+    features, _ = build_feature_row(WARMUP_RECORD)
+
+    single = ServingModel(model.version, bundle, n_threads=1)
+    default = ServingModel(model.version, bundle)
+    np.testing.assert_array_equal(
+        single.predict_feature_rows([features] * 8),
+        default.predict_feature_rows([features] * 8),
+    )
@@ -0,0 +1,153 @@
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+# App import loads the model bundle (cache first, then MLflow registry)
+import app as serving
+from scripts.request_profiler import RequestProfiler
+from scripts.serving_model import WARMUP_RECORD
+
+ADMIN_TOKEN = "test-token"
+
+client = TestClient(serving.app, headers={"X-Admin-Token": ADMIN_TOKEN})
+
+
+@pytest.fixture(autouse=True)
+def admin_token(monkeypatch):
+    monkeypatch.setattr(serving, "ADMIN_TOKEN", ADMIN_TOKEN)
+
+
+def busy_leaf(seconds: float):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def busy_job(seconds: float):
+    busy_leaf(seconds)
+    return "done"
+
+
+@pytest.fixture
+def profiling():
+    """
+    Sample every request on the serving app; switched off and cleared
+    afterwards.
+    """
+    response = client.post(
+        "/admin/profile",
+        params={"every": 1, "interval_ms": 0.5, "reset": True},
+    )
+    assert response.status_code == 200
+    yield
+    client.post("/admin/profile", params={"every": 0, "reset": True})
+
+
+def test_one_in_n_requests_is_sampled():
+    profiler = RequestProfiler(every_n=3)
+
+    picks = [profiler.should_sample() for _ in range(9)]
+
+    assert picks == [False, False, True] * 3
+    assert profiler.n_requests == 3
+
+
+def test_disabled_profiler_starts_nothing():
+    profiler = RequestProfiler()
+
+    assert not profiler.enabled
+    assert profiler._thread is None
+
+    with pytest.raises(ValueError):
+        profiler.configure(-1)
+
+
+def test_wrapped_job_is_sampled_on_its_thread():
+    profiler = RequestProfiler(every_n=1, interval_ms=0.5)
+    job = profiler.wrap(busy_job, "POST /test;inference")
+
+    result = []
+    worker = threading.Thread(target=lambda: result.append(job(0.2)))
+    worker.start()
+    worker.join()
+
+    assert result == ["done"]
+    stacks = profiler.stacks()
+    assert profiler.n_samples == sum(stacks.values()) > 0
+
+    # Frames above the anchor only, rooted at the label
+    leaf = max(stacks, key=stacks.get)
+    frames = leaf.split(";")
+    assert frames[:3] == ["POST /test", "inference", frames[2]]
+    assert frames[2].startswith("busy_job (test_request_profiler.py:")
+    assert frames[3].startswith("busy_leaf (")
+    assert "threading.py" not in leaf
+
+    lines = profiler.collapsed().splitlines()
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+
+def test_speedscope_document():
+    profiler = RequestProfiler(every_n=1, interval_ms=2)
+    profiler._stacks.update({"a;b;c": 3, "a;d": 1})
+
+    doc = profiler.speedscope()
+    frames = [f["name"] for f in doc["shared"]["frames"]]
+    profile = doc["profiles"][0]
+
+    assert profile["type"] == "sampled" and profile["unit"] == "milliseconds"
+    samples = [[frames[i] for i in s] for s in profile["samples"]]
+    assert samples == [["a", "b", "c"], ["a", "d"]]
+    assert profile["weights"] == [6, 2]
+    assert profile["endValue"] == 8
+
+
+def test_admin_profile_download(profiling):
+    for _ in range(10):
+        response = client.post("/predict/batch", json=[WARMUP_RECORD] * 256)
+        assert response.status_code == 200
+        assert client.post("/predict", json=WARMUP_RECORD).status_code == 200
+
+    status = client.get("/admin/profile", params={"format": "status"}).json()
+    assert status["enabled"] and status["profiled_requests"] == 20
+    assert status["samples"] > 0
+
+    collapsed = client.get("/admin/profile").text
+    assert "POST /predict/batch;inference;score_frame (app.py:" in collapsed
+
+    doc = client.get("/admin/profile", params={"format": "speedscope"}).json()
+    assert doc["profiles"][0]["samples"]
+
+
+def test_disabled_requests_are_not_counted(profiling):
+    client.post("/admin/profile", params={"every": 0, "reset": True})
+
+    client.post("/predict", json=WARMUP_RECORD)
+
+    assert serving.request_profiler.n_requests == 0
+    assert client.get("/admin/profile").text == ""
+
+
+def test_bad_settings_rejected():
+    response = client.post("/admin/profile", params={"every": -2})
+    assert response.status_code == 400
+    response = client.get("/admin/profile", params={"format": "pprof"})
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("configured, sent", [
+    (None, None), (None, "anything"), (ADMIN_TOKEN, "wrong"),
+])
+def test_profile_refused_without_valid_token(monkeypatch, configured, sent):
+    monkeypatch.setattr(serving, "ADMIN_TOKEN", configured)
+    anonymous = TestClient(serving.app)
+    headers = {} if sent is None else {"X-Admin-Token": sent}
+
+    response = anonymous.post(
+        "/admin/profile", params={"every": 1}, headers=headers
+    )
+    assert response.status_code == 403
+    assert anonymous.get("/admin/profile", headers=headers).status_code == 403
+    assert not serving.request_profiler.status()["enabled"]
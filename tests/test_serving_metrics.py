@@ -0,0 +1,122 @@
+import time
+
+from fastapi.testclient import TestClient
+
+# App import loads the model bundle (cache first, then MLflow registry)
+import app as serving
+from scripts.serving_metrics import (
+    Counter, Histogram, stage_timer, STAGE_SECONDS,
+)
+from scripts.serving_model import WARMUP_RECORD
+
+client = TestClient(serving.app)
+
+
+def sample(body: str, name: str) -> float:
+    """Value of the exposition line starting with `name ` (0 if absent)."""
+    for line in body.splitlines():
+        if line.startswith(name + " "):
+            return float(line.split()[-1])
+    return 0.0
+
+
+def test_labelled_metrics_render():
+    counter = Counter(
+        "t_requests_total", "Test.", labelnames=("endpoint", "status"),
+        register=False,
+    )
+    counter.labels("/predict", 200).inc()
+    counter.labels("/predict", 200).inc(2)
+    counter.labels("/predict", 503).inc()
+
+    assert counter.render() == (
+        "# HELP t_requests_total Test.\n"
+        "# TYPE t_requests_total counter\n"
+        't_requests_total{endpoint="/predict",status="200"} 3.0\n'
+        't_requests_total{endpoint="/predict",status="503"} 1.0\n'
+    )
+
+    histogram = Histogram(
+        "t_seconds", "Test.", [0.1, 1], labelnames=("stage",), register=False
+    )
+    for value in [0.05, 0.1, 0.5, 3]:
+        histogram.labels("clean").observe(value)
+
+    assert histogram.render().splitlines()[2:] == [
+        't_seconds_bucket{stage="clean",le="0.1"} 2',
+        't_seconds_bucket{stage="clean",le="1.0"} 3',
+        't_seconds_bucket{stage="clean",le="+Inf"} 4',
+        't_seconds_sum{stage="clean"} 3.65',
+        't_seconds_count{stage="clean"} 4',
+    ]
+
+
+def test_unlabelled_histogram_format_unchanged():
+    histogram = Histogram("t_size", "Test.", [1, 8], register=False)
+    histogram.observe(4)
+
+    assert histogram.render().splitlines()[2:] == [
+        't_size_bucket{le="1.0"} 0',
+        't_size_bucket{le="8.0"} 1',
+        't_size_bucket{le="+Inf"} 1',
+        "t_size_sum 4.0",
+        "t_size_count 1",
+    ]
+
+
+def test_prediction_path_is_instrumented():
+    before = client.get("/metrics").text
+
+    assert client.post("/predict", json=WARMUP_RECORD).status_code == 200
+    minor = dict(WARMUP_RECORD, Delivery_person_Age=15.0)
+    assert "error" in client.post("/predict", json=minor).json()
+    batch = client.post("/predict/batch", json=[WARMUP_RECORD, minor]).json()
+    assert batch["n_rejected"] == 1
+
+    after = client.get("/metrics").text
+
+    def delta(name):
+        return sample(after, name) - sample(before, name)
+
+    assert delta('eta_requests_total{endpoint="/predict",status="200"}') == 2
+    batch = 'eta_requests_total{endpoint="/predict/batch",status="200"}'
+    assert delta(batch) == 1
+    assert delta("eta_rejected_rows_total") == 2
+    assert delta('eta_rejected_requests_total{endpoint="/predict"}') == 1
+
+    # Every stage of the path observed (rejected single: no preprocessing;
+    # boosters: unless served from the prediction cache)
+    for stage in ["validate", "clean", "serialize"]:
+        count = f'eta_stage_duration_seconds_count{{stage="{stage}"}}'
+        assert delta(count) == 3
+    assert delta('eta_stage_duration_seconds_count{stage="preprocess"}') == 2
+    for stage in ["catboost", "lightgbm"]:
+        assert f'eta_stage_duration_seconds_count{{stage="{stage}"}}' in after
+
+    # The scrape itself is the one request in flight
+    assert sample(after, "eta_requests_in_flight") == 1
+    assert sample(after, "eta_model_version") == serving.current_model.version
+
+
+def test_unknown_paths_share_one_label():
+    client.get("/no/such/path")
+    client.get("/another/missing/path")
+
+    body = client.get("/metrics").text
+    assert 'eta_requests_total{endpoint="unmatched",status="404"}' in body
+    assert "/no/such/path" not in body
+
+
+def test_stage_timer_overhead_is_negligible():
+    observe = stage_timer("overhead_test")
+    n = 20_000
+
+    start = time.perf_counter()
+    for _ in range(n):
+        t0 = time.perf_counter()
+        observe(time.perf_counter() - t0)
+    per_call = (time.perf_counter() - start) / n
+
+    # A handful of these per request against ~1 ms of model work
+    assert per_call < 20e-6
+    assert STAGE_SECONDS.labels("overhead_test").count == n
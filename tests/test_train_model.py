@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.features.feature_matrix import save_feature_matrix
+from src.models.train_model import train_boosters, thread_counts
+from scripts.benchmark_training import joblib_sha256
+
+TARGET = "time_taken"
+
+PARAMS = {
+    "CatBoost": {"iterations": 400, "learning_rate": 0.3, "depth": 4,
+                 "verbose": False, "random_seed": 0,
+                 "allow_writing_files": False},
+    "LightGBM": {"n_estimators": 400, "learning_rate": 0.3, "num_leaves": 8,
+                 "random_state": 0, "verbose": -1},
+    "threads": {
+        "budget": 4,
+        "parallel": False,
+        "share": {"CatBoost": 0.75, "LightGBM": 0.25},
+    },
+}
+
+
+def early_stopping(refit: bool, enabled: bool = True) -> dict:
+    return {"enabled": enabled, "validation_size": 0.2, "rounds": 10,
+            "refit": refit, "random_state": 0}
+
+
+@pytest.fixture(scope="module")
+def matrix_dir(tmp_path_factory):
+    # Signal saturates quickly at learning_rate 0.3: 400 trees are far too many
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(600, 4)), columns=list("abcd"))
+    df[TARGET] = 3 * df["a"] + rng.normal(size=600)
+    directory = tmp_path_factory.mktemp("matrix")
+    save_feature_matrix(df, TARGET, directory, "train")
+    return directory
+
+
+@pytest.mark.parametrize("refit", [True, False])
+def test_early_stopping_keeps_best_trees(matrix_dir, refit):
+    models, summary = train_boosters(
+        matrix_dir, {**PARAMS, "early_stopping": early_stopping(refit)}
+    )
+
+    for info in summary.values():
+        assert info["max_trees"] == 400
+        assert 0 < info["best_iteration"] < 400
+        assert info["validation_mae"] < 1.5
+
+    # Refit or not, exactly the best trees are left
+    cat, lgbm = summary["CatBoost"], summary["LightGBM"]
+    assert cat["trees"] == cat["best_iteration"]
+    assert models["CatBoost"].tree_count_ == cat["trees"]
+    assert lgbm["trees"] == lgbm["best_iteration"]
+    assert models["LightGBM"].booster_.num_trees() == lgbm["trees"]
+    assert models["LightGBM"].n_estimators == lgbm["best_iteration"]
+
+    # fit_seconds covers the early-stopping fit and the refit
+    for info in summary.values():
+        assert ("refit_seconds" in info) == refit
+        phases = info["early_stopping_seconds"], info.get("refit_seconds", 0)
+        assert info["fit_seconds"] >= max(phases) > 0
+
+
+def test_disabled_trains_every_tree(matrix_dir):
+    params = {**PARAMS, "early_stopping": early_stopping(True, enabled=False)}
+    _, summary = train_boosters(matrix_dir, params)
+
+    assert summary["CatBoost"]["trees"] == summary["LightGBM"]["trees"] == 400
+    assert "best_iteration" not in summary["LightGBM"]
+
+
+def test_thread_budget_split():
+    parallel = {**PARAMS["threads"], "parallel": True}
+
+    # Sequentially each booster has the whole budget; in parallel they share it
+    assert thread_counts(PARAMS["threads"]) == {"CatBoost": 4, "LightGBM": 4}
+    assert thread_counts(parallel) == {"CatBoost": 3, "LightGBM": 1}
+    # Every booster gets at least one thread
+    assert thread_counts({**parallel, "budget": 1}) == {
+        "CatBoost": 1, "LightGBM": 1
+    }
+
+
+def test_parallel_artifacts_match_sequential(matrix_dir):
+    params = {**PARAMS, "early_stopping": early_stopping(True)}
+
+    digests, threads = {}, {}
+    for parallel in (False, True):
+        mode = {**PARAMS["threads"], "parallel": parallel}
+        models, summary = train_boosters(
+            matrix_dir, {**params, "threads": mode}
+        )
+        digests[parallel] = {
+            section: joblib_sha256(model)
+            for section, model in models.items()
+        }
+        threads[parallel] = (
+            summary["CatBoost"]["threads"], summary["LightGBM"]["threads"]
+        )
+
+        # Thread count used for training is not part of the artifact
+        assert "thread_count" not in models["CatBoost"].get_params()
+        assert models["LightGBM"].n_jobs is None
+        assert "num_threads" not in models["LightGBM"].booster_.params
+
+    assert threads == {False: (4, 4), True: (3, 1)}
+    assert digests[False] == digests[True]
@@ -0,0 +1,182 @@
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+optuna = pytest.importorskip("optuna")
+
+from src.features.feature_matrix import save_feature_matrix  # noqa: E402
+from src.models.tune import (  # noqa: E402
+    IntermediateReporter,
+    fit_catboost_fold,
+    fit_lightgbm_fold,
+    load_study,
+    make_folds,
+    summarize,
+    tune_booster,
+    update_train_section,
+)
+
+TARGET = "time_taken"
+
+TUNE = {
+    "n_trials": 4,
+    "n_folds": 3,
+    "random_state": 0,
+    "max_trees": 60,
+    "early_stopping_rounds": 10,
+    "report_every": 5,
+    "startup_trials": 2,
+    "warmup_iterations": 10,
+}
+
+FOLD_FITTERS = [fit_lightgbm_fold, fit_catboost_fold]
+
+PARAMS = """\
+Train:
+  LightGBM:
+    n_estimators: 822
+    num_leaves: 86     # leaves per tree
+    random_state: 42
+
+  CatBoost:
+    depth: 10
+    iterations: 1062
+    loss_function: "RMSE"
+    verbose: False
+
+  weights:
+    cat: 0.4
+"""
+
+
+def synthetic(n_rows: int = 300):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(n_rows, 4)).astype(np.float32)
+    y = 3 * X[:, 0] + rng.normal(size=n_rows)
+    return X, y
+
+
+class PruneAtOnce:
+    """Trial stand-in whose pruner stops at the first report."""
+
+    def __init__(self):
+        self.reports = []
+
+    def report(self, value, step):
+        self.reports.append((step, value))
+
+    def should_prune(self):
+        return True
+
+
+@pytest.fixture
+def matrix_dir(tmp_path):
+    X, y = synthetic()
+    df = pd.DataFrame(X, columns=["a", "b", "c", "d"])
+    df[TARGET] = y
+    save_feature_matrix(df, TARGET, tmp_path, "train")
+    return tmp_path
+
+
+def test_folds_report_best_iteration():
+    X, y = synthetic()
+    fold_data = make_folds(X, y, 3, 0)[1]
+
+    class KeepGoing(PruneAtOnce):
+        def should_prune(self):
+            return False
+
+    trial = KeepGoing()
+    mae, best = fit_lightgbm_fold(
+        {"learning_rate": 0.3}, fold_data, TUNE, 1,
+        IntermediateReporter(trial, 1, 5),
+    )
+
+    assert 0 < best <= TUNE["max_trees"] and mae < 2
+    # Steps of fold 1 start above every step of fold 0
+    assert trial.reports[0][0] == 100_005
+
+    mae, best = fit_catboost_fold(
+        {"learning_rate": 0.3}, fold_data, TUNE, 1,
+        IntermediateReporter(KeepGoing(), 1, 5),
+    )
+    assert 0 < best <= TUNE["max_trees"] and mae < 2
+
+
+@pytest.mark.parametrize("fit_fold", FOLD_FITTERS)
+def test_pruned_fold_stops_training(fit_fold):
+    X, y = synthetic()
+    trial = PruneAtOnce()
+
+    with pytest.raises(optuna.TrialPruned):
+        fit_fold(
+            {"learning_rate": 0.1}, make_folds(X, y, 3, 0)[0], TUNE, 1,
+            IntermediateReporter(trial, 0, 5),
+        )
+
+    assert [step for step, _ in trial.reports] == [5]
+
+
+@pytest.mark.parametrize("fit_fold", FOLD_FITTERS)
+def test_warmup_applies_to_every_fold(fit_fold):
+    X, y = synthetic()
+    trial = PruneAtOnce()
+    reporter = IntermediateReporter(
+        trial, 2, 5, warmup=TUNE["warmup_iterations"]
+    )
+
+    with pytest.raises(optuna.TrialPruned):
+        fit_fold(
+            {"learning_rate": 0.1}, make_folds(X, y, 3, 0)[2], TUNE, 1,
+            reporter,
+        )
+
+    # Reported during the warmup but only pruned after it, in fold 2 as
+    # in fold 0
+    assert [step for step, _ in trial.reports] == [200_005, 200_010]
+
+
+@pytest.mark.parametrize("booster, trees_key", [
+    ("lgbm", "n_estimators"), ("cat", "iterations"),
+])
+def test_study_resumes_from_sqlite(matrix_dir, tmp_path, booster, trees_key):
+    storage = tmp_path / "tuning.db"
+
+    study = tune_booster(booster, matrix_dir, {}, TUNE, storage, n_workers=1)
+    assert summarize(study)["complete"] + summarize(study)["pruned"] == 4
+    assert trees_key in study.best_trial.user_attrs
+
+    # Same target: nothing left to run; raised target: only the difference
+    tune_booster(booster, matrix_dir, {}, TUNE, storage, n_workers=1)
+    assert len(load_study(booster, TUNE, storage).trials) == 4
+
+    study = tune_booster(
+        booster, matrix_dir, {}, dict(TUNE, n_trials=6), storage,
+        n_workers=1,
+    )
+    assert len(study.trials) == 6
+
+
+def test_train_section_updated_in_place(tmp_path):
+    path = tmp_path / "params.yaml"
+    path.write_text(PARAMS)
+
+    update_train_section(
+        path, "LightGBM",
+        {"n_estimators": 120, "num_leaves": 31, "reg_alpha": 0.5},
+    )
+    update_train_section(path, "CatBoost", {"depth": 6, "iterations": 412})
+
+    text = path.read_text()
+    params = yaml.safe_load(text)["Train"]
+    assert params["LightGBM"] == {
+        "n_estimators": 120, "num_leaves": 31, "random_state": 42,
+        "reg_alpha": 0.5,
+    }
+    assert params["CatBoost"] == {
+        "depth": 6, "iterations": 412, "loss_function": "RMSE",
+        "verbose": False,
+    }
+    assert params["weights"] == {"cat": 0.4}
+    assert "num_leaves: 31  # leaves per tree" in text